@@ -1 +1,45 @@
-# Dies ist eine init-Datei 
+"""
+    Headless game logic of the Snake game. Nothing in this package depends
+    on Qt.
+"""
+
+from .board import DEFAULT_BOARD, BoardConfig
+from .distance import DistanceField
+from .engine import AUTOPILOTS, GameEngine, StepResult
+from .grid import FreeCells, OccupancyGrid
+from .hamiltonian import (HamiltonianAutopilot, hamiltonian_cycle,
+                          has_hamiltonian_cycle)
+from .models import BoardFullError, Direction, Food, Snake
+from .pathfinding import PathCache, astar
+from .quadtree import Quadtree
+from .replay import Replay
+from .safety import TailCheck
+from .spatial_hash import SpatialHash
+from .timestep import FixedTimestep
+from .timing import TickTimer
+
+__all__ = [
+    'AUTOPILOTS',
+    'BoardConfig',
+    'BoardFullError',
+    'DEFAULT_BOARD',
+    'Direction',
+    'DistanceField',
+    'FixedTimestep',
+    'Food',
+    'FreeCells',
+    'GameEngine',
+    'HamiltonianAutopilot',
+    'OccupancyGrid',
+    'PathCache',
+    'Quadtree',
+    'Replay',
+    'Snake',
+    'SpatialHash',
+    'StepResult',
+    'TailCheck',
+    'TickTimer',
+    'astar',
+    'hamiltonian_cycle',
+    'has_hamiltonian_cycle',
+]
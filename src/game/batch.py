@@ -0,0 +1,277 @@
+"""
+    Batched engine
+    --------------
+    Vectorized implementation of the game rules that steps many independent
+    games at once. The state of all games lives in NumPy arrays, and every
+    tick is a fixed number of array operations regardless of the number of
+    games, which makes it suitable for training agents.
+
+    The rules are the same as in GameEngine.step: a move opposite to the
+    current direction is ignored, leaving the board or entering a cell of
+    the snake (including the tail cell) ends the game, and eating food grows
+    the snake by ``food value`` cells over the following ticks. Food is
+    drawn from NumPy's random generator, so the food sequence for a given
+    seed differs from the one of GameEngine.
+
+    This module requires NumPy, which is not needed by the rest of the game.
+"""
+
+
+import numpy as np
+
+from .board import DEFAULT_BOARD
+from .models import Direction
+
+
+# Indexed by Direction
+DELTA_X = np.array([-1, 1, 0, 0], dtype=np.int64)
+DELTA_Y = np.array([0, 0, -1, 1], dtype=np.int64)
+OPPOSITE = np.array([Direction.Right, Direction.Left,
+                     Direction.Down, Direction.Up], dtype=np.int8)
+
+NO_ACTION = -1
+
+# Values of BatchEngine.death_cause
+CAUSE_NONE = 0
+CAUSE_WALL = 1
+CAUSE_SELF = 2
+CAUSE_WIN = 3
+CAUSE_NAMES = (None, 'wall', 'self', 'win')
+
+
+class BatchEngine:
+    """
+        BatchEngine steps ``num_envs`` independent games at once.
+
+        State (one row or entry per game):
+            body:       ring buffer of the flat cell indexes (y * cols + x)
+                        of the snake, head at ``head_slot``
+            length:     number of cells in the ring buffer
+            pending:    growth that is still due; while it is positive the
+                        tail stays in place (GameEngine repeats the tail
+                        cell instead, which is equivalent)
+            occupancy:  occupancy plane of every board, 1 for snake cells
+            head_x/y, direction, food, food_value, score, ticks, done,
+            death_cause
+
+        With ``auto_reset`` every game that ends during ``step`` is reset
+        at the end of the same call. Its final score, ticks and cause are
+        kept in ``final_score``, ``final_ticks`` and ``final_cause`` until
+        it ends again.
+
+        Parameters:
+        -----------
+            num_envs: int
+                    The number of games.
+
+            board: BoardConfig
+                    The size of the game world and the start cell of the
+                    snake.
+
+            seed: int
+                    The seed of the random number generator, None for a
+                    random seed.
+
+            auto_reset: bool
+                    True to reset ended games automatically.
+
+            occupancy: ndarray
+                    Optional uint8 buffer of shape (num_envs, cols * rows)
+                    to store the occupancy planes in, e.g. a view into a
+                    preallocated observation array.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, num_envs, board=DEFAULT_BOARD, seed=None,
+                 auto_reset=True, occupancy=None):
+        self.num_envs = num_envs
+        self.board = board
+        self.cols = board.cols
+        self.rows = board.rows
+        self.cells = board.cells
+        self.start = board.start
+        self.auto_reset = auto_reset
+        self.rng = np.random.default_rng(seed)
+        self.envs = np.arange(num_envs)
+
+        capacity = self.cells + 1
+        self.capacity = capacity
+        self.body = np.zeros((num_envs, capacity), dtype=np.int64)
+        self.head_slot = np.zeros(num_envs, dtype=np.int64)
+        self.length = np.zeros(num_envs, dtype=np.int64)
+        self.pending = np.zeros(num_envs, dtype=np.int64)
+        if occupancy is None:
+            occupancy = np.zeros((num_envs, self.cells), dtype=np.uint8)
+        elif occupancy.shape != (num_envs, self.cells):
+            raise ValueError(
+                f'occupancy buffer must have the shape '
+                f'{(num_envs, self.cells)}, not {occupancy.shape}')
+        self.occupancy = occupancy
+        self.head_x = np.zeros(num_envs, dtype=np.int64)
+        self.head_y = np.zeros(num_envs, dtype=np.int64)
+        self.direction = np.zeros(num_envs, dtype=np.int8)
+        self.food = np.zeros(num_envs, dtype=np.int64)
+        self.food_value = np.zeros(num_envs, dtype=np.int64)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.ticks = np.zeros(num_envs, dtype=np.int64)
+        self.done = np.zeros(num_envs, dtype=bool)
+        self.death_cause = np.zeros(num_envs, dtype=np.int8)
+        self.final_score = np.zeros(num_envs, dtype=np.int64)
+        self.final_ticks = np.zeros(num_envs, dtype=np.int64)
+        self.final_cause = np.zeros(num_envs, dtype=np.int8)
+        self.reset()
+
+    def reset(self, mask=None):
+        """
+            Reset the given games (all games if mask is None).
+
+            Parameters:
+            -----------
+                mask: ndarray
+                        Boolean array selecting the games to reset.
+
+            Returns:
+            --------
+                None
+        """
+        envs = self.envs if mask is None else np.flatnonzero(mask)
+        if not len(envs):
+            return
+
+        start = self.start[1] * self.cols + self.start[0]
+        self.occupancy[envs] = 0
+        self.occupancy[envs, start] = 1
+        self.body[envs, 0] = start
+        self.head_slot[envs] = 0
+        self.length[envs] = 1
+        self.pending[envs] = 0
+        self.head_x[envs] = self.start[0]
+        self.head_y[envs] = self.start[1]
+        self.direction[envs] = Direction.Right
+        self.score[envs] = 0
+        self.ticks[envs] = 0
+        self.done[envs] = False
+        self.death_cause[envs] = CAUSE_NONE
+        self.spawn_food(envs)
+
+    def spawn_food(self, envs):
+        """
+            Place new food for the given games on a uniformly drawn free
+            cell. Games without a free cell are won and end.
+
+            Parameters:
+            -----------
+                envs: ndarray
+                        The indexes of the games.
+
+            Returns:
+            --------
+                None
+        """
+        free = self.occupancy[envs] == 0
+        keys = self.rng.random(free.shape)
+        keys[~free] = -1.
+        self.food[envs] = keys.argmax(axis=1)
+
+        special = self.rng.random(len(envs)) < 0.1
+        double = self.rng.random(len(envs)) < 0.2
+        self.food_value[envs] = np.where(special, 5, np.where(double, 2, 1))
+
+        full = envs[~free.any(axis=1)]
+        if len(full):
+            self.food[full] = -1
+            self.done[full] = True
+            self.death_cause[full] = CAUSE_WIN
+
+    def step(self, actions):
+        """
+            Advance every running game by one tick.
+
+            Parameters:
+            -----------
+                actions: array_like
+                        The requested direction of every game (see
+                        Direction), NO_ACTION to keep the current one.
+
+            Returns:
+            --------
+                tuple
+                    (rewards, dones): the food value eaten by every game
+                    during this tick, and whether the game ended.
+        """
+        actions = np.asarray(actions, dtype=np.int8)
+        active = ~self.done
+
+        turn = (actions >= 0) & (actions != OPPOSITE[self.direction])
+        self.direction = np.where(turn, actions, self.direction)
+
+        new_x = self.head_x + DELTA_X[self.direction]
+        new_y = self.head_y + DELTA_Y[self.direction]
+        wall = (new_x < 0) | (new_x >= self.cols) | \
+            (new_y < 0) | (new_y >= self.rows)
+        new_head = np.where(wall, 0, new_y * self.cols + new_x)
+        hit_self = ~wall & (self.occupancy[self.envs, new_head] > 0)
+
+        dead = active & (wall | hit_self)
+        self.done |= dead
+        self.death_cause[dead] = np.where(wall[dead], CAUSE_WALL, CAUSE_SELF)
+
+        # Move the head of every surviving game
+        alive = np.flatnonzero(active & ~dead)
+        head = new_head[alive]
+        self.head_x[alive] = new_x[alive]
+        self.head_y[alive] = new_y[alive]
+        slot = (self.head_slot[alive] + 1) % self.capacity
+        self.head_slot[alive] = slot
+        self.body[alive, slot] = head
+        self.occupancy[alive, head] += 1
+        self.length[alive] += 1
+        self.ticks[alive] += 1
+
+        # Food: the tail stays in place while growth is pending
+        ate = head == self.food[alive]
+        eaten = alive[ate]
+        rewards = np.zeros(self.num_envs, dtype=np.int64)
+        rewards[eaten] = self.food_value[eaten]
+        self.score[eaten] += rewards[eaten]
+
+        waiting = alive[~ate]
+        growing = self.pending[waiting] > 0
+        self.pending[waiting[growing]] -= 1
+        self.pending[eaten] += self.food_value[eaten]
+
+        retract = waiting[~growing]
+        tail_slot = (self.head_slot[retract] - self.length[retract] + 1) \
+            % self.capacity
+        self.occupancy[retract, self.body[retract, tail_slot]] -= 1
+        self.length[retract] -= 1
+
+        if len(eaten):
+            self.spawn_food(eaten)
+
+        dones = self.done & active
+        if self.auto_reset and dones.any():
+            self.final_score[dones] = self.score[dones]
+            self.final_ticks[dones] = self.ticks[dones]
+            self.final_cause[dones] = self.death_cause[dones]
+            self.reset(dones)
+        return rewards, dones
+
+    def snake_lengths(self):
+        """
+            Length of every snake, counted like len(GameEngine.snake), i.e.
+            including the growth that is still pending.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                ndarray
+                    The length of every snake.
+        """
+        return self.length + self.pending
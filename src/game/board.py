@@ -0,0 +1,92 @@
+"""
+    Board geometry
+    --------------
+    A single BoardConfig describes the size of the game world. The engines
+    work in cells and only read ``cols``, ``rows`` and ``start``, the window
+    additionally reads ``cell_size`` to convert cells to pixels.
+"""
+
+
+from collections import namedtuple
+
+
+class BoardConfig(namedtuple('BoardConfig',
+                             ['cols', 'rows', 'cell_size', 'start'])):
+    """
+        Geometry of the game world.
+
+        Parameters:
+        -----------
+            cols: int
+                    The number of columns of the board.
+
+            rows: int
+                    The number of rows of the board.
+
+            cell_size: int
+                    The size of a cell in pixels, only used for drawing.
+
+            start: tuple
+                    The start cell of the snake.
+
+        Returns:
+        --------
+            None
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, cols=40, rows=40, cell_size=20, start=(5, 5)):
+        if cols < 1 or rows < 1 or cell_size < 1:
+            raise ValueError(
+                f'invalid board {cols}x{rows} with cell size {cell_size}')
+        if not (0 <= start[0] < cols and 0 <= start[1] < rows):
+            raise ValueError(
+                f'start cell {start} is outside the {cols}x{rows} board')
+        return super().__new__(cls, cols, rows, cell_size, tuple(start))
+
+    @classmethod
+    def parse(cls, text, cell_size=20):
+        """
+            Create a board from a size like '200x200'. The snake starts at
+            the same cell as on the default board, or at the centre of
+            boards that are too small for it.
+
+            Parameters:
+            -----------
+                text: str
+                        The number of columns and rows, separated by 'x'.
+
+                cell_size: int
+                        The size of a cell in pixels.
+
+            Returns:
+            --------
+                BoardConfig
+                    The board.
+        """
+        try:
+            cols, rows = (int(part) for part in text.lower().split('x'))
+        except ValueError:
+            raise ValueError(
+                f'invalid board size {text!r}, expected COLSxROWS') from None
+
+        start = DEFAULT_BOARD.start
+        if not (start[0] < cols and start[1] < rows):
+            start = (cols // 2, rows // 2)
+        return cls(cols, rows, cell_size, start)
+
+    @property
+    def cells(self):
+        return self.cols * self.rows
+
+    @property
+    def width(self):
+        return self.cols * self.cell_size
+
+    @property
+    def height(self):
+        return self.rows * self.cell_size
+
+
+DEFAULT_BOARD = BoardConfig()
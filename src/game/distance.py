@@ -0,0 +1,306 @@
+"""
+    Distance field
+    --------------
+    Breadth-first distances from the food to every free cell of the board.
+    The food only moves when it is eaten, so the field is computed once per
+    food and then kept up to date as the tail frees cells. The autopilot
+    finds the food by always stepping to the neighbour with the smallest
+    distance, which is a constant number of lookups per tick.
+"""
+
+
+from .pathfinding import NEIGHBOUR_OFFSETS
+
+
+UNREACHED = -1  # distance of cells that cannot reach the goal
+
+
+class DistanceField:
+    """
+        Distances from a goal cell to every free cell, stored in a flat
+        list indexed by ``y * cols + x``.
+
+        The distance list and the queue of the breadth-first search are
+        allocated once for the board and reused for every goal. A distance
+        is only valid if the stamp of its cell equals the generation of the
+        current field, so nothing has to be cleared when the goal moves.
+
+        When the head enters a cell, the distances ahead of it stay valid,
+        since the head only ever moves downhill. When the tail frees a cell,
+        ``release`` gives the cell a distance and lowers the distances of
+        the cells that are now closer to the goal.
+
+        Parameters:
+        -----------
+            cols: int
+                    The number of columns of the board.
+
+            rows: int
+                    The number of rows of the board.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        cells = cols * rows
+        self.distances = [UNREACHED] * cells
+        self.stamps = [0] * cells
+        self.queue = [0] * cells
+        self.generation = 0
+        self.version = 0
+        self.computes = 0
+        self.goal = None
+
+    def clear(self):
+        self.goal = None
+
+    def distance(self, x, y):
+        """
+            Look up the distance of a cell.
+
+            Parameters:
+            -----------
+                x: int
+                        The column of the cell.
+
+                y: int
+                        The row of the cell.
+
+            Returns:
+            --------
+                int
+                    The number of moves from the cell to the goal,
+                    UNREACHED if the goal cannot be reached from it.
+        """
+        if not (0 <= x < self.cols and 0 <= y < self.rows):
+            return UNREACHED
+        index = y * self.cols + x
+        if self.stamps[index] != self.generation:
+            return UNREACHED
+        return self.distances[index]
+
+    def compute(self, space, goal):
+        """
+            Compute the field for a new goal from scratch.
+
+            Parameters:
+            -----------
+                space: object
+                        An object providing ``is_open_space(x, y)``.
+
+                goal: tuple
+                        The cell to measure the distances to.
+
+            Returns:
+            --------
+                None
+        """
+        self.computes += 1
+        self.version += 1
+        self.generation += 1
+        self.goal = goal
+        index = goal[1] * self.cols + goal[0]
+        self.stamps[index] = self.generation
+        self.distances[index] = 0
+        self.queue[0] = index
+        self.spread(space, 1)
+
+    def spread(self, space, write):
+        """
+            Relax the distances outwards from the cells in the queue until
+            no distance can be lowered anymore.
+
+            Parameters:
+            -----------
+                space: object
+                        An object providing ``is_open_space(x, y)``.
+
+                write: int
+                        The number of cells in the queue.
+
+            Returns:
+            --------
+                None
+        """
+        cols = self.cols
+        rows = self.rows
+        generation = self.generation
+        distances = self.distances
+        stamps = self.stamps
+        queue = self.queue
+        is_open_space = space.is_open_space
+
+        read = 0
+        while read < write:
+            index = queue[read]
+            read += 1
+            y, x = divmod(index, cols)
+            distance = distances[index] + 1
+            for dx, dy in NEIGHBOUR_OFFSETS:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < cols and 0 <= ny < rows):
+                    continue
+                neighbour = ny * cols + nx
+                if stamps[neighbour] == generation and \
+                        distances[neighbour] <= distance:
+                    continue
+                if not is_open_space(nx, ny):
+                    continue
+                stamps[neighbour] = generation
+                distances[neighbour] = distance
+                queue[write] = neighbour
+                write += 1
+
+    def release(self, space, cell):
+        """
+            Update the field after the given cell became free.
+
+            Parameters:
+            -----------
+                space: object
+                        An object providing ``is_open_space(x, y)``.
+
+                cell: tuple
+                        The freed cell.
+
+            Returns:
+            --------
+                None
+        """
+        if self.goal is None:
+            return
+
+        x, y = cell
+        best = UNREACHED
+        for dx, dy in NEIGHBOUR_OFFSETS:
+            distance = self.distance(x + dx, y + dy)
+            if distance != UNREACHED and (best == UNREACHED
+                                          or distance < best):
+                best = distance
+        if best == UNREACHED:
+            return
+
+        current = self.distance(x, y)
+        if current != UNREACHED and current <= best + 1:
+            return
+
+        self.version += 1
+        index = y * self.cols + x
+        self.stamps[index] = self.generation
+        self.distances[index] = best + 1
+        self.queue[0] = index
+        self.spread(space, 1)
+
+    def downhill(self, space, cell, below=None, exclude=None):
+        """
+            Find the free neighbour of a cell with the smallest distance.
+
+            Parameters:
+            -----------
+                space: object
+                        An object providing ``is_open_space(x, y)``.
+
+                cell: tuple
+                        The cell to look around.
+
+                below: int
+                        Only accept neighbours with a distance below this
+                        value, None to accept any distance.
+
+                exclude: tuple
+                        A neighbour that must not be taken, e.g. the cell
+                        behind the head, None to accept every neighbour.
+
+            Returns:
+            --------
+                tuple
+                    (neighbour, distance), (None, UNREACHED) if there is
+                    no such neighbour.
+        """
+        x, y = cell
+        best = None
+        best_distance = UNREACHED
+        for dx, dy in NEIGHBOUR_OFFSETS:
+            nx, ny = x + dx, y + dy
+            distance = self.distance(nx, ny)
+            if distance == UNREACHED or (below is not None
+                                         and distance >= below):
+                continue
+            if best is not None and distance >= best_distance:
+                continue
+            if not space.is_open_space(nx, ny) or (nx, ny) == exclude:
+                continue
+            best = (nx, ny)
+            best_distance = distance
+        return best, best_distance
+
+    def next_cell(self, space, cell, exclude=None):
+        """
+            Determine the next cell on the way from the given cell to the
+            goal by a greedy descent over the field.
+
+            The field can be outdated if the snake did not follow it, e.g.
+            after the player steered. A neighbour is only taken if the
+            descent can continue from it; otherwise the field is computed
+            again before giving up.
+
+            Parameters:
+            -----------
+                space: object
+                        An object providing ``is_open_space(x, y)``.
+
+                cell: tuple
+                        The current cell, usually the head of the snake.
+
+                exclude: tuple
+                        A neighbour of cell that must not be taken (see
+                        ``downhill``).
+
+            Returns:
+            --------
+                tuple
+                    The next cell, None if the goal cannot be reached.
+        """
+        for _ in range(2):
+            best, distance = self.downhill(space, cell, exclude=exclude)
+            if best is not None and (
+                    distance == 0
+                    or self.downhill(space, best, distance)[0] is not None):
+                return best
+            self.compute(space, self.goal)
+        return None
+
+    def path(self, space, start, exclude=None):
+        """
+            Follow the descent from the start cell to the goal.
+
+            Parameters:
+            -----------
+                space: object
+                        An object providing ``is_open_space(x, y)``.
+
+                start: tuple
+                        The cell to start at.
+
+                exclude: tuple
+                        A neighbour of start that must not be taken (see
+                        ``downhill``).
+
+            Returns:
+            --------
+                list
+                    The cells from start to the goal, including both. None
+                    if the descent does not reach the goal.
+        """
+        path = [start]
+        cell, distance = self.downhill(space, start, exclude=exclude)
+        while cell is not None:
+            path.append(cell)
+            if distance == 0:
+                return path
+            cell, distance = self.downhill(space, cell, distance)
+        return None
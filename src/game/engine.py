@@ -1 +1,561 @@
-# Spiel-Engine 
+"""
+    Snake game engine
+    -----------------
+    Headless implementation of the Snake game rules. The engine owns the
+    complete game state (snake, food, score, direction) and advances it one
+    tick at a time through the ``step`` method. It does not depend on Qt, so
+    games can be simulated without a QApplication, a scene or a timer, e.g.
+    in tests, benchmarks or on servers without a display.
+
+    The graphical frontend (SnakeGame in src/main.py) only feeds the player
+    input into ``step`` and renders the returned state.
+"""
+
+
+from collections import namedtuple
+from random import Random, randrange
+
+from .board import DEFAULT_BOARD
+from .distance import DistanceField
+from .grid import FreeCells, OccupancyGrid
+from .hamiltonian import HamiltonianAutopilot, has_hamiltonian_cycle
+from .models import (DIRECTION_DELTAS, OPPOSITE_DIRECTIONS, BoardFullError,
+                     Direction, Food, Snake)
+from .pathfinding import PathCache, astar
+from .quadtree import Quadtree
+from .safety import TailCheck
+from .spatial_hash import SpatialHash
+
+
+BASE_INTERVAL = 100  # initial tick interval in milliseconds
+MIN_INTERVAL = 20  # fastest possible tick interval in milliseconds
+SPEED_INCREASE = .25  # interval reduction per snake segment
+RULES_VERSION = 1  # bump whenever a change alters the outcome of a game
+RETRY_INTERVAL = 5  # ticks to follow the tail before searching for food again
+
+# Result of a single engine tick.
+#   head:      the cell the head moved into (or tried to move into)
+#   tail:      the cell that was freed by the tail, None if the snake grew
+#   ate:       True if the food was eaten during this tick
+#   game_over: True if the move ended the game (see GameEngine.death_cause)
+StepResult = namedtuple('StepResult', ['head', 'tail', 'ate', 'game_over'])
+
+# Spatial indexes that can track the snake body, see GameEngine
+BACKENDS = {
+    'grid': lambda cols, rows: OccupancyGrid(cols, rows),
+    'quadtree': lambda cols, rows: Quadtree((0, 0, cols, rows)),
+    'hash': lambda cols, rows: SpatialHash((0, 0, cols, rows)),
+}
+
+# Strategies of the autopilot, see GameEngine.autopilot_action
+AUTOPILOTS = ('astar', 'hamiltonian', 'field')
+
+
+class GameEngine:
+    """
+        GameEngine class is responsible for the game state and the game
+        rules. It implements the standard Snake game rules: the snake grows
+        in size when it eats food, and the game ends if the snake collides
+        with itself or the wall.
+
+        The game world is a grid of ``cols`` x ``rows`` cells, as given by
+        the BoardConfig of the engine (see src/game/board.py). The snake is
+        stored as a Snake model with the head at index 0. When the snake
+        eats, the tail cell is repeated ``food.value`` times, so the snake
+        grows over the following ticks.
+
+        Every cell of the snake is also tracked in a spatial index, which is
+        updated incrementally as the head advances and the tail retracts.
+        It answers the ``is_open_space`` queries of the pathfinding, the
+        food spawning and the collision checks. The default backend is the
+        OccupancyGrid, the Quadtree and the SpatialHash can be selected to
+        compare them (see tests/bench_backends.py).
+
+        The free cells are kept in a FreeCells index, so new food is placed
+        in constant time. If the snake fills the whole board, no food can
+        be placed anymore and the game ends with the death cause 'win'.
+
+        If a TickTimer is assigned to ``timings``, every step records how
+        long the collision check and the food spawning took (see
+        src/game/timing.py). It is None by default and costs nothing then.
+
+        All random decisions are drawn from a random number generator owned
+        by the engine. The seed is stored in ``seed``, so any game can be
+        reproduced from its seed and its actions (see src/game/replay.py).
+
+        Parameters:
+        -----------
+            board: BoardConfig
+                        The size of the game world and the start cell of
+                        the snake.
+
+            backend: str
+                        The spatial index for the snake body, one of the
+                        keys of BACKENDS ('grid', 'quadtree' or 'hash').
+
+            seed: int
+                        The seed of the first game, a random seed is chosen
+                        if None.
+
+            autopilot: str
+                        The strategy of the autopilot, one of AUTOPILOTS.
+                        'hamiltonian' needs a board with a Hamiltonian
+                        cycle (see has_hamiltonian_cycle).
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, board=DEFAULT_BOARD, backend='grid', seed=None,
+                 autopilot='astar'):
+        if autopilot not in AUTOPILOTS:
+            raise ValueError(f'unknown autopilot {autopilot!r}')
+        if backend not in BACKENDS:
+            raise ValueError(f'unknown backend {backend!r}')
+        if autopilot == 'hamiltonian' and not has_hamiltonian_cycle(
+                board.cols, board.rows):
+            raise ValueError(
+                f'the hamiltonian autopilot needs a board with an even '
+                f'number of cells, not {board.cols}x{board.rows}')
+        self.board = board
+        self.cols = cols = board.cols
+        self.rows = rows = board.rows
+        self.start = board.start
+        self.autopilot = autopilot
+        self.hamiltonian = None
+        self.occupancy = BACKENDS[backend](cols, rows)
+        self.free_cells = FreeCells(cols, rows)
+        self.path_cache = PathCache()
+        self.tail_check = TailCheck(cols, rows)
+        self.distance_field = DistanceField(cols, rows)
+        self.timings = None
+        self.rng = Random()
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """
+            Reset the game state to the start of a new game.
+
+            Parameters:
+            -----------
+                seed: int
+                        The seed of the new game, a random seed is chosen
+                        if None.
+
+            Returns:
+            --------
+                None
+        """
+        if seed is None:
+            seed = randrange(2 ** 32)
+        self.seed = seed
+        self.rng.seed(seed)
+
+        self.score = 0
+        self.ticks = 0
+        self.game_over = False
+        self.death_cause = None
+        self.direction = Direction.Right
+        self.snake = Snake(self.start)
+        self.occupancy.clear()
+        self.occupancy.insert(self.start)
+        self.free_cells.clear()
+        self.free_cells.discard(self.start)
+        self.path_cache.clear()
+        self.checked_path = None
+        self.path_safe = False
+        self.checked_index = 0
+        self.checked_version = None
+        self.retry_tick = 0
+        self.food = None
+        self.add_food()
+
+    @property
+    def head(self):
+        return self.snake.head
+
+    @property
+    def won(self):
+        return self.death_cause == 'win'
+
+    def add_food(self):
+        """
+            Place a new food object on a free cell of the game world. If
+            there is no free cell left, the game is won and ends.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        try:
+            self.food = Food(self.free_cells, self.rng)
+        except BoardFullError:
+            self.food = None
+            self.game_over = True
+            self.death_cause = 'win'
+
+        if self.autopilot == 'field' and self.food is not None:
+            self.distance_field.compute(self, self.food.position)
+        else:
+            self.distance_field.clear()
+
+    def is_open_space(self, x, y):
+        """
+            Check if the given cell is inside the game world and not
+            occupied by the snake.
+
+            Parameters:
+            -----------
+                x: int
+                        An integer representing the column of the cell.
+
+                y: int
+                        An integer representing the row of the cell.
+
+            Returns:
+            --------
+                True, if the cell is an open space, False otherwise.
+        """
+        return self.occupancy.is_open_space(x, y)
+
+    def snapshot(self):
+        """
+            Copy the occupancy of the game world, e.g. to search on it from
+            another thread while the game goes on.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                OccupancyGrid
+                    A grid that is independent of the engine.
+        """
+        grid = OccupancyGrid(self.cols, self.rows)
+        if isinstance(self.occupancy, OccupancyGrid):
+            grid.cells[:] = self.occupancy.cells
+        else:
+            for cell in self.snake:
+                grid.insert(cell)
+        return grid
+
+    def next_head(self, direction=None):
+        """
+            Calculate the new position for the snake head based on the
+            given direction, or the current direction if none is given.
+
+            Parameters:
+            -----------
+                direction: int
+                        The direction to move in (see Direction).
+
+            Returns:
+            --------
+                tuple
+                    A tuple representing the new cell of the snake head.
+        """
+        if direction is None:
+            direction = self.direction
+        dx, dy = DIRECTION_DELTAS[direction]
+        head_x, head_y = self.snake.head
+        return (head_x + dx, head_y + dy)
+
+    def check_collision(self, new_head_pos):
+        """
+            Check for collisions with the boundaries or the snake's body.
+
+            It checks the following:
+                - The new position of the snake's head is within the
+                    boundaries of the game world.
+                - The new position of the snake's head does not collide with
+                    the snake's body.
+
+            Parameters:
+            -----------
+                new_head_pos: tuple
+                                A tuple representing the new cell of the
+                                snake's head.
+
+            Returns:
+            --------
+                str
+                    'wall' or 'self' if the move collides, None otherwise.
+        """
+        x, y = new_head_pos
+        if not (0 <= x < self.cols and 0 <= y < self.rows):
+            return 'wall'
+        if self.snake.collides(new_head_pos):
+            return 'self'
+        return None
+
+    def step(self, action=None):
+        """
+            Advance the game by one tick.
+
+            The action is the direction the snake should move in. If the
+            action is None or would turn the snake back onto itself, the
+            snake keeps its current direction.
+
+            Parameters:
+            -----------
+                action: int
+                        The requested direction (see Direction) or None.
+
+            Returns:
+            --------
+                StepResult
+                    The changes caused by this tick.
+        """
+        if self.game_over:
+            raise RuntimeError('step() called after the game has ended')
+
+        if action is not None and action != OPPOSITE_DIRECTIONS[
+                self.direction]:
+            self.direction = action
+
+        timings = self.timings
+        if timings is not None:
+            started = timings.clock()
+        new_head_pos = self.next_head()
+        cause = self.check_collision(new_head_pos)
+        if timings is not None:
+            timings.record('collision', timings.clock() - started)
+        if cause is not None:
+            self.game_over = True
+            self.death_cause = cause
+            return StepResult(new_head_pos, None, False, True)
+
+        self.ticks += 1
+        self.free_cells.discard(new_head_pos)
+        self.path_cache.block(new_head_pos)
+
+        if new_head_pos == self.food.position:
+            self.occupancy.insert(new_head_pos)
+            self.snake.advance(new_head_pos, grow=True)
+            self.score += self.food.value
+            tail = self.snake.tail
+            self.snake.grow(self.food.value)
+            for _ in range(self.food.value):
+                self.occupancy.insert(tail)
+            if timings is not None:
+                started = timings.clock()
+            self.add_food()
+            if timings is not None:
+                timings.record('food', timings.clock() - started)
+            return StepResult(new_head_pos, None, True, self.game_over)
+
+        tail = self.snake.advance(new_head_pos)
+        self.occupancy.move(tail, new_head_pos)
+        if tail not in self.snake:
+            self.free_cells.add(tail)
+            self.distance_field.release(self, tail)
+        return StepResult(new_head_pos, tail, False, False)
+
+    def tick_interval(self):
+        """
+            Calculate the tick interval based on the length of the snake.
+            The interval decreases as the snake grows in size:
+
+            interval = max(MIN_INTERVAL, BASE_INTERVAL - L * SPEED_INCREASE)
+
+                where,
+                    L = (length - 1)
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                int
+                    The tick interval in milliseconds.
+        """
+        return max(MIN_INTERVAL,
+                   int(BASE_INTERVAL - (len(self.snake) - 1) * SPEED_INCREASE))
+
+    def path_to_food(self):
+        """
+            Calculate the path from the snake head to the food using the A*
+            algorithm. The returned path does not include the head itself.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                list
+                    A list of cells leading to the food, empty if there is
+                    no path.
+        """
+        if self.food is None:
+            return []
+
+        path = astar(self, self.snake.head, self.food.position)
+        if path:
+            return path[1:]
+        return []
+
+    def direction_to(self, cell):
+        """
+            Determine the direction that moves the head into the given
+            adjacent cell.
+
+            Parameters:
+            -----------
+                cell: tuple
+                        A tuple representing a cell next to the head.
+
+            Returns:
+            --------
+                int
+                    The direction (see Direction), None if the cell is not
+                    adjacent to the head.
+        """
+        head_x, head_y = self.snake.head
+        delta = (cell[0] - head_x, cell[1] - head_y)
+        for direction, direction_delta in DIRECTION_DELTAS.items():
+            if direction_delta == delta:
+                return direction
+        return None
+
+    def autopilot_action(self):
+        """
+            Determine the next action of the autopilot.
+
+            With the 'astar' strategy the autopilot follows the A* path to
+            the food. The path is kept in a PathCache and only searched
+            again when the food moved or a cell on the path got blocked.
+            Every new path is checked once with the TailCheck before it is
+            followed: if the snake could not reach its tail anymore after
+            eating, or there is no path at all, the snake follows its tail
+            instead (see TailCheck.escape) and only searches for the food
+            again after RETRY_INTERVAL ticks. If there is no free cell next
+            to the head, None is returned and the game is lost.
+
+            The 'field' strategy works the same way, but instead of an A*
+            search it descends the DistanceField of the food, which is
+            computed when the food is placed and updated as the tail frees
+            cells. The descent costs a constant number of lookups per tick;
+            the TailCheck only runs when the field changed or the descent
+            leaves the path that was checked last.
+
+            With the 'hamiltonian' strategy the autopilot follows the
+            Hamiltonian cycle of the board, taking safe shortcuts towards
+            the food (see HamiltonianAutopilot). The cycle is built on the
+            first use and shared by all engines with the same board size.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                int
+                    The direction to move in (see Direction) or None.
+        """
+        if self.food is None:
+            return None
+
+        if self.autopilot == 'hamiltonian':
+            if self.hamiltonian is None:
+                self.hamiltonian = HamiltonianAutopilot(self.cols, self.rows)
+            return self.direction_to(self.hamiltonian.next_cell(self))
+
+        next_cell = None
+        if self.ticks >= self.retry_tick:
+            if self.autopilot == 'field':
+                next_cell = self.field_cell()
+            else:
+                next_cell = self.astar_cell()
+            if next_cell is None:
+                self.checked_path = None
+                self.retry_tick = self.ticks + RETRY_INTERVAL
+
+        if next_cell is None:
+            next_cell = self.tail_check.escape(self)
+        if next_cell is not None:
+            return self.direction_to(next_cell)
+        return None
+
+    def astar_cell(self):
+        """
+            Determine the next cell on the cached A* path to the food.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                tuple
+                    The next cell, None if there is no path or the path
+                    would trap the snake.
+        """
+        cache = self.path_cache
+        head = self.snake.head
+        goal = self.food.position
+        next_cell = cache.next_cell(self, head, goal)
+        # A snake of one cell has no body behind its head, but step ignores
+        # the reversing move, so the path has to start with a turn
+        behind = self.next_head(OPPOSITE_DIRECTIONS[self.direction])
+        if next_cell == behind:
+            next_cell = cache.avoid(self, head, behind, goal)
+        if cache.path is not self.checked_path:
+            self.checked_path = cache.path
+            self.path_safe = self.tail_check.path_is_safe(
+                self, cache.path, cache.position)
+        if not self.path_safe:
+            return None
+        return next_cell
+
+    def field_cell(self):
+        """
+            Determine the next cell by a greedy descent over the distance
+            field of the food.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                tuple
+                    The next cell, None if the food cannot be reached or
+                    the way to it would trap the snake.
+        """
+        field = self.distance_field
+        if field.goal != self.food.position:
+            field.compute(self, self.food.position)
+
+        # A snake of one cell has no body behind its head, but step ignores
+        # the reversing move, so the descent must not take it
+        behind = self.next_head(OPPOSITE_DIRECTIONS[self.direction])
+        next_cell = field.next_cell(self, self.snake.head, behind)
+        if next_cell is None:
+            return None
+
+        # A field updated by release can lead along the same cells into a
+        # pocket that was not there when the path was checked
+        path = self.checked_path
+        index = self.checked_index
+        if not (field.version == self.checked_version
+                and path and index + 1 < len(path)
+                and path[index] == self.snake.head
+                and path[index + 1] == next_cell):
+            path = field.path(self, self.snake.head, behind)
+            index = 0
+            self.checked_path = path
+            self.checked_version = field.version
+            self.path_safe = path is not None and \
+                self.tail_check.path_is_safe(self, path)
+        if not self.path_safe:
+            return None
+        self.checked_index = index + 1
+        return next_cell
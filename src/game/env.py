@@ -0,0 +1,242 @@
+"""
+    Environments
+    ------------
+    Gym-style ``reset()`` / ``step(action)`` wrappers around the engines for
+    training agents. ``step`` returns ``(observation, reward, done, info)``.
+
+    The observation is a preallocated uint8 NumPy array with three planes
+    of shape (rows, cols):
+
+        0: occupancy, 1 for every cell of the snake
+        1: head, 1 for the cell of the head
+        2: food, 1 for the cell of the food
+
+    The same array is refilled in place on every step, only the cells that
+    changed are touched, and no new arrays are allocated. Agents that need
+    to keep an observation across steps have to copy it.
+
+    This module requires NumPy.
+"""
+
+
+import numpy as np
+
+from .batch import CAUSE_NAMES, BatchEngine
+from .board import DEFAULT_BOARD
+from .engine import GameEngine
+
+
+class SnakeEnv:
+    """
+        Environment for a single game, backed by a GameEngine.
+
+        Parameters:
+        -----------
+            board: BoardConfig
+                    The size of the game world and the start cell of the
+                    snake.
+
+            seed: int
+                    The seed of the first game, None for a random seed.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, board=DEFAULT_BOARD, seed=None):
+        self.engine = GameEngine(board, seed=seed)
+        self.observation = np.zeros((3, board.rows, board.cols),
+                                    dtype=np.uint8)
+        self.body_plane, self.head_plane, self.food_plane = self.observation
+        self.info = {"score": 0, "ticks": 0, "cause": None}
+        self.fill_observation()
+
+    def fill_observation(self):
+        self.observation.fill(0)
+        for x, y in self.engine.snake:
+            self.body_plane[y, x] = 1
+        head_x, head_y = self.engine.head
+        self.head_plane[head_y, head_x] = 1
+        if self.engine.food is not None:
+            food_x, food_y = self.engine.food.position
+            self.food_plane[food_y, food_x] = 1
+
+    def reset(self, seed=None):
+        """
+            Start a new game.
+
+            Parameters:
+            -----------
+                seed: int
+                        The seed of the new game, None for a random seed.
+
+            Returns:
+            --------
+                ndarray
+                    The observation buffer.
+        """
+        self.engine.reset(seed)
+        self.fill_observation()
+        self.info["score"] = 0
+        self.info["ticks"] = 0
+        self.info["cause"] = None
+        return self.observation
+
+    def step(self, action):
+        """
+            Advance the game by one tick.
+
+            Parameters:
+            -----------
+                action: int
+                        The requested direction (see Direction) or None.
+
+            Returns:
+            --------
+                tuple
+                    (observation, reward, done, info). The reward is the
+                    value of the food eaten during this tick.
+        """
+        engine = self.engine
+        old_head_x, old_head_y = engine.head
+        old_food = engine.food
+        old_score = engine.score
+
+        result = engine.step(action)
+
+        if result.tail is not None and result.tail not in engine.snake:
+            self.body_plane[result.tail[1], result.tail[0]] = 0
+        if not result.game_over or engine.won:
+            head_x, head_y = result.head
+            self.body_plane[head_y, head_x] = 1
+            self.head_plane[old_head_y, old_head_x] = 0
+            self.head_plane[head_y, head_x] = 1
+        if result.ate:
+            food_x, food_y = old_food.position
+            self.food_plane[food_y, food_x] = 0
+            if engine.food is not None:
+                food_x, food_y = engine.food.position
+                self.food_plane[food_y, food_x] = 1
+
+        info = self.info
+        info["score"] = engine.score
+        info["ticks"] = engine.ticks
+        info["cause"] = engine.death_cause
+        return (self.observation, engine.score - old_score, result.game_over,
+                info)
+
+
+class VectorSnakeEnv:
+    """
+        Environment for ``num_envs`` games stepped at once, backed by a
+        BatchEngine. The observation has the shape (num_envs, 3, rows, cols)
+        and rewards and dones are arrays with one entry per game.
+
+        The occupancy planes of the observation are the occupancy buffer of
+        the BatchEngine itself, so they never need to be copied. Games that
+        end are reset automatically; their final score, ticks and cause are
+        available in the info dict.
+
+        Parameters:
+        -----------
+            num_envs: int
+                    The number of games.
+
+            board: BoardConfig
+                    The size of the game world and the start cell of the
+                    snake.
+
+            seed: int
+                    The seed of the random number generator, None for a
+                    random seed.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, num_envs, board=DEFAULT_BOARD, seed=None):
+        self.num_envs = num_envs
+        self.observation = np.zeros((num_envs, 3, board.rows, board.cols),
+                                    dtype=np.uint8)
+
+        # Flat (num_envs, cells) views onto the planes of the observation
+        planes = self.observation.reshape(num_envs, 3, board.cells)
+        self.head_plane = planes[:, 1]
+        self.food_plane = planes[:, 2]
+        self.engine = BatchEngine(num_envs, board, seed, auto_reset=True,
+                                  occupancy=planes[:, 0])
+
+        self.envs = self.engine.envs
+        self.head = np.zeros(num_envs, dtype=np.int64)
+        self.food = np.zeros(num_envs, dtype=np.int64)
+        self.info = {
+            "score": self.engine.score,
+            "final_score": self.engine.final_score,
+            "final_ticks": self.engine.final_ticks,
+            "final_cause": self.engine.final_cause,
+            "cause_names": CAUSE_NAMES,
+        }
+        self.update_markers()
+
+    def update_markers(self):
+        """
+            Move the head and food markers of every game to their current
+            cells. Only the previously marked cells are cleared.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        engine = self.engine
+        envs = self.envs
+        self.head_plane[envs, self.head] = 0
+        self.food_plane[envs, self.food] = 0
+
+        np.multiply(engine.head_y, engine.cols, out=self.head)
+        self.head += engine.head_x
+        np.maximum(engine.food, 0, out=self.food)
+
+        self.head_plane[envs, self.head] = 1
+        self.food_plane[envs, self.food] = engine.food >= 0
+
+    def reset(self):
+        """
+            Start a new game in every environment.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                ndarray
+                    The observation buffer.
+        """
+        self.engine.reset()
+        self.update_markers()
+        return self.observation
+
+    def step(self, actions):
+        """
+            Advance every game by one tick.
+
+            Parameters:
+            -----------
+                actions: array_like
+                        The requested direction of every game (see
+                        Direction), -1 to keep the current one.
+
+            Returns:
+            --------
+                tuple
+                    (observation, rewards, dones, info)
+        """
+        rewards, dones = self.engine.step(actions)
+        self.update_markers()
+        return self.observation, rewards, dones, self.info
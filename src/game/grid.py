@@ -0,0 +1,310 @@
+"""
+    Occupancy grid
+    --------------
+    Flat, cell indexed representations of the game world: the occupancy
+    bitmap (OccupancyGrid) and the index of the free cells (FreeCells).
+"""
+
+
+from random import randrange
+
+
+class OccupancyGrid:
+    """
+        Occupancy grid to represent the game world.
+        The OccupancyGrid stores for every cell of the game world how many
+        objects occupy it. The counts are kept in a single flat bytearray
+        indexed by ``y * cols + x``, so checking or updating a cell is a
+        single index operation instead of a descent through a tree.
+
+        Counting (instead of a plain flag) allows the same cell to be
+        inserted several times, which happens when the snake grows and its
+        tail cell is repeated.
+
+        The OccupancyGrid implements the same interface as the Quadtree
+        (``insert``, ``remove``, ``move``, ``clear``, ``is_open_space``,
+        ``retrieve`` and ``query_rect``), so both can be used as the engine
+        backend.
+
+        Parameters:
+        -----------
+            cols: int
+                    An integer representing the number of columns of the
+                    game world.
+
+            rows: int
+                    An integer representing the number of rows of the
+                    game world.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.cells = bytearray(cols * rows)
+
+    def clear(self):
+        """
+            Clear the grid by marking every cell as free.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        self.cells = bytearray(self.cols * self.rows)
+
+    def insert(self, obj):
+        """
+            Mark the cell of the given object as occupied once more.
+
+            Parameters:
+            -----------
+                obj: tuple
+                        A tuple representing the cell of the object.
+
+            Returns:
+            --------
+                None
+        """
+        self.cells[obj[1] * self.cols + obj[0]] += 1
+
+    def remove(self, obj):
+        """
+            Release one occupation of the cell of the given object.
+
+            Parameters:
+            -----------
+                obj: tuple
+                        A tuple representing the cell of the object.
+
+            Returns:
+            --------
+                None
+        """
+        index = obj[1] * self.cols + obj[0]
+        if self.cells[index]:
+            self.cells[index] -= 1
+
+    def move(self, old, new):
+        """
+            Move one occupation from the cell old to the cell new.
+
+            Parameters:
+            -----------
+                old: tuple
+                        A tuple representing the current cell of the object.
+
+                new: tuple
+                        A tuple representing the new cell of the object.
+
+            Returns:
+            --------
+                True, if old was occupied and the occupation was moved,
+                False otherwise.
+        """
+        cols = self.cols
+        index = old[1] * cols + old[0]
+        if not self.cells[index]:
+            return False
+        self.cells[index] -= 1
+        self.cells[new[1] * cols + new[0]] += 1
+        return True
+
+    def is_open_space(self, x, y):
+        """
+            Check if the given cell is inside the grid and not occupied.
+
+            Parameters:
+            -----------
+                x: int
+                        An integer representing the column of the cell.
+
+                y: int
+                        An integer representing the row of the cell.
+
+            Returns:
+            --------
+                True, if the cell is an open space, False otherwise.
+        """
+        if not (0 <= x < self.cols and 0 <= y < self.rows):
+            return False
+        return not self.cells[y * self.cols + x]
+
+    def retrieve(self, return_objects, obj):
+        """
+            Retrieve the objects that could potentially collide with the
+            given object. On a grid these are exactly the objects on the same
+            cell, so the cell is added once for every time it is occupied.
+
+            Parameters:
+            -----------
+                return_objects: list
+                            A list the colliding objects are added to.
+
+                obj: tuple
+                            A tuple representing the cell of the object.
+
+            Returns:
+            --------
+                list
+                    The return_objects list.
+        """
+        x, y = obj[0], obj[1]
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            return_objects.extend([(x, y)] * self.cells[y * self.cols + x])
+        return return_objects
+
+    def query_rect(self, rect, found=None):
+        """
+            Find all occupied cells inside the given rectangle.
+
+            Parameters:
+            -----------
+                rect: tuple
+                        A tuple (left, top, right, bottom) of cells; right
+                        and bottom are exclusive.
+
+                found: list
+                        Optional list to append the cells to.
+
+            Returns:
+            --------
+                list
+                    The occupied cells, one entry per occupation.
+        """
+        if found is None:
+            found = []
+
+        cols = self.cols
+        cells = self.cells
+        left, top = max(0, int(rect[0])), max(0, int(rect[1]))
+        right, bottom = min(cols, int(rect[2])), min(self.rows, int(rect[3]))
+        for y in range(top, bottom):
+            row = y * cols
+            for x in range(left, right):
+                count = cells[row + x]
+                if count:
+                    found.extend([(x, y)] * count)
+        return found
+
+
+class FreeCells:
+    """
+        Indexable set of the free cells of the game world.
+        The free cells are stored densely in a list, and a second list maps
+        every cell index (``y * cols + x``) to its slot in the first list,
+        or -1 if the cell is occupied. Removing a cell swaps the last free
+        cell into its slot, so adding, removing and membership tests are
+        O(1), and a uniformly distributed free cell can be drawn in O(1) by
+        picking a random slot.
+
+        Parameters:
+        -----------
+            cols: int
+                    An integer representing the number of columns of the
+                    game world.
+
+            rows: int
+                    An integer representing the number of rows of the
+                    game world.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.clear()
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return self.slots[cell[1] * self.cols + cell[0]] != -1
+
+    def clear(self):
+        """
+            Mark every cell of the game world as free.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        self.cells = list(range(self.cols * self.rows))
+        self.slots = list(range(self.cols * self.rows))
+
+    def add(self, cell):
+        """
+            Mark the given cell as free.
+
+            Parameters:
+            -----------
+                cell: tuple
+                        A tuple representing the cell.
+
+            Returns:
+            --------
+                None
+        """
+        index = cell[1] * self.cols + cell[0]
+        if self.slots[index] == -1:
+            self.slots[index] = len(self.cells)
+            self.cells.append(index)
+
+    def discard(self, cell):
+        """
+            Mark the given cell as occupied. The last free cell is moved into
+            the slot of the removed one.
+
+            Parameters:
+            -----------
+                cell: tuple
+                        A tuple representing the cell.
+
+            Returns:
+            --------
+                None
+        """
+        index = cell[1] * self.cols + cell[0]
+        slot = self.slots[index]
+        if slot == -1:
+            return
+
+        last = self.cells.pop()
+        if last != index:
+            self.cells[slot] = last
+            self.slots[last] = slot
+        self.slots[index] = -1
+
+    def choice(self, randrange=randrange):
+        """
+            Draw a uniformly distributed free cell.
+
+            Parameters:
+            -----------
+                randrange: callable
+                        The ``randrange`` function of the random number
+                        generator to use.
+
+            Returns:
+            --------
+                tuple
+                    A tuple representing the cell, None if the board is full.
+        """
+        if not self.cells:
+            return None
+        index = self.cells[randrange(len(self.cells))]
+        return (index % self.cols, index // self.cols)
@@ -0,0 +1,198 @@
+"""
+    Hamiltonian cycle autopilot
+    ---------------------------
+    Autopilot that follows a Hamiltonian cycle, i.e. a closed path that
+    visits every cell of the board exactly once. A snake that follows the
+    cycle can never run into itself, so it eventually fills the whole
+    board. The cycle is computed once per board size and cached; every tick
+    is a table lookup.
+
+    To reach the food faster, the snake may take shortcuts to a neighbour
+    further ahead on the cycle. A shortcut never passes the food or the
+    tail, so the body keeps lying in cycle order behind the head, and it is
+    only taken while the snake covers a small part of the board.
+"""
+
+
+from functools import lru_cache
+
+from .models import OPPOSITE_DIRECTIONS
+from .pathfinding import NEIGHBOUR_OFFSETS
+
+
+FOOD_MAX_VALUE = 5  # largest growth a single food can cause
+
+
+def has_hamiltonian_cycle(cols, rows):
+    """
+        Check if a board of the given size has a Hamiltonian cycle, i.e. if
+        the Hamiltonian autopilot can be used on it. This is the case if
+        the board has at least two rows and columns and an even number of
+        cells.
+
+        Parameters:
+        -----------
+            cols: int
+                    The number of columns of the board.
+
+            rows: int
+                    The number of rows of the board.
+
+        Returns:
+        --------
+            True, if hamiltonian_cycle can build a cycle, False otherwise.
+    """
+    return cols >= 2 and rows >= 2 and (cols * rows) % 2 == 0
+
+
+@lru_cache(maxsize=None)
+def hamiltonian_cycle(cols, rows):
+    """
+        Build a Hamiltonian cycle for a board of the given size.
+
+        For an even number of rows the cycle runs through the columns
+        1 .. cols - 1 row by row in alternating directions and returns
+        upwards along column 0. For an odd number of rows and an even
+        number of columns the same construction is used with rows and
+        columns swapped. A board with an odd number of cells has no
+        Hamiltonian cycle (see has_hamiltonian_cycle).
+
+        Parameters:
+        -----------
+            cols: int
+                    The number of columns of the board.
+
+            rows: int
+                    The number of rows of the board.
+
+        Returns:
+        --------
+            tuple
+                (order, positions): the cells in cycle order, and the
+                cycle position of every cell indexed by ``y * cols + x``.
+    """
+    if rows % 2 == 0 and cols >= 2:
+        order = []
+        for y in range(rows):
+            xs = range(1, cols) if y % 2 == 0 else range(cols - 1, 0, -1)
+            order.extend((x, y) for x in xs)
+        order.extend((0, y) for y in range(rows - 1, -1, -1))
+    elif cols % 2 == 0 and rows >= 2:
+        order = [(x, y) for y, x in hamiltonian_cycle(rows, cols)[0]]
+    else:
+        raise ValueError(
+            f'a {cols}x{rows} board has no Hamiltonian cycle')
+
+    positions = [0] * (cols * rows)
+    for position, (x, y) in enumerate(order):
+        positions[y * cols + x] = position
+    return tuple(order), tuple(positions)
+
+
+class HamiltonianAutopilot:
+    """
+        Autopilot that follows the Hamiltonian cycle of the board.
+
+        Parameters:
+        -----------
+            cols: int
+                    The number of columns of the board.
+
+            rows: int
+                    The number of rows of the board.
+
+            shortcuts: bool
+                    True to allow shortcuts towards the food.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, cols, rows, shortcuts=True):
+        self.cols = cols
+        self.rows = rows
+        self.shortcuts = shortcuts
+        self.order, self.positions = hamiltonian_cycle(cols, rows)
+        self.size = len(self.order)
+
+    def position(self, cell):
+        return self.positions[cell[1] * self.cols + cell[0]]
+
+    def nearest_cell(self, engine, head_position, behind):
+        best = None
+        best_jump = self.size
+        head_x, head_y = engine.snake.head
+        for dx, dy in NEIGHBOUR_OFFSETS:
+            cell = (head_x + dx, head_y + dy)
+            if cell == behind or not engine.is_open_space(*cell):
+                continue
+            jump = (self.position(cell) - head_position) % self.size
+            if jump < best_jump:
+                best = cell
+                best_jump = jump
+        return best
+
+    def next_cell(self, engine):
+        """
+            Determine the next cell for the head of the engine's snake.
+
+            Without a shortcut this is the successor of the head on the
+            cycle. A neighbour further ahead is taken instead if
+
+                - it is free and not behind the food or the tail on the
+                  cycle, and
+                - the cycle interval from the tail to the new head, plus
+                  the growth that is still due and the growth of one more
+                  food, stays within half of the board.
+
+            The second condition keeps enough free cells ahead of the head
+            for the tail to catch up with the cells that were skipped.
+
+            A snake of a single cell cannot turn around, so if the
+            successor lies behind it, the nearest free cell ahead on the
+            cycle is taken instead.
+
+            Parameters:
+            -----------
+                engine: GameEngine
+                        The engine to determine the move for.
+
+            Returns:
+            --------
+                tuple
+                    The next cell of the head.
+        """
+        size = self.size
+        head = engine.snake.head
+        head_position = self.position(head)
+        next_cell = self.order[(head_position + 1) % size]
+        behind = engine.next_head(OPPOSITE_DIRECTIONS[engine.direction])
+        if next_cell == behind:
+            return self.nearest_cell(engine, head_position, behind)
+        if not self.shortcuts or engine.food is None:
+            return next_cell
+
+        snake = engine.snake
+        tail = snake.tail
+        tail_position = self.position(tail)
+        pending = snake.counts[tail] - 1
+        to_tail = (tail_position - head_position) % size or size
+        to_food = (self.position(engine.food.position) - head_position) % size
+        limit = size // 2 - pending - FOOD_MAX_VALUE
+
+        best_jump = 1
+        head_x, head_y = head
+        for dx, dy in NEIGHBOUR_OFFSETS:
+            x, y = head_x + dx, head_y + dy
+            if not engine.is_open_space(x, y):
+                continue
+
+            jump = (self.position((x, y)) - head_position) % size
+            if jump <= best_jump or jump > to_food or jump >= to_tail:
+                continue
+            if (head_position + jump - tail_position) % size + 1 > limit:
+                continue
+            best_jump = jump
+            next_cell = (x, y)
+        return next_cell
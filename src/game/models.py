@@ -1 +1,284 @@
-# Spielmodelle 
+"""
+    Game models
+    -----------
+    Plain Python models of the objects that live in the game world. None of
+    the classes in this module depend on Qt, so they can be used by the
+    headless engine as well as by the graphical frontend.
+
+    All positions are given in grid cells, not in pixels. Converting a cell
+    into screen coordinates is the responsibility of the renderer.
+"""
+
+
+from collections import deque
+from random import Random
+
+
+class Direction:
+    """
+        Enumeration for the snake's direction.
+        The Direction enumeration is used to represent the possible directions
+        of the snake in the game world. It defines the possible directions
+        in which the snake can move: left, right, up, and down.
+    """
+    Left = 0
+    Right = 1
+    Up = 2
+    Down = 3
+
+
+# Cell offset for a single step in each direction
+DIRECTION_DELTAS = {
+    Direction.Left: (-1, 0),
+    Direction.Right: (1, 0),
+    Direction.Up: (0, -1),
+    Direction.Down: (0, 1),
+}
+
+# The snake is not allowed to turn back onto itself
+OPPOSITE_DIRECTIONS = {
+    Direction.Left: Direction.Right,
+    Direction.Right: Direction.Left,
+    Direction.Up: Direction.Down,
+    Direction.Down: Direction.Up,
+}
+
+
+class BoardFullError(Exception):
+    """
+        Raised when food should be spawned but there is no free cell left.
+        A full board means the snake has filled the game world, i.e. the
+        game is won.
+    """
+
+
+class Snake:
+    """
+        Body of the snake.
+        The cells of the snake are stored in a deque with the head at the
+        left end, so moving the head and retracting the tail are O(1). A
+        dict counts how often every cell is part of the body, so checking
+        whether a cell is occupied by the snake is O(1) as well.
+
+        When the snake grows, its tail cell is repeated (see ``grow``). The
+        repeated cells stay in the deque until the snake has moved away from
+        them, which is why the occupation of a cell is counted instead of
+        being stored in a plain set.
+
+        Parameters:
+        -----------
+            start: tuple
+                    A tuple representing the start cell of the snake.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, start):
+        self.body = deque([start])
+        self.counts = {start: 1}
+
+    def __len__(self):
+        return len(self.body)
+
+    def __iter__(self):
+        return iter(self.body)
+
+    def __contains__(self, cell):
+        return cell in self.counts
+
+    @property
+    def head(self):
+        return self.body[0]
+
+    @property
+    def tail(self):
+        return self.body[-1]
+
+    def advance(self, cell, grow=False):
+        """
+            Move the head into the given cell. Unless grow is set, the tail
+            is retracted by one cell.
+
+            Parameters:
+            -----------
+                cell: tuple
+                        A tuple representing the new cell of the head.
+
+                grow: bool
+                        True to keep the tail in place.
+
+            Returns:
+            --------
+                tuple
+                    The cell that was removed from the tail, None if the
+                    snake grew.
+        """
+        self.body.appendleft(cell)
+        counts = self.counts
+        counts[cell] = counts.get(cell, 0) + 1
+        if grow:
+            return None
+
+        tail = self.body.pop()
+        if counts[tail] == 1:
+            del counts[tail]
+        else:
+            counts[tail] -= 1
+        return tail
+
+    def grow(self, amount):
+        """
+            Grow the snake by repeating its tail cell. The snake gets longer
+            over the following ``amount`` ticks while it moves away from
+            the repeated cell.
+
+            Parameters:
+            -----------
+                amount: int
+                        The number of cells the snake grows by.
+
+            Returns:
+            --------
+                None
+        """
+        tail = self.body[-1]
+        self.body.extend([tail] * amount)
+        self.counts[tail] += amount
+
+    def collides(self, cell):
+        """
+            Check if the given cell is occupied by the snake.
+
+            Parameters:
+            -----------
+                cell: tuple
+                        A tuple representing the cell.
+
+            Returns:
+            --------
+                True, if the cell is part of the snake, False otherwise.
+        """
+        return cell in self.counts
+
+
+class Food:
+    """
+        Initialize the Food object with the given free cells and random
+        number generator.
+
+        The free_cells parameter is the FreeCells index of the game world.
+        The food is placed on a cell drawn uniformly from it. Position, type
+        and value are drawn from the given random number generator, so a
+        seeded generator makes the food sequence reproducible.
+
+        Parameters:
+        -----------
+            free_cells: FreeCells
+                        The index of the free cells of the game world.
+
+            rng: Random
+                        The random number generator of the game. A new
+                        unseeded generator is used if none is given.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, free_cells, rng=None):
+        self.position = (0, 0)
+        self.free_cells = free_cells
+        self.rng = rng if rng is not None else Random()
+        self.golden_apple_chance = 0.1  # Wahrscheinlichkeit für goldenen Apfel
+        self.food_details = self.spawn()
+
+    def get_food_details(self):
+        """
+            Return a string representation of the food object.
+            The get_food_details method is used to return a string
+            representation of the food object. The string representation
+            of the food object includes the position, food type, and
+            value of the food object.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                str
+                    A string representation of the food object.
+        """
+        return self.food_details
+
+    def decide_food_type(self):
+        return ('special' if self.rng.random() < self.golden_apple_chance
+                else 'normal')
+
+    def spawn(self):
+        """
+            Generate the random position for the food object in the game world.
+
+            The spawn method is used to generate the random position for the
+            food object in the game world. The position is drawn uniformly
+            from the free cells, so spawning takes constant time no matter
+            how full the board is.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                dict
+                    The position, food type and value of the food object.
+
+            Raises:
+            -------
+                BoardFullError
+                    If there is no free cell left.
+        """
+        position = self.free_cells.choice(self.rng.randrange)
+        if position is None:
+            raise BoardFullError('no free cell left to spawn food on')
+
+        self.position = position
+        self.food_type = self.decide_food_type()
+        self.assign_value()
+        return {"position": self.position,
+                "food_type": self.food_type,
+                "value": self.value
+                }
+
+    def assign_value(self):
+        """
+            Assign the value for the food object.
+
+            The assign_value method is used to assign the value for the food
+            object. The value is used to determine how many times the snake
+            will grow when it eats the food.
+
+            There is either a 20% probability of assigning a value of 2 to the
+            food object or a 80% probability of assigning a value of 1 to the
+            food object.
+
+            The value is assigned using a probability of 20% to 80% by
+            generating a random number. If the random number is less than 0.2,
+            the value of the food object will be 2. If the random number is
+            greater than or equal to 0.2, the value of the food object will be
+            1 instead.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        if self.food_type == 'special':
+            self.value = 5  # Spezialnahrung gibt mehr Punkte
+        else:
+            self.value = 2 if self.rng.random() < 0.2 else 1
@@ -0,0 +1,302 @@
+"""
+    Pathfinding
+    -----------
+    Search algorithms used by the autopilot. The functions in this module
+    only depend on an object that implements ``is_open_space(x, y)``, so they
+    work with the quadtree as well as with the game engine itself.
+"""
+
+
+from heapq import heappop, heappush
+from itertools import count
+
+
+NEIGHBOUR_OFFSETS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+
+
+def astar(quadtree, start, end):
+    """
+        A* (A-Star) algorithm implementation to find the shortest path.
+        The A* (A-Star) algorithm is an informed search algorithm that is
+        used to find the shortest path between two points. It is widely
+        used in many fields, including games, robotics, and geographical
+        information systems. The algorithm uses a heuristic function to
+        estimate the cost of reaching the goal from the current position
+        and makes use of this estimate to find the most promising path to
+        explore.
+
+        The A* algorithm uses a combination of the g, h, and f values to
+        determine the most promising path. The g value represents the
+        cost of the path from the start to the current position, and the
+        h value represents the estimated cost of the path from the current
+        position to the goal. The f value is the sum of the g and h values
+        and is used to determine the most promising path to explore next.
+
+        The A* algorithm uses a priority queue to explore the most promising
+        path first and gradually explores the other paths based on the f value.
+
+        The implementation of the A* algorithm consists of the following steps:
+            1. Push the start position onto the open heap.
+            2. Pop the entry with the lowest f value from the heap. Entries
+               whose position has already been closed are stale (lazy
+               deletion) and are skipped.
+            3. Return the path if the popped position is the end position.
+            4. Close the position and look at the four adjacent positions.
+               A neighbour is pushed onto the heap if it is an open space,
+               not yet closed and reached with a lower g value than before.
+            5. Repeat until the end is found or the heap is empty.
+
+        The open set is a binary heap and the g values, parents and closed
+        positions are kept in dicts and sets keyed by position, so every
+        heap operation costs O(log n) and every lookup O(1).
+
+        The heuristic is the Manhattan distance, which never overestimates
+        the cost on a grid with four directions, so the returned path is a
+        shortest path.
+
+        Parameters:
+        -----------
+            quadtree: Quadtree
+                        A Quadtree object representing the quadtree in the
+                        game world, or any other object providing
+                        ``is_open_space(x, y)`` such as the GameEngine.
+
+            start: tuple
+                        A tuple representing the start position in the
+                        game world.
+
+            end: tuple
+                        A tuple representing the end position in the
+                        game world.
+
+        Returns:
+        --------
+            path: list
+                        A list representing the shortest path between the start
+                        and end positions in the game world, including
+                        both. None if there is no path.
+    """
+
+    end_x, end_y = end
+    counter = count()  # tie breaker, positions are never compared
+    open_heap = [(abs(start[0] - end_x) + abs(start[1] - end_y), 0,
+                  next(counter), start)]
+    g_scores = {start: 0}
+    parents = {start: None}
+    closed = set()
+
+    while open_heap:
+        _, g, _, position = heappop(open_heap)
+        if position in closed:
+            continue
+
+        # Found the end position
+        if position == end:
+            path = []
+            while position is not None:
+                path.append(position)
+                position = parents[position]
+            return path[::-1]  # Return reversed path
+
+        closed.add(position)
+        x, y = position
+        child_g = g + 1
+
+        # Adjacent squares
+        for dx, dy in NEIGHBOUR_OFFSETS:
+            child = (x + dx, y + dy)
+            if child in closed:
+                continue
+
+            # Make sure the new position is free and inside the game world
+            if not quadtree.is_open_space(child[0], child[1]):
+                continue
+
+            if child_g < g_scores.get(child, child_g + 1):
+                g_scores[child] = child_g
+                parents[child] = position
+                h = abs(child[0] - end_x) + abs(child[1] - end_y)
+                heappush(open_heap, (child_g + h, child_g,
+                                     next(counter), child))
+
+    return None
+
+
+class PathCache:
+    """
+        Cached path to a goal that is repaired instead of recomputed.
+        Between two ticks the board only changes in two cells: the head
+        enters a cell and the tail leaves one. A freed cell can never make
+        a path invalid, and the cell entered by the head is normally the
+        next cell of the cached path. So instead of searching from scratch
+        on every tick, the path is kept and only checked against the cells
+        reported through ``block``:
+
+            - the head moved along the path: the path is reused as is
+            - a cell further down the path was blocked: the path is
+              repaired by searching from the head to the first cell behind
+              the blocked ones and splicing in the rest of the cached path.
+              This happens when the snake left the path (e.g. to follow
+              its tail), crossed it further ahead and returned to it
+              behind the crossing.
+            - the goal moved or the head left the path: full search
+
+        Parameters:
+        -----------
+            search: callable
+                    The search function, called as
+                    ``search(space, start, goal)`` like ``astar``.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, search=astar):
+        self.search = search
+        self.searches = 0
+        self.repairs = 0
+        self.hits = 0
+        self.clear()
+
+    def clear(self):
+        self.path = []
+        self.index = {}
+        self.position = 0
+        self.goal = None
+        self.blocked = None
+
+    def set_path(self, path, offset=0):
+        self.path = path or []
+        self.index = {cell: i for i, cell in enumerate(self.path)}
+        self.position = offset
+        self.blocked = None
+
+    def block(self, cell):
+        """
+            Report a cell that has become occupied.
+
+            Parameters:
+            -----------
+                cell: tuple
+                        A tuple representing the cell.
+
+            Returns:
+            --------
+                None
+        """
+        index = self.index.get(cell)
+        if index is not None and index > self.position:
+            if self.blocked is None or index > self.blocked:
+                self.blocked = index
+
+    def replan(self, space, start, goal):
+        self.searches += 1
+        self.goal = goal
+        self.set_path(self.search(space, start, goal))
+
+    def avoid(self, space, start, cell, goal):
+        """
+            Search a path from start to goal that does not begin with the
+            given cell, e.g. the cell behind the head of a snake of one
+            cell, which it cannot move back into.
+
+            Parameters:
+            -----------
+                space: object
+                        An object providing ``is_open_space(x, y)``.
+
+                start: tuple
+                        The cell of the head.
+
+                cell: tuple
+                        The cell the path must not begin with.
+
+                goal: tuple
+                        The cell to reach.
+
+            Returns:
+            --------
+                tuple
+                    The next cell, None if the goal cannot be reached.
+        """
+        self.searches += 1
+        self.goal = goal
+        best = None
+        x, y = start
+        for dx, dy in NEIGHBOUR_OFFSETS:
+            first = (x + dx, y + dy)
+            if first == cell or not space.is_open_space(first[0], first[1]):
+                continue
+            path = self.search(space, first, goal)
+            if path and (best is None or len(path) < len(best)):
+                best = path
+        self.set_path([start] + best if best else None)
+        return best[0] if best else None
+
+    def repair(self, space, start):
+        """
+            Reconnect the head to the part of the cached path behind the
+            furthest blocked cell. Falls back to a full search if that part
+            cannot be reached.
+
+            Parameters:
+            -----------
+                space: object
+                        An object providing ``is_open_space(x, y)``.
+
+                start: tuple
+                        The cell of the head.
+
+            Returns:
+            --------
+                None
+        """
+        self.repairs += 1
+        rejoin = self.blocked + 1
+        if rejoin >= len(self.path):
+            self.replan(space, start, self.goal)
+            return
+
+        detour = self.search(space, start, self.path[rejoin])
+        if not detour:
+            self.replan(space, start, self.goal)
+            return
+        self.set_path(detour + self.path[rejoin + 1:])
+
+    def next_cell(self, space, start, goal):
+        """
+            Determine the next cell on the way from start to goal.
+
+            Parameters:
+            -----------
+                space: object
+                        An object providing ``is_open_space(x, y)``.
+
+                start: tuple
+                        The cell of the head.
+
+                goal: tuple
+                        The cell to reach.
+
+            Returns:
+            --------
+                tuple
+                    The next cell, None if the goal cannot be reached.
+        """
+        position = self.index.get(start)
+        if goal != self.goal or position is None:
+            self.replan(space, start, goal)
+        else:
+            self.position = position
+            if self.blocked is not None and self.blocked <= position:
+                self.blocked = None
+
+            if self.blocked is not None:
+                self.repair(space, start)
+            else:
+                self.hits += 1
+
+        if self.position + 1 < len(self.path):
+            return self.path[self.position + 1]
+        return None
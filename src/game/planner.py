@@ -0,0 +1,239 @@
+"""
+    Background autopilot planner
+    ----------------------------
+    Runs the autopilot search on a worker thread, so a slow search never
+    blocks the game loop. See the AutopilotPlanner class for details.
+"""
+
+
+from concurrent.futures import ThreadPoolExecutor
+from sys import stderr
+
+from .models import DIRECTION_DELTAS, OPPOSITE_DIRECTIONS
+from .pathfinding import astar
+
+
+def safe_action(engine):
+    """
+        Determine a cheap move that does not collide on the next tick.
+        Among the directions leading to a free cell, the one closest to the
+        food is chosen, the current direction wins ties.
+
+        Parameters:
+        -----------
+            engine: GameEngine
+                    The engine to determine the move for.
+
+        Returns:
+        --------
+            int
+                The direction (see Direction), None if every move collides.
+    """
+    head_x, head_y = engine.head
+    food = engine.food.position if engine.food is not None else engine.head
+    best = None
+    best_distance = None
+
+    for direction, (dx, dy) in DIRECTION_DELTAS.items():
+        if direction == OPPOSITE_DIRECTIONS[engine.direction]:
+            continue
+        x, y = head_x + dx, head_y + dy
+        if not engine.is_open_space(x, y):
+            continue
+
+        distance = abs(food[0] - x) + abs(food[1] - y)
+        if (best is None or distance < best_distance
+                or (distance == best_distance
+                    and direction == engine.direction)):
+            best = direction
+            best_distance = distance
+    return best
+
+
+class AutopilotPlanner:
+    """
+        Autopilot that plans on a worker thread.
+        On every tick ``next_action`` collects a finished search (if any)
+        and follows the published path. It never waits for the worker: if
+        no valid path is available, e.g. because the search is late or the
+        food has just moved, the snake follows its tail instead (see
+        TailCheck.escape, or ``safe_action`` if no move keeps the tail
+        reachable), and a snapshot of the board is handed to the worker to
+        plan ahead from the cell that move leads to. A search that raises
+        is reported and counted in ``errors``, and the snake falls back to
+        these moves as well, so an error never propagates into the game
+        loop.
+
+        A path that was planned on the board of an earlier tick stays
+        usable as long as the head is on the path and the next cell of the
+        path is still free. Before a published path is followed for the
+        first time, it is checked with the engine's TailCheck; a path that
+        would trap the snake is not followed.
+
+        Parameters:
+        -----------
+            search: callable
+                    The search function, called as
+                    ``search(board, start, goal)`` like ``astar``.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, search=astar):
+        self.search = search
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='autopilot')
+        self.future = None
+        self.fallbacks = 0
+        self.errors = 0
+        self.clear_path()
+
+    def clear_path(self):
+        self.path = []
+        self.path_index = {}
+        self.goal = None
+        self.path_safe = None
+
+    def reset(self):
+        """
+            Drop the current path and any running search, e.g. after a
+            restart.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        if self.future is not None:
+            self.future.cancel()
+            self.future = None
+        self.clear_path()
+
+    def shutdown(self):
+        self.reset()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def plan(self, board, start, goal):
+        return self.search(board, start, goal), goal
+
+    def request(self, engine, action):
+        """
+            Start a search on a snapshot of the current board unless one is
+            already running. The search starts at the cell the head moves
+            into with the given action, so its result is ready to be
+            followed on one of the next ticks.
+
+            Parameters:
+            -----------
+                engine: GameEngine
+                        The engine to plan for.
+
+                action: int
+                        The direction the snake moves in on this tick.
+
+            Returns:
+            --------
+                None
+        """
+        if self.future is not None or engine.food is None or action is None:
+            return
+
+        self.future = self.executor.submit(
+            self.plan, engine.snapshot(), engine.next_head(action),
+            engine.food.position)
+
+    def collect(self):
+        """
+            Publish the result of the running search if it has finished.
+            If the search raised, the error is printed and the current path
+            is dropped.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        if self.future is None or not self.future.done():
+            return
+
+        future, self.future = self.future, None
+        try:
+            path, goal = future.result()
+        except Exception as e:
+            self.errors += 1
+            print(f"Autopilot search failed: {e!r}", file=stderr)
+            self.clear_path()
+            return
+
+        self.path = path or []
+        self.path_index = {cell: i for i, cell in enumerate(self.path)}
+        self.goal = goal
+        self.path_safe = None
+
+    def follow_path(self, engine):
+        """
+            Determine the next move along the published path.
+
+            Parameters:
+            -----------
+                engine: GameEngine
+                        The engine to determine the move for.
+
+            Returns:
+            --------
+                int
+                    The direction (see Direction), None if the path is
+                    missing, outdated, blocked or unsafe.
+        """
+        if engine.food is None or self.goal != engine.food.position:
+            return None
+
+        index = self.path_index.get(engine.head)
+        if index is None or index + 1 >= len(self.path):
+            return None
+
+        next_x, next_y = self.path[index + 1]
+        if not engine.is_open_space(next_x, next_y):
+            return None
+
+        if self.path_safe is None:
+            self.path_safe = engine.tail_check.path_is_safe(
+                engine, self.path, index)
+        if not self.path_safe:
+            return None
+        return engine.direction_to((next_x, next_y))
+
+    def next_action(self, engine):
+        """
+            Determine the autopilot move for the current tick without
+            blocking on the search.
+
+            Parameters:
+            -----------
+                engine: GameEngine
+                        The engine to determine the move for.
+
+            Returns:
+            --------
+                int
+                    The direction (see Direction) or None.
+        """
+        self.collect()
+        action = self.follow_path(engine)
+        if action is None:
+            self.fallbacks += 1
+            cell = engine.tail_check.escape(engine)
+            if cell is not None:
+                action = engine.direction_to(cell)
+            else:
+                action = safe_action(engine)
+            self.request(engine, action)
+        return action
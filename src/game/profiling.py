@@ -0,0 +1,202 @@
+"""
+    Profiling hooks
+    ---------------
+    Captures a CPU profile (cProfile) and the memory allocations
+    (tracemalloc) of a running game on demand, e.g. when a session starts
+    to stutter, without restarting it under an external profiler. See the
+    Profiler class for details.
+"""
+
+
+from cProfile import Profile
+from io import StringIO
+from itertools import count
+from os import makedirs, path
+from pstats import Stats
+from time import strftime
+import tracemalloc
+
+
+TOP = 15  # number of functions and allocation sites in the summary
+
+
+class Profiler:
+    """
+        Profiles the code between ``start`` and ``stop``.
+
+        While the profiler is active, cProfile records every function call
+        of the thread that started it (the autopilot worker thread is not
+        included) and tracemalloc records where memory is allocated. On
+        ``stop`` three files are written to the output directory, all named
+        after the start time:
+
+            snake-YYYYmmdd-HHMMSS.prof       the cProfile statistics, e.g.
+                                             for snakeviz or pstats
+            snake-YYYYmmdd-HHMMSS.snapshot   the tracemalloc snapshot, see
+                                             tracemalloc.Snapshot.load
+            snake-YYYYmmdd-HHMMSS.txt        the summary
+
+        Captures started in the same second are told apart by a counter,
+        e.g. snake-YYYYmmdd-HHMMSS-2. The name is claimed by creating the
+        summary file exclusively, so neither a second capture nor another
+        game running at the same time overwrites an earlier one.
+
+        If a number of ticks is given to ``start``, the capture stops on
+        its own after that many calls of ``tick``.
+
+        Parameters:
+        -----------
+            directory: str
+                    The directory the files are written to. It is created
+                    if it does not exist.
+
+            top: int
+                    The number of functions and allocation sites listed in
+                    the summary.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, directory, top=TOP):
+        self.directory = directory
+        self.top = top
+        self.profile = None
+        self.name = None
+        self.ticks = 0
+        self.limit = None
+        self.tracing = False
+
+    @property
+    def active(self):
+        return self.profile is not None
+
+    def start(self, ticks=None):
+        """
+            Start capturing.
+
+            Parameters:
+            -----------
+                ticks: int
+                        Stop after this many ticks, None to capture until
+                        ``stop`` is called.
+
+            Returns:
+            --------
+                None
+        """
+        if self.active:
+            return
+
+        self.name = strftime('snake-%Y%m%d-%H%M%S')
+        self.ticks = 0
+        self.limit = ticks
+        # Leave tracemalloc running if it was started elsewhere
+        self.tracing = not tracemalloc.is_tracing()
+        if self.tracing:
+            tracemalloc.start()
+        self.profile = Profile()
+        self.profile.enable()
+
+    def tick(self):
+        """
+            Count a tick of the captured window.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                str
+                    The summary if the capture stopped because the number
+                    of ticks was reached, None otherwise.
+        """
+        if not self.active:
+            return None
+
+        self.ticks += 1
+        if self.limit is not None and self.ticks >= self.limit:
+            return self.stop()
+        return None
+
+    def stop(self):
+        """
+            Stop capturing and write the profile, the snapshot and the
+            summary to the output directory.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                str
+                    The summary with the paths of the written files, the
+                    top functions by cumulative time and the top
+                    allocation sites, None if the profiler was not active.
+        """
+        if not self.active:
+            return None
+
+        profile, self.profile = self.profile, None
+        profile.disable()
+        snapshot = tracemalloc.take_snapshot()
+        if self.tracing:
+            tracemalloc.stop()
+
+        makedirs(self.directory, exist_ok=True)
+        file = self.claim()
+        with file:
+            base = path.join(self.directory, self.name)
+            profile.dump_stats(base + '.prof')
+            snapshot.dump(base + '.snapshot')
+
+            summary = self.summarize(profile, snapshot, base)
+            file.write(summary)
+        return summary
+
+    def claim(self):
+        """
+            Find an unused name for the capture, starting with the start
+            time, and create its summary file.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                file
+                    The summary file, opened for writing.
+        """
+        name = self.name
+        for number in count(2):
+            try:
+                file = open(path.join(self.directory, self.name + '.txt'),
+                            'x')
+            except FileExistsError:
+                self.name = f'{name}-{number}'
+                continue
+            return file
+
+    def summarize(self, profile, snapshot, base):
+        stream = StringIO()
+        stream.write(f'Profile {self.name}')
+        if self.ticks:
+            stream.write(f' of {self.ticks} ticks')
+        stream.write(f'\n  {base}.prof\n  {base}.snapshot\n\n'
+                     f'Top {self.top} functions by cumulative time:\n')
+        Stats(profile, stream=stream).sort_stats('cumulative').print_stats(
+            self.top)
+
+        stream.write(f'Top {self.top} allocation sites:\n')
+        # Allocations of the profilers themselves are not of interest
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+        for stat in snapshot.statistics('lineno')[:self.top]:
+            stream.write(f'  {stat}\n')
+        return stream.getvalue()
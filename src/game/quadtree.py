@@ -0,0 +1,463 @@
+"""
+    Quadtree
+    --------
+    Spatial index over the game world. See the Quadtree class for details.
+"""
+
+
+from math import ceil, log2
+
+
+MAX_OBJECTS = 4  # objects a node holds before it is split
+
+
+class Quadtree:
+    """
+        Quadtree data structure to represent the game world.
+        The Quadtree is used to store the game objects in the game world. It
+        uses a hierarchical tree structure to represent the game world, which
+        makes collision detection more efficient.
+
+        The Quadtree recursively divides the game world into four quadrants,
+        and can store the game objects in each quadrant based on their
+        position in the game world.
+
+        What is a Quadtree?
+        -------------------
+        A quadtree is a tree data structure in which each internal node has
+        exactly four children. Quadtrees are the two-dimensional analog of
+        octrees and are most often used to partition a two-dimensional
+        space by recursively subdividing it into four quadrants or regions. The
+        regions may be square or rectangular, or may have arbitrary shapes.
+
+        This data structure is used in many computational geometry algorithms
+        and applications, such as the point location problem and image
+        processing. The sub regions may be referred to as quads. Each
+        node in the tree contains four nodes, which represent the four
+        quadrants of the space.
+
+        It should be noted that the term "quadtree" is often used to refer
+        to the tree data structure itself, not the quadrants.
+
+        Incremental updates
+        -------------------
+        Every node counts the objects in its subtree. When ``remove`` or
+        ``move`` leaves a split node with no more than MAX_OBJECTS objects,
+        its children are merged back into it, so the tree shrinks with the
+        snake instead of only ever growing. The tree is split down to about
+        single cells, so insert, remove and move touch O(log n) nodes.
+    """
+
+    def __init__(self, bounds, level=0, max_levels=None):
+        """
+            Initialize the quadtree with the given bounds and level.
+            The bounds parameter is a tuple representing the bounds of the
+            quadtree in the game world, and the level parameter represents the
+            level of the quadtree.
+
+            Parameters:
+            -----------
+                bounds: tuple
+                    A tuple representing the bounds of the quadtree in the game
+                    world.
+
+                level: int
+                    An integer representing the level of the quadtree.
+
+                max_levels: int
+                    The deepest level a node can be split to. By default the
+                    tree is split until the quadrants are about one cell in
+                    size.
+
+            Returns:
+            --------
+                None
+        """
+        if max_levels is None:
+            extent = max(bounds[2] - bounds[0], bounds[3] - bounds[1], 1)
+            max_levels = max(1, ceil(log2(extent)))
+        self.bounds = bounds
+        self.level = level
+        self.max_levels = max_levels
+        self.size = 0
+        self.objects = []
+        self.nodes = [None, None, None, None]
+
+    def clear(self):
+        """
+            Clear the quadtree by removing all the objects and nodes from the
+            quadtree.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        self.size = 0
+        self.objects = []
+        self.nodes = [None, None, None, None]
+
+    def split(self):
+        """
+            Split the quadtree into four quadrants.
+
+            1. top-right quadrant
+            2. top-left quadrant
+            3. bottom-left quadrant
+            4. bottom-right quadrant
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        try:
+            subWidth = (self.bounds[2] - self.bounds[0]) / 2
+            subHeight = (self.bounds[3] - self.bounds[1]) / 2
+            x, y = self.bounds[0], self.bounds[1]
+            level = self.level + 1
+            max_levels = self.max_levels
+
+            self.nodes = [
+                Quadtree((x + subWidth, y, x + subWidth * 2, y +
+                          subHeight), level, max_levels),  # top-right
+                Quadtree((x, y, x + subWidth, y + subHeight),
+                         level, max_levels),  # top-left
+                Quadtree((x, y + subHeight, x + subWidth, y + \
+                          subHeight * 2), level, max_levels),  # bottom-left
+                Quadtree((x + subWidth, y + subHeight, x + subWidth * 2,
+                          y + subHeight * 2),
+                         level, max_levels)  # bottom-right
+            ]
+        except ZeroDivisionError:
+            print(
+                'Dividing by zero is not allowed. This is due to the fact '
+                'that the new object would be at the exact corner of the '
+                'scene.'
+            )
+
+    def get_index(self, obj):
+        """
+            Determine the index for the given object.
+
+            The index is used to determine in which quadrant the object should
+            be placed based on the object's position.
+
+            0 | 1
+            -----
+            2 | 3
+
+            0: top-right
+            1: top-left
+            2: bottom-left
+            3: bottom-right
+
+            Parameters:
+            -----------
+                obj: tuple
+                        A tuple representing the position of the object in the
+                        game world.
+
+            Returns:
+            --------
+                index: int
+                        An integer representing the index of the quadrant.
+        """
+        try:
+            index = -1
+            vertical_midpoint = self.bounds[0] + \
+                (self.bounds[2] - self.bounds[0]) / 2
+            horizontal_midpoint = self.bounds[1] + \
+                (self.bounds[3] - self.bounds[1]) / 2
+
+            top_half = obj[1] < horizontal_midpoint
+            bottom_half = obj[1] >= horizontal_midpoint
+            left_half = obj[0] < vertical_midpoint
+            right_half = obj[0] >= vertical_midpoint
+
+            if top_half:
+                if right_half:
+                    index = 0
+                elif left_half:
+                    index = 1
+            elif bottom_half:
+                if left_half:
+                    index = 2
+                elif right_half:
+                    index = 3
+
+            return index
+        except ZeroDivisionError:
+            print(
+                'Dividing by zero is not allowed. This is due to the fact '
+                'that the new object would be at the exact corner of the '
+                'scene.'
+            )
+
+    def insert(self, obj):
+        """
+            Insert the given object into the quadtree.
+            The insert method is used to insert an object into the quadtree. If
+            the quadtree is already at its maximum capacity, the quadtree is
+            split into four quadrants.
+
+            Parameters:
+            -----------
+                obj: tuple
+                        A tuple representing the position of the object in the
+                        game world.
+
+            Returns:
+            --------
+                None
+        """
+        try:
+            self.size += 1
+            if self.nodes[0] is not None:
+                index = self.get_index(obj)
+                if index != -1:
+                    self.nodes[index].insert(obj)
+                    return
+
+            self.objects.append(obj)
+
+            if (len(self.objects) > MAX_OBJECTS
+                    and self.level < self.max_levels):
+                if not self.nodes[0]:
+                    self.split()
+
+                i = 0
+                while i < len(self.objects):
+                    index = self.get_index(self.objects[i])
+                    if index != -1 and self.nodes[index] is not None:
+                        self.nodes[index].insert(self.objects.pop(i))
+                    else:
+                        i += 1
+        except ZeroDivisionError:
+            print(
+                'Dividing by zero is not allowed. This is due to the fact '
+                'that the new object would be at the exact corner of the '
+                'scene.'
+            )
+
+    def remove(self, obj):
+        """
+            Remove the given object from the quadtree.
+            The remove method descends to the quadrant the object was
+            inserted into and removes one occurrence of the object there.
+            On the way back up, nodes whose subtree holds no more than
+            MAX_OBJECTS objects are merged (see merge).
+
+            Parameters:
+            -----------
+                obj: tuple
+                        A tuple representing the position of the object in the
+                        game world.
+
+            Returns:
+            --------
+                True, if the object was found and removed, False otherwise.
+        """
+        if self.nodes[0] is not None:
+            index = self.get_index(obj)
+            if index != -1 and self.nodes[index].remove(obj):
+                self.size -= 1
+                if self.size <= MAX_OBJECTS:
+                    self.merge()
+                return True
+
+        if obj in self.objects:
+            self.objects.remove(obj)
+            self.size -= 1
+            return True
+        return False
+
+    def merge(self):
+        """
+            Pull the objects of all children up into this node and drop the
+            children.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        for node in self.nodes:
+            if node is not None:
+                node.collect(self.objects)
+        self.nodes = [None, None, None, None]
+
+    def collect(self, found):
+        """
+            Append every object of the subtree to the given list.
+
+            Parameters:
+            -----------
+                found: list
+                        The list to append the objects to.
+
+            Returns:
+            --------
+                list
+                    The given list.
+        """
+        found.extend(self.objects)
+        if self.nodes[0] is not None:
+            for node in self.nodes:
+                node.collect(found)
+        return found
+
+    def move(self, old, new):
+        """
+            Move an object to a new position.
+            The move method descends as long as both positions fall into the
+            same quadrant, so only the smallest subtree containing both is
+            updated.
+
+            Parameters:
+            -----------
+                old: tuple
+                        A tuple representing the current position of the
+                        object.
+
+                new: tuple
+                        A tuple representing the new position of the object.
+
+            Returns:
+            --------
+                True, if the object was found and moved, False otherwise.
+                The quadtree is left unchanged if the object was not found.
+        """
+        if self.nodes[0] is not None:
+            index = self.get_index(old)
+            if index != -1 and index == self.get_index(new):
+                return self.nodes[index].move(old, new)
+
+        if not self.remove(old):
+            return False
+        self.insert(new)
+        return True
+
+    def query_rect(self, rect, found=None):
+        """
+            Find all objects inside the given rectangle.
+            Only the quadrants that overlap the rectangle are visited.
+
+            Parameters:
+            -----------
+                rect: tuple
+                        A tuple (left, top, right, bottom) like the bounds
+                        of the quadtree; right and bottom are exclusive.
+
+                found: list
+                        Optional list to append the objects to.
+
+            Returns:
+            --------
+                list
+                    The objects inside the rectangle, one entry per
+                    inserted occurrence.
+        """
+        if found is None:
+            found = []
+
+        left, top, right, bottom = rect
+        bounds = self.bounds
+        if (right <= bounds[0] or left >= bounds[2]
+                or bottom <= bounds[1] or top >= bounds[3]):
+            return found
+
+        for obj in self.objects:
+            if left <= obj[0] < right and top <= obj[1] < bottom:
+                found.append(obj)
+
+        if self.nodes[0] is not None:
+            for node in self.nodes:
+                node.query_rect(rect, found)
+        return found
+
+    def is_open_space(self, x, y):
+        """
+            Check if the given position is an open space.
+            An open space is a space in the game world that is not occupied by
+            any object.
+
+            Parameters:
+            -----------
+                x: int
+                        An integer representing the x-coordinate of the
+                        position.
+
+                y: int
+                        An integer representing the y-coordinate of the
+                        position.
+
+            Returns:
+            --------
+                True, if the position is an open space, False otherwise.
+        """
+        try:
+            bounds = self.bounds
+            if not (bounds[0] <= x < bounds[2] and bounds[1] <= y < bounds[3]):
+                return False
+
+            node = self
+            while node.nodes[0] is not None:
+                node = node.nodes[node.get_index((x, y))]
+                if not node.size:
+                    return True
+
+            for obj in node.objects:
+                if obj[0] == x and obj[1] == y:
+                    return False
+
+            return True
+        except ZeroDivisionError:
+            print(
+                'Dividing by zero is not allowed. This is due to the fact '
+                'that the new object would be at the exact corner of the '
+                'scene.'
+            )
+
+    def retrieve(self, return_objects, obj):
+        """
+            Retrieve the objects that could potentially collide with the
+            given object.
+
+            The retrieve method is used to retrieve the objects that could
+            potentially collide with the given object. It returns the objects
+            that could potentially collide with the given object as a list.
+
+            Parameters:
+            -----------
+                return_objects: list
+                            A list of objects that could potentially collide
+                            with the given object.
+
+                obj: tuple
+                            A tuple representing the position of the object in
+                            the game world.
+        """
+        try:
+            index = self.get_index(obj)
+            if index != -1 and self.nodes[0] is not None:
+                self.nodes[index].retrieve(return_objects, obj)
+
+            return_objects.extend(self.objects)
+
+            return return_objects
+        except ZeroDivisionError:
+            print(
+                'Dividing by zero is not allowed. This is due to the fact '
+                'that the new object would be at the exact corner of the '
+                'scene.'
+            )
@@ -0,0 +1,242 @@
+"""
+    Replays
+    -------
+    Compact binary recording of a game. Since the engine draws all random
+    decisions from its seeded random number generator, a game is fully
+    determined by its seed, the board and the rules, and the action of
+    every tick. A replay stores exactly that and can be played back on a
+    headless engine, much faster than real time.
+
+    File format (little endian):
+
+        offset  size  field
+        0       4     magic b'SNKR'
+        4       1     format version
+        5       1     rules version (see engine.RULES_VERSION)
+        6       8     seed (signed)
+        14      2     columns
+        16      2     rows
+        18      2     start column
+        20      2     start row
+        22      4     number of ticks
+        26      ...   run-length encoded actions
+
+    The actions are stored as pairs of bytes (action, run length), with a
+    run length between 1 and 255. The action is the Direction value, or
+    NO_ACTION if the tick did not request a direction.
+"""
+
+
+from struct import Struct
+
+from .board import BoardConfig
+from .engine import RULES_VERSION, GameEngine
+
+
+MAGIC = b'SNKR'
+FORMAT_VERSION = 1
+NO_ACTION = 4
+MAX_RUN = 255
+HEADER = Struct('<4sBBqHHHHI')
+
+
+def encode_actions(actions):
+    """
+        Run-length encode the given action codes.
+
+        Parameters:
+        -----------
+            actions: bytes
+                    One action code per tick.
+
+        Returns:
+        --------
+            bytes
+                The (action, run length) pairs.
+    """
+    encoded = bytearray()
+    run_action = None
+    run_length = 0
+
+    for action in actions:
+        if action == run_action and run_length < MAX_RUN:
+            run_length += 1
+            continue
+
+        if run_length:
+            encoded += bytes((run_action, run_length))
+        run_action = action
+        run_length = 1
+
+    if run_length:
+        encoded += bytes((run_action, run_length))
+    return bytes(encoded)
+
+
+def decode_actions(data):
+    """
+        Decode run-length encoded actions.
+
+        Parameters:
+        -----------
+            data: bytes
+                    The (action, run length) pairs.
+
+        Returns:
+        --------
+            bytearray
+                One action code per tick.
+    """
+    if len(data) % 2:
+        raise ValueError('truncated replay action data')
+
+    actions = bytearray()
+    for i in range(0, len(data), 2):
+        actions += bytes((data[i],)) * data[i + 1]
+    return actions
+
+
+class Replay:
+    """
+        Recording of a single game.
+        A replay is created from an engine before the first tick and records
+        the action of every tick through ``record``:
+
+            replay = Replay.from_engine(engine)
+            replay.record(action)
+            engine.step(action)
+
+        ``play`` runs the recorded actions on a new engine and returns it
+        in the final state of the game.
+
+        Parameters:
+        -----------
+            seed: int
+                    The seed of the game.
+
+            cols: int
+                    The number of columns of the game world.
+
+            rows: int
+                    The number of rows of the game world.
+
+            start: tuple
+                    The start cell of the snake.
+
+            actions: bytearray
+                    One action code per tick.
+
+            rules_version: int
+                    The rules version the game was recorded with.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, seed, cols, rows, start, actions=None,
+                 rules_version=RULES_VERSION):
+        self.seed = seed
+        self.cols = cols
+        self.rows = rows
+        self.start = start
+        self.actions = actions if actions is not None else bytearray()
+        self.rules_version = rules_version
+
+    def __len__(self):
+        return len(self.actions)
+
+    @classmethod
+    def from_engine(cls, engine):
+        return cls(engine.seed, engine.cols, engine.rows, engine.start)
+
+    def record(self, action):
+        """
+            Append the action of a single tick.
+
+            Parameters:
+            -----------
+                action: int
+                        The direction passed to GameEngine.step, or None.
+
+            Returns:
+            --------
+                None
+        """
+        self.actions.append(NO_ACTION if action is None else action)
+
+    def to_bytes(self):
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, self.rules_version,
+                             self.seed, self.cols, self.rows,
+                             self.start[0], self.start[1], len(self.actions))
+        return header + encode_actions(self.actions)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+            Parse a replay from its binary representation.
+
+            Parameters:
+            -----------
+                data: bytes
+                        The binary replay, see the module docstring.
+
+            Returns:
+            --------
+                Replay
+                    The parsed replay.
+        """
+        if len(data) < HEADER.size:
+            raise ValueError('replay is shorter than its header')
+
+        (magic, version, rules_version, seed, cols, rows, start_x, start_y,
+         ticks) = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError('not a replay file')
+        if version != FORMAT_VERSION:
+            raise ValueError(f'unsupported replay format version {version}')
+
+        actions = decode_actions(data[HEADER.size:])
+        if len(actions) != ticks:
+            raise ValueError(
+                f'replay has {len(actions)} actions, header says {ticks}')
+        return cls(seed, cols, rows, (start_x, start_y), actions,
+                   rules_version)
+
+    def save(self, file_path):
+        with open(file_path, 'wb') as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path, 'rb') as file:
+            return cls.from_bytes(file.read())
+
+    def play(self, backend='grid'):
+        """
+            Play the replay back on a new headless engine.
+
+            Parameters:
+            -----------
+                backend: str
+                        The spatial index backend of the engine.
+
+            Returns:
+            --------
+                GameEngine
+                    The engine in the state after the last recorded tick.
+        """
+        if self.rules_version != RULES_VERSION:
+            raise ValueError(
+                f'replay was recorded with rules version '
+                f'{self.rules_version}, the engine implements '
+                f'{RULES_VERSION}')
+
+        board = BoardConfig(self.cols, self.rows, start=self.start)
+        engine = GameEngine(board, backend, self.seed)
+        step = engine.step
+        for action in self.actions:
+            if engine.game_over:
+                break
+            step(None if action == NO_ACTION else action)
+        return engine
@@ -0,0 +1,293 @@
+"""
+    Headless batch runner
+    ---------------------
+    Plays many autopilot games without a window and reports the results.
+    Every game runs on its own headless GameEngine, seeded with
+    ``seed + game number``, so every single game can be reproduced later.
+
+    The games are distributed over a pool of worker processes. The result
+    of every game is written as one line of JSON as soon as it is finished,
+    followed by a final summary line, so arbitrarily large runs never have
+    to be kept in memory.
+"""
+
+
+from collections import Counter
+from json import dumps
+from multiprocessing import Pool
+from sys import stdout
+from time import perf_counter
+
+from .board import DEFAULT_BOARD
+from .engine import GameEngine
+from .timing import TickTimer
+
+
+def default_max_ticks(board):
+    """
+        Determine a tick limit that every game that can still be won stays
+        below. Following the Hamiltonian cycle, a food is reached within
+        one lap of the board, i.e. ``cells`` ticks, and every food makes
+        the snake at least two cells longer, so a game is won within
+        ``cells * cells / 2`` ticks (about 160k ticks are measured on the
+        default board). Games that run longer are stuck in a loop.
+
+        Games of the other autopilots can get stuck much earlier, circling
+        without ever reaching the food. So independent of this limit,
+        ``play_game`` stops every game that did not eat for ``cells``
+        ticks, i.e. for longer than a lap of the Hamiltonian cycle takes.
+
+        Parameters:
+        -----------
+            board: BoardConfig
+                    The board to play on.
+
+        Returns:
+        --------
+            int
+                The tick limit.
+    """
+    return board.cells * board.cells // 2
+
+
+def play_game(seed, max_ticks=None, autopilot='astar', board=DEFAULT_BOARD,
+              backend='grid', timings=False):
+    """
+        Play a single autopilot game until it ends.
+
+        Parameters:
+        -----------
+            seed: int
+                    The seed of the game.
+
+            max_ticks: int
+                    The maximum number of ticks, the game is stopped with
+                    the cause 'timeout' when it is reached. 0 for no limit,
+                    None for the limit of the board (see
+                    default_max_ticks). A game that did not eat for
+                    ``board.cells`` ticks is always stopped, with the
+                    cause 'stalled'.
+
+            autopilot: str
+                    The strategy of the autopilot (see AUTOPILOTS).
+
+            board: BoardConfig
+                    The board to play on.
+
+            backend: str
+                    The spatial index of the engine (see BACKENDS).
+
+            timings: bool
+                    Measure the spans of every tick (see TickTimer) and add
+                    their statistics to the result. The percentiles cover
+                    the last WINDOW ticks of the game.
+
+        Returns:
+        --------
+            dict
+                The seed, score, number of ticks, length and cause of
+                death of the game, and the tick timings if requested.
+    """
+    if max_ticks is None:
+        max_ticks = default_max_ticks(board)
+    engine = GameEngine(board, backend, seed, autopilot)
+    step = engine.step
+    autopilot_action = engine.autopilot_action
+    # Bounded like the overlay, so long games do not grow the memory
+    timer = engine.timings = TickTimer() if timings else None
+    # Tick of the last food, a game without progress is stuck in a loop
+    fed = 0
+
+    while not engine.game_over:
+        if max_ticks and engine.ticks >= max_ticks:
+            engine.death_cause = 'timeout'
+            break
+        if engine.ticks - fed >= board.cells:
+            engine.death_cause = 'stalled'
+            break
+        if timer is None:
+            if step(autopilot_action()).ate:
+                fed = engine.ticks
+            continue
+
+        started = timer.clock()
+        action = autopilot_action()
+        planned = timer.clock()
+        if step(action).ate:
+            fed = engine.ticks
+        timer.record('planning', planned - started)
+        timer.record('tick', timer.clock() - started)
+
+    result = {
+        "seed": seed,
+        "score": engine.score,
+        "ticks": engine.ticks,
+        "length": len(engine.snake),
+        "cause": engine.death_cause,
+    }
+    if timer is not None:
+        result["timings"] = timer.stats()
+    return result
+
+
+def _play_game(args):
+    return play_game(*args)
+
+
+def percentile(counts, total, fraction):
+    """
+        Determine a percentile from a histogram.
+
+        Parameters:
+        -----------
+            counts: Counter
+                    The number of occurrences of every value.
+
+            total: int
+                    The sum of all counts.
+
+            fraction: float
+                    The percentile as a fraction between 0 and 1.
+
+        Returns:
+        --------
+            int
+                The smallest value with at least ``fraction`` of all values
+                less than or equal to it.
+    """
+    rank = fraction * total
+    seen = 0
+    for value in sorted(counts):
+        seen += counts[value]
+        if seen >= rank:
+            return value
+    return None
+
+
+class BatchStats:
+    """
+        Aggregated statistics of a batch run.
+        The statistics are updated game by game and only keep histograms
+        and sums, so their size does not grow with the number of games.
+    """
+
+    def __init__(self):
+        self.games = 0
+        self.scores = Counter()
+        self.causes = Counter()
+        self.total_ticks = 0
+        self.min_ticks = None
+        self.max_ticks = 0
+
+    def add(self, result):
+        self.games += 1
+        self.scores[result["score"]] += 1
+        self.causes[result["cause"]] += 1
+        self.total_ticks += result["ticks"]
+        self.max_ticks = max(self.max_ticks, result["ticks"])
+        if self.min_ticks is None or result["ticks"] < self.min_ticks:
+            self.min_ticks = result["ticks"]
+
+    def summary(self, elapsed):
+        games = self.games or 1
+        total_score = sum(score * n for score, n in self.scores.items())
+        return {
+            "games": self.games,
+            "elapsed": round(elapsed, 3),
+            "games_per_second": round(self.games / elapsed, 2)
+            if elapsed else None,
+            "ticks_per_second": round(self.total_ticks / elapsed, 2)
+            if elapsed else None,
+            "score": {
+                "min": min(self.scores, default=None),
+                "mean": round(total_score / games, 3),
+                "p50": percentile(self.scores, self.games, .5),
+                "p90": percentile(self.scores, self.games, .9),
+                "p99": percentile(self.scores, self.games, .99),
+                "max": max(self.scores, default=None),
+                "histogram": {str(score): self.scores[score]
+                              for score in sorted(self.scores)},
+            },
+            "ticks": {
+                "min": self.min_ticks,
+                "mean": round(self.total_ticks / games, 3),
+                "max": self.max_ticks,
+            },
+            "causes": dict(self.causes),
+        }
+
+
+def run_batch(games, workers=1, seed=0, max_ticks=None, out=stdout,
+              autopilot='astar', board=DEFAULT_BOARD, backend='grid',
+              timings=False):
+    """
+        Play a batch of autopilot games and stream the results.
+
+        Every finished game is written to ``out`` as one line of JSON, in
+        the order the games finish. The last line holds the aggregated
+        statistics under the key "summary".
+
+        Parameters:
+        -----------
+            games: int
+                    The number of games to play.
+
+            workers: int
+                    The number of worker processes. With 1 worker the games
+                    are played in the current process.
+
+            seed: int
+                    The seed of the first game, game i uses seed + i.
+
+            max_ticks: int
+                    The maximum number of ticks per game, 0 for no limit,
+                    None for the limit of the board (see
+                    default_max_ticks).
+
+            out: file
+                    The text stream the results are written to.
+
+            autopilot: str
+                    The strategy of the autopilot (see AUTOPILOTS).
+
+            board: BoardConfig
+                    The board to play on.
+
+            backend: str
+                    The spatial index of the engines (see BACKENDS).
+
+            timings: bool
+                    Add the tick timings to the result of every game.
+
+        Returns:
+        --------
+            dict
+                The summary of the batch.
+    """
+    stats = BatchStats()
+    jobs = ((seed + i, max_ticks, autopilot, board, backend, timings)
+            for i in range(games))
+    started = perf_counter()
+
+    if workers > 1:
+        pool = Pool(workers)
+        chunksize = max(1, min(64, games // (workers * 8)))
+        results = pool.imap_unordered(_play_game, jobs, chunksize)
+    else:
+        pool = None
+        results = map(_play_game, jobs)
+
+    try:
+        for result in results:
+            stats.add(result)
+            out.write(dumps(result) + '\n')
+            out.flush()
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    summary = stats.summary(perf_counter() - started)
+    out.write(dumps({"summary": summary}) + '\n')
+    out.flush()
+    return summary
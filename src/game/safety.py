@@ -0,0 +1,205 @@
+"""
+    Autopilot safety checks
+    -----------------------
+    A path to the food can lead the snake into a pocket it cannot leave
+    again. As long as the snake can still reach its own tail it is safe: it
+    can always follow the tail, which frees the cells in front of it. The
+    TailCheck simulates the snake along a path and tests this with a
+    breadth-first search from the new head to the new tail.
+"""
+
+
+from itertools import islice
+
+from .models import OPPOSITE_DIRECTIONS
+from .pathfinding import NEIGHBOUR_OFFSETS
+
+
+class TailCheck:
+    """
+        Checks whether the snake can still reach its tail after following a
+        path.
+
+        All scratch buffers are allocated once for the board. Instead of
+        clearing them before every search, cells are marked with the number
+        of the current search (a generation), so a mark from an earlier
+        search simply does not count. The queue of the breadth-first search
+        is a preallocated list with a read and a write index.
+
+        Parameters:
+        -----------
+            cols: int
+                    The number of columns of the board.
+
+            rows: int
+                    The number of rows of the board.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        cells = cols * rows
+        self.blocked = [0] * cells
+        self.seen = [0] * cells
+        self.queue = [0] * cells
+        self.generation = 0
+        self.checks = 0
+
+    def tail_distance(self, snake, path, start=0, grow=0):
+        """
+            Simulate the snake entering the cells ``path[start:]`` one after
+            the other and measure the distance from its head to its tail
+            afterwards.
+
+            Parameters:
+            -----------
+                snake: Snake
+                        The snake before the first move.
+
+                path: list
+                        The cells to enter, at least one.
+
+                start: int
+                        The index of the first cell of path to enter.
+
+                grow: int
+                        The value of the food in the last cell of path, 0
+                        if the snake does not eat.
+
+            Returns:
+            --------
+                int
+                    The length of the shortest way from the new head to
+                    the new tail, -1 if the tail cannot be reached.
+        """
+        self.checks += 1
+        self.generation += 1
+        generation = self.generation
+        blocked = self.blocked
+        cols = self.cols
+
+        # Cells of the simulated snake, head first
+        moves = len(path) - start
+        keep = len(snake) + 1 if grow else len(snake)
+        first = max(start, len(path) - keep)
+        for i in range(first, len(path)):
+            x, y = path[i]
+            blocked[y * cols + x] = generation
+        if moves >= keep:
+            tail = path[first]
+        else:
+            tail = snake.tail
+            for x, y in islice(snake.body, keep - moves):
+                blocked[y * cols + x] = generation
+                tail = (x, y)
+
+        head = path[-1]
+        if head == tail:
+            return 0
+        return self.search(head, tail)
+
+    def search(self, head, tail):
+        generation = self.generation
+        blocked = self.blocked
+        seen = self.seen
+        queue = self.queue
+        cols = self.cols
+        rows = self.rows
+        tail_x, tail_y = tail
+
+        queue[0] = head[1] * cols + head[0]
+        seen[queue[0]] = generation
+        read, write = 0, 1
+        distance = 0
+        while read < write:
+            distance += 1
+            level_end = write
+            while read < level_end:
+                index = queue[read]
+                read += 1
+                y, x = divmod(index, cols)
+                for dx, dy in NEIGHBOUR_OFFSETS:
+                    nx, ny = x + dx, y + dy
+                    if nx == tail_x and ny == tail_y:
+                        return distance
+                    if not (0 <= nx < cols and 0 <= ny < rows):
+                        continue
+                    neighbour = ny * cols + nx
+                    if (blocked[neighbour] == generation
+                            or seen[neighbour] == generation):
+                        continue
+                    seen[neighbour] = generation
+                    queue[write] = neighbour
+                    write += 1
+        return -1
+
+    def path_is_safe(self, engine, path, position=0):
+        """
+            Check whether the snake can still reach its tail after following
+            the path from the cell at ``position`` to its end.
+
+            Parameters:
+            -----------
+                engine: GameEngine
+                        The engine with the current snake and food.
+
+                path: list
+                        The path, ``path[position]`` is the current head.
+
+                position: int
+                        The index of the head in path.
+
+            Returns:
+            --------
+                bool
+                    True if the path is safe, False if it is empty or
+                    traps the snake.
+        """
+        if position + 1 >= len(path):
+            return False
+
+        food = engine.food
+        grow = food.value if food is not None and \
+            path[-1] == food.position else 0
+        return self.tail_distance(engine.snake, path, position + 1, grow) >= 0
+
+    def escape(self, engine):
+        """
+            Determine a move that keeps the tail reachable. Among those, the
+            one with the longest way to the tail is chosen, so the snake
+            stalls along its body until a safe path to the food opens up.
+            If every move traps the snake, any free cell is taken, as the
+            body may still open up in time.
+
+            Parameters:
+            -----------
+                engine: GameEngine
+                        The engine to determine the move for.
+
+            Returns:
+            --------
+                tuple
+                    The next cell of the head, None if there is no free
+                    cell next to the head.
+        """
+        head_x, head_y = engine.head
+        behind = engine.next_head(OPPOSITE_DIRECTIONS[engine.direction])
+        food = engine.food
+        best = None
+        best_distance = -2
+        for dx, dy in NEIGHBOUR_OFFSETS:
+            cell = (head_x + dx, head_y + dy)
+            if cell == behind or not engine.is_open_space(cell[0], cell[1]):
+                continue
+
+            grow = food.value if food is not None and \
+                cell == food.position else 0
+            distance = self.tail_distance(engine.snake, (cell,), 0, grow)
+            if distance > best_distance:
+                best = cell
+                best_distance = distance
+        return best
@@ -0,0 +1,351 @@
+"""
+    Highscore store
+    ---------------
+    Persistent highscores in an SQLite database. See the ScoreStore class
+    for details. The ScoreWriter records new scores on a background thread,
+    so a slow disk never blocks the window.
+"""
+
+
+from heapq import heappush, heappushpop
+from json import JSONDecodeError, load
+from os import path
+from queue import Empty, Full, Queue, SimpleQueue
+import sqlite3
+from threading import Thread
+
+
+TOP_K = 100  # number of best scores kept in memory for the scoreboard
+WRITE_QUEUE = 64  # number of scores that may wait for the writer thread
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, id);
+"""
+
+
+def insert_score(connection, name, score):
+    """
+        Record a score in its own transaction.
+
+        Parameters:
+        -----------
+            connection: sqlite3.Connection
+                    The connection to the database.
+
+            name: str
+                    The name of the player.
+
+            score: int
+                    The score.
+
+        Returns:
+        --------
+            int
+                The id of the new row.
+    """
+    with connection:
+        cursor = connection.execute(
+            "INSERT INTO scores (name, score) VALUES (?, ?)", (name, score))
+    return cursor.lastrowid
+
+
+class ScoreStore:
+    """
+        Append-only store of all highscores.
+
+        Every score is a row of an SQLite table with an index on the score,
+        so adding a score is a single insert, no matter how many scores
+        have been recorded, and the best scores are read in order from the
+        index without sorting. Every insert is its own transaction, so a
+        crash never leaves a half-written file behind. The database is
+        switched to write-ahead logging, so reading a page never waits for
+        the commit of a ScoreWriter on another connection, even on a slow
+        disk.
+
+        The best ``top`` scores are additionally kept in a min-heap, so the
+        scoreboard never has to query the database: a new score replaces
+        the smallest score of the heap if it is better.
+
+        Scores are ranked by value, equal scores by the order they were
+        recorded in.
+
+        Parameters:
+        -----------
+            database: str
+                    The path of the SQLite database. It is created if it
+                    does not exist.
+
+            top: int
+                    The number of best scores kept in memory.
+
+            legacy_path: str
+                    The path of a JSON highscore list of older versions.
+                    Its scores are imported once, when the database is
+                    created.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, database, top=TOP_K, legacy_path=None):
+        self.top = top
+        created = database == ':memory:' or not path.exists(database)
+        self.connection = sqlite3.connect(database)
+        # Readers and the writer thread do not block each other
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        if created and legacy_path is not None:
+            self.import_legacy(legacy_path)
+
+        # Entries (score, -id, name), the root is the worst kept score
+        self.heap = [(score, -row_id, name) for row_id, name, score
+                     in self.page(top)]
+        self.heap.reverse()
+
+    def import_legacy(self, legacy_path):
+        try:
+            with open(legacy_path, "r") as file:
+                scores = load(file)
+        except (OSError, JSONDecodeError):
+            return
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO scores (name, score) VALUES (?, ?)",
+                ((str(entry["name"]), int(entry["score"]))
+                 for entry in scores))
+
+    def add(self, name, score):
+        """
+            Record a score.
+
+            Parameters:
+            -----------
+                name: str
+                        The name of the player.
+
+                score: int
+                        The score.
+
+            Returns:
+            --------
+                None
+        """
+        self.remember(insert_score(self.connection, name, score), name, score)
+
+    def remember(self, row_id, name, score):
+        """
+            Add a score that was recorded elsewhere (e.g. by a ScoreWriter)
+            to the best scores kept in memory.
+
+            Parameters:
+            -----------
+                row_id: int
+                        The id of the row of the score.
+
+                name: str
+                        The name of the player.
+
+                score: int
+                        The score.
+
+            Returns:
+            --------
+                None
+        """
+        entry = (score, -row_id, name)
+        if len(self.heap) < self.top:
+            heappush(self.heap, entry)
+        elif entry > self.heap[0]:
+            heappushpop(self.heap, entry)
+
+    def top_scores(self):
+        """
+            The best scores, as kept in memory.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                list
+                    Up to ``top`` rows (id, name, score) like the rows of
+                    ``page``, the best score first.
+        """
+        return [(-negative_id, name, score) for score, negative_id, name
+                in sorted(self.heap, reverse=True)]
+
+    def page(self, limit, after=None):
+        """
+            Read the next scores in ranking order from the index. The page
+            continues after the given row instead of skipping rows with an
+            offset, so reading any page takes the same time.
+
+            Parameters:
+            -----------
+                limit: int
+                        The maximum number of scores.
+
+                after: tuple
+                        The last row of the previous page, None to start
+                        with the best score.
+
+            Returns:
+            --------
+                list
+                    Rows (id, name, score), the best score first.
+        """
+        if after is None:
+            return self.connection.execute(
+                "SELECT id, name, score FROM scores "
+                "ORDER BY score DESC, id LIMIT ?", (limit,)).fetchall()
+
+        row_id, _, score = after
+        return self.connection.execute(
+            "SELECT id, name, score FROM scores "
+            "WHERE score < ? OR (score = ? AND id > ?) "
+            "ORDER BY score DESC, id LIMIT ?",
+            (score, score, row_id, limit)).fetchall()
+
+    def __len__(self):
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+
+class ScoreWriter:
+    """
+        Records scores on a background thread.
+
+        ``submit`` only puts the score into a bounded queue, the thread
+        writes it to the database with its own connection. ``submit``
+        never waits for the thread: if WRITE_QUEUE scores are already
+        waiting, e.g. because the disk hangs, the new score is dropped,
+        reported on stdout and counted in ``dropped``. So neither the
+        window nor the memory of the queue depend on the disk. ``close``
+        flushes the queue before it returns, so no queued score is lost
+        on exit.
+
+        Every written score is put into the ``written`` queue as a row
+        (id, name, score), to be added to the ScoreStore of the reading
+        thread with ``collect``.
+
+        Parameters:
+        -----------
+            database: str
+                    The path of the SQLite database, the table must exist
+                    (see ScoreStore).
+
+            notify: callable
+                    Called on the writer thread after a score was written,
+                    e.g. to emit a Qt signal. None to only poll ``collect``.
+
+            maxsize: int
+                    The number of scores that may wait in the queue.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, database, notify=None, maxsize=WRITE_QUEUE):
+        self.database = database
+        self.notify = notify
+        self.queue = Queue(maxsize)
+        self.written = SimpleQueue()
+        self.dropped = 0
+        self.thread = Thread(target=self.run, name='score-writer',
+                             daemon=True)
+        self.thread.start()
+
+    def submit(self, name, score):
+        """
+            Queue a score to be written.
+
+            Parameters:
+            -----------
+                name: str
+                        The name of the player.
+
+                score: int
+                        The score.
+
+            Returns:
+            --------
+                bool
+                    True if the score was queued, False if it was dropped
+                    because the queue is full.
+        """
+        try:
+            self.queue.put_nowait((name, score))
+        except Full:
+            self.dropped += 1
+            print(f"Could not save the score of {name}: "
+                  f"{self.queue.maxsize} scores are still waiting")
+            return False
+        return True
+
+    def run(self):
+        connection = sqlite3.connect(self.database)
+        try:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    break
+
+                name, score = item
+                try:
+                    row_id = insert_score(connection, name, score)
+                except sqlite3.Error as e:
+                    print(f"Could not save the score of {name}: {e}")
+                    continue
+                self.written.put((row_id, name, score))
+                if self.notify is not None:
+                    self.notify()
+        finally:
+            connection.close()
+
+    def collect(self):
+        """
+            Take the rows written since the last call.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                list
+                    Rows (id, name, score) in the order they were written.
+        """
+        rows = []
+        while True:
+            try:
+                rows.append(self.written.get_nowait())
+            except Empty:
+                return rows
+
+    def close(self):
+        """
+            Write all waiting scores and stop the thread.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
@@ -0,0 +1,246 @@
+"""
+    Spatial hash
+    ------------
+    Uniform spatial hash over the game world. See the SpatialHash class for
+    details.
+"""
+
+
+class SpatialHash:
+    """
+        Spatial hash to represent the game world.
+        The world is divided into square buckets of ``bucket_size`` cells.
+        Every object is stored in the bucket its position falls into, and
+        only buckets that hold objects exist (in a dict keyed by the bucket
+        coordinates). Looking up, inserting or removing an object touches a
+        single bucket, regardless of the size of the board or the number of
+        objects.
+
+        All objects of this game are exactly one cell in size, so objects
+        can only collide with objects of the same cell. With a bucket size
+        of 1 every bucket is a single cell; larger buckets need fewer dict
+        entries but have to be scanned.
+
+        The SpatialHash implements the same interface as the Quadtree
+        (``insert``, ``remove``, ``move``, ``clear``, ``is_open_space``,
+        ``retrieve`` and ``query_rect``), so it can be used as the engine
+        backend.
+
+        Parameters:
+        -----------
+            bounds: tuple
+                    A tuple (left, top, right, bottom) representing the
+                    bounds of the game world; right and bottom are
+                    exclusive.
+
+            bucket_size: int
+                    The width and height of a bucket in cells.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, bounds, bucket_size=1):
+        self.bounds = bounds
+        self.bucket_size = bucket_size
+        self.buckets = {}
+
+    def key(self, x, y):
+        size = self.bucket_size
+        return (x // size, y // size)
+
+    def clear(self):
+        """
+            Clear the spatial hash by removing all buckets.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        self.buckets.clear()
+
+    def insert(self, obj):
+        """
+            Insert the given object into the bucket of its position.
+
+            Parameters:
+            -----------
+                obj: tuple
+                        A tuple representing the position of the object in
+                        the game world.
+
+            Returns:
+            --------
+                None
+        """
+        key = self.key(obj[0], obj[1])
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            self.buckets[key] = [obj]
+        else:
+            bucket.append(obj)
+
+    def remove(self, obj):
+        """
+            Remove one occurrence of the given object. Buckets that become
+            empty are dropped.
+
+            Parameters:
+            -----------
+                obj: tuple
+                        A tuple representing the position of the object in
+                        the game world.
+
+            Returns:
+            --------
+                True, if the object was found and removed, False otherwise.
+        """
+        key = self.key(obj[0], obj[1])
+        bucket = self.buckets.get(key)
+        if bucket is None or obj not in bucket:
+            return False
+
+        bucket.remove(obj)
+        if not bucket:
+            del self.buckets[key]
+        return True
+
+    def move(self, old, new):
+        """
+            Move an object to a new position.
+
+            Parameters:
+            -----------
+                old: tuple
+                        A tuple representing the current position of the
+                        object.
+
+                new: tuple
+                        A tuple representing the new position of the object.
+
+            Returns:
+            --------
+                True, if the object was found and moved, False otherwise.
+                The spatial hash is left unchanged if the object was not
+                found.
+        """
+        key = self.key(old[0], old[1])
+        if key == self.key(new[0], new[1]):
+            bucket = self.buckets.get(key)
+            if bucket is None or old not in bucket:
+                return False
+            bucket[bucket.index(old)] = new
+            return True
+
+        if not self.remove(old):
+            return False
+        self.insert(new)
+        return True
+
+    def is_open_space(self, x, y):
+        """
+            Check if the given position is inside the game world and not
+            occupied by any object.
+
+            Parameters:
+            -----------
+                x: int
+                        An integer representing the x-coordinate of the
+                        position.
+
+                y: int
+                        An integer representing the y-coordinate of the
+                        position.
+
+            Returns:
+            --------
+                True, if the position is an open space, False otherwise.
+        """
+        bounds = self.bounds
+        if not (bounds[0] <= x < bounds[2] and bounds[1] <= y < bounds[3]):
+            return False
+
+        bucket = self.buckets.get(self.key(x, y))
+        if bucket is None:
+            return True
+        for obj in bucket:
+            if obj[0] == x and obj[1] == y:
+                return False
+        return True
+
+    def retrieve(self, return_objects, obj):
+        """
+            Retrieve the objects that could potentially collide with the
+            given object, i.e. the objects in the bucket of its position.
+
+            Parameters:
+            -----------
+                return_objects: list
+                            A list the colliding objects are added to.
+
+                obj: tuple
+                            A tuple representing the position of the object
+                            in the game world.
+
+            Returns:
+            --------
+                list
+                    The return_objects list.
+        """
+        bucket = self.buckets.get(self.key(obj[0], obj[1]))
+        if bucket is not None:
+            return_objects.extend(bucket)
+        return return_objects
+
+    def query_rect(self, rect, found=None):
+        """
+            Find all objects inside the given rectangle.
+            Only the buckets that overlap the rectangle are visited, or all
+            existing buckets if there are fewer of them.
+
+            Parameters:
+            -----------
+                rect: tuple
+                        A tuple (left, top, right, bottom); right and bottom
+                        are exclusive.
+
+                found: list
+                        Optional list to append the objects to.
+
+            Returns:
+            --------
+                list
+                    The objects inside the rectangle, one entry per
+                    inserted occurrence.
+        """
+        if found is None:
+            found = []
+
+        bounds = self.bounds
+        left, top = max(rect[0], bounds[0]), max(rect[1], bounds[1])
+        right, bottom = min(rect[2], bounds[2]), min(rect[3], bounds[3])
+        if left >= right or top >= bottom:
+            return found
+
+        first_x, first_y = self.key(left, top)
+        last_x, last_y = self.key(right - 1, bottom - 1)
+        buckets = self.buckets
+        if (last_x - first_x + 1) * (last_y - first_y + 1) > len(buckets):
+            candidates = buckets.values()
+        else:
+            candidates = (buckets.get((key_x, key_y))
+                          for key_y in range(int(first_y), int(last_y) + 1)
+                          for key_x in range(int(first_x), int(last_x) + 1))
+
+        for bucket in candidates:
+            if bucket is None:
+                continue
+            for obj in bucket:
+                if left <= obj[0] < right and top <= obj[1] < bottom:
+                    found.append(obj)
+        return found
@@ -0,0 +1,125 @@
+"""
+    Fixed timestep
+    --------------
+    Decouples the game logic from the frame rate. The window renders on
+    every frame, while the engine advances in ticks of a fixed length that
+    are taken from the real time elapsed between the frames. See the
+    FixedTimestep class for details.
+"""
+
+
+from time import perf_counter
+
+
+MAX_TICKS = 32  # most logic ticks run in a single frame
+
+
+class FixedTimestep:
+    """
+        Accumulator of the elapsed real time, measured with a monotonic
+        clock. On every frame ``advance`` adds the time since the previous
+        frame, and every call of ``tick`` takes one interval out of it:
+
+            scheduler.advance()
+            while scheduler.tick():
+                engine.step(...)
+            render(scheduler.alpha)
+
+        so the number of logic ticks per second only depends on the tick
+        interval, not on how regularly the frames arrive. The remainder
+        that is left in the accumulator is the fraction of the next tick
+        that has already passed (``alpha``) and is used to interpolate the
+        rendered positions between the last two ticks.
+
+        With a ``speed`` above 1 the time passes faster for the logic, e.g.
+        for fast-forward, which may run several ticks per frame. If the
+        logic cannot keep up, the time beyond ``max_ticks`` ticks is dropped
+        instead of being caught up later.
+
+        Parameters:
+        -----------
+            interval: float
+                    The length of a tick in milliseconds.
+
+            max_ticks: int
+                    The most ticks a single frame may run.
+
+            clock: callable
+                    The monotonic clock, returning seconds.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, interval, max_ticks=MAX_TICKS, clock=perf_counter):
+        self.interval = interval
+        self.max_ticks = max_ticks
+        self.clock = clock
+        self.speed = 1
+        self.accumulator = 0.0
+        self.last = clock()
+
+    def start(self):
+        """
+            Start measuring from now, e.g. after a pause. The time since the
+            last frame is not added to the accumulator.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        self.last = self.clock()
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.start()
+
+    def advance(self):
+        """
+            Add the time elapsed since the previous frame.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        now = self.clock()
+        self.accumulator += (now - self.last) * 1000 * self.speed
+        self.last = now
+        limit = self.max_ticks * self.interval
+        if self.accumulator > limit:
+            self.accumulator = limit
+
+    def tick(self):
+        """
+            Take one tick out of the accumulator.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                bool
+                    True if a whole interval has elapsed and the logic
+                    should run one tick, False otherwise.
+        """
+        if self.accumulator < self.interval:
+            return False
+        self.accumulator -= self.interval
+        return True
+
+    @property
+    def alpha(self):
+        """
+            The elapsed fraction of the next tick, between 0 and 1.
+        """
+        return min(self.accumulator / self.interval, 1.0)
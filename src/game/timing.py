@@ -0,0 +1,149 @@
+"""
+    Tick timings
+    ------------
+    Measures where the time of a tick goes. The window and the headless
+    runner record the duration of every phase of a tick (a span) with a
+    monotonic clock, and the TickTimer turns the durations into rolling
+    percentiles that can be shown in the window or dumped as JSON.
+"""
+
+
+from collections import deque
+from math import ceil
+from time import perf_counter
+
+
+# The spans in display order:
+#   input      handling a key press
+#   planning   choosing the autopilot move
+#   collision  moving the head and checking for collisions
+#   food       spawning new food after the snake ate
+#   render     updating the scene after a tick
+#   tick       a whole logic tick
+#   frame      a whole frame of the window
+SPANS = ('input', 'planning', 'collision', 'food', 'render', 'tick', 'frame')
+WINDOW = 1000  # number of recent durations kept per span
+
+
+def percentile(values, fraction):
+    """
+        Determine a percentile with the nearest-rank method.
+
+        Parameters:
+        -----------
+            values: list
+                    The values, sorted in ascending order.
+
+            fraction: float
+                    The percentile as a fraction between 0 and 1.
+
+        Returns:
+        --------
+            float
+                The smallest value with at least ``fraction`` of all values
+                less than or equal to it, None if there are no values.
+    """
+    if not values:
+        return None
+    return values[max(0, ceil(fraction * len(values)) - 1)]
+
+
+class TickTimer:
+    """
+        Rolling durations of the spans of a tick.
+        For every span the last ``window`` durations are kept in a deque,
+        so recording a duration is O(1) and the memory does not grow with
+        the length of the game. The percentiles are only computed when
+        ``stats`` is called, e.g. a few times per second for the overlay.
+
+        The timer is passive: the code that is measured reads ``clock``
+        before and after a span and calls ``record``.
+
+            started = timer.clock()
+            ...
+            timer.record('planning', timer.clock() - started)
+
+        Parameters:
+        -----------
+            window: int
+                    The number of recent durations kept per span.
+
+            clock: callable
+                    The monotonic clock, returning seconds.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, window=WINDOW, clock=perf_counter):
+        self.window = window
+        self.clock = clock
+        self.samples = {}
+        self.counts = {}
+
+    def record(self, span, seconds):
+        samples = self.samples.get(span)
+        if samples is None:
+            samples = self.samples[span] = deque(maxlen=self.window)
+            self.counts[span] = 0
+        samples.append(seconds)
+        self.counts[span] += 1
+
+    def clear(self):
+        self.samples.clear()
+        self.counts.clear()
+
+    def stats(self):
+        """
+            Summarise the recorded durations.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                dict
+                    For every span (in the order of SPANS, unknown spans
+                    last) the total number of recorded durations and the
+                    mean, p50, p95, p99 and maximum of the recent ones in
+                    milliseconds.
+        """
+        order = {span: i for i, span in enumerate(SPANS)}
+        result = {}
+        for span in sorted(self.samples,
+                           key=lambda span: order.get(span, len(SPANS))):
+            values = sorted(self.samples[span])
+            if not values:
+                continue
+            result[span] = {
+                "count": self.counts[span],
+                "mean_ms": round(sum(values) / len(values) * 1000, 4),
+                "p50_ms": round(percentile(values, .5) * 1000, 4),
+                "p95_ms": round(percentile(values, .95) * 1000, 4),
+                "p99_ms": round(percentile(values, .99) * 1000, 4),
+                "max_ms": round(values[-1] * 1000, 4),
+            }
+        return result
+
+    def format(self):
+        """
+            Format the statistics as a fixed-width table, e.g. for an
+            overlay.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                str
+                    One line per span with p50, p95 and p99 in
+                    milliseconds.
+        """
+        lines = [f"{'span':<10}{'p50':>8}{'p95':>8}{'p99':>8}  ms"]
+        for span, stats in self.stats().items():
+            lines.append(f"{span:<10}{stats['p50_ms']:>8.3f}"
+                         f"{stats['p95_ms']:>8.3f}{stats['p99_ms']:>8.3f}")
+        return '\n'.join(lines)
@@ -0,0 +1,1147 @@
+"""
+    Snake game window
+    -----------------
+    Graphical frontend of the Snake game, built with the QGraphicsView and
+    QGraphicsScene classes of the PyQt library.
+
+    The game rules live in the headless engine (src/game). The window feeds
+    the player input into the engine on every logic tick and renders the
+    resulting state on every frame. The snake direction is controlled by the
+    arrow keys on the keyboard or the WASD keys.
+"""
+
+
+from collections import deque
+import sqlite3
+from PyQt5.QtCore import (QAbstractListModel, QModelIndex, Qt, QTimer,
+                          pyqtSignal)
+from PyQt5.QtGui import QBrush, QColor, QFont
+from PyQt5.QtWidgets import (QMainWindow, QGraphicsScene,
+                             QGraphicsView, QGraphicsRectItem, QLabel,
+                             QVBoxLayout, QFrame, QAction, QLineEdit,
+                             QWidget, QHBoxLayout, QListView,
+                             QDialog, QPushButton
+                             )
+from PyQt5.QtCore import QEvent, QObject
+
+try:
+    from src.game import (AUTOPILOTS, Direction, FixedTimestep, GameEngine,
+                          has_hamiltonian_cycle)
+    from src.game.planner import AutopilotPlanner
+    from src.game.profiling import Profiler
+    from src.game.scores import ScoreStore, ScoreWriter
+    from src.game.timing import TickTimer
+    from src.settings import (AUTOPILOT, BACKEND, BOARD, FAST_FORWARD,
+                              FRAME_INTERVAL, GAME_SPEED,
+                              LEGACY_SCOREBOARD_PATH, PROFILE_DIR,
+                              SCOREBOARD_PATH)
+except ImportError:  # started as a script, e.g. python src/main.py
+    from game import (AUTOPILOTS, Direction, FixedTimestep, GameEngine,
+                      has_hamiltonian_cycle)
+    from game.planner import AutopilotPlanner
+    from game.profiling import Profiler
+    from game.scores import ScoreStore, ScoreWriter
+    from game.timing import TickTimer
+    from settings import (AUTOPILOT, BACKEND, BOARD, FAST_FORWARD,
+                          FRAME_INTERVAL, GAME_SPEED, LEGACY_SCOREBOARD_PATH,
+                          PROFILE_DIR, SCOREBOARD_PATH)
+
+
+OVERLAY_INTERVAL = 250  # refresh interval of the timings overlay in ms
+FETCH_BATCH = 50  # number of scoreboard rows fetched at once
+
+
+class SettingsWindow(QDialog):
+    def __init__(self, parent=None):
+        super(SettingsWindow, self).__init__(parent)
+        self.initUI()
+
+    def initUI(self):
+        self.setWindowTitle('Settings')
+        layout = QVBoxLayout()
+
+        # Füge Einstellungselemente zum Layout hinzu
+        layout.addWidget(QLabel('Settings Panel'))
+        self.pushButton = QPushButton('Option 1')
+        self.pushButton2 = QPushButton('Option 2')
+        layout.addWidget(self.pushButton)
+        layout.addWidget(self.pushButton2)
+
+        self.setLayout(layout)
+        self.connect_signals()
+
+    def connect_signals(self):
+        self.pushButton.clicked.connect(self.slot_method)
+        self.pushButton2.clicked.connect(self.slot_method_2)
+
+    def slot_method(self):
+        print("Option 1")
+
+    def slot_method_2(self):
+        print("Option 2")
+
+
+class SnakeRenderer:
+    """
+        Retained-mode renderer for the snake and the food.
+        Instead of clearing the scene and creating a new item for every
+        segment on every tick, the renderer keeps one QGraphicsRectItem per
+        segment in a deque that mirrors the body of the snake. On a normal
+        tick only the item of the old tail is moved to the new head, so the
+        scene work per tick is O(1) regardless of the snake's length.
+
+        Items that are no longer needed (e.g. after a restart) are hidden
+        and kept in a pool to be reused later. The food is a single item
+        that is moved and recoloured in place.
+
+        Between two ticks only the ends of the snake move: the head item
+        slides from the previous head into the new head and the tail item
+        from the freed cell into the new tail. ``interpolate`` places both
+        items along the way, so the snake moves smoothly even though the
+        frames are rendered more often than the logic ticks.
+
+        Parameters:
+        -----------
+            scene: QGraphicsScene
+                        The scene the items are added to.
+
+            cell_size: int
+                        The size of a grid cell in pixels.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, scene, cell_size=BOARD.cell_size):
+        self.scene = scene
+        self.cell_size = cell_size
+        self.snake_brush = QBrush(QColor("green"))
+        self.food_brushes = {
+            'normal': QBrush(QColor("red")),
+            'special': QBrush(QColor("gold")),
+        }
+        self.segments = deque()
+        self.pool = []
+        self.head = self.tail = None
+        self.head_from = self.tail_from = None
+        self.food_item = self.create_item()
+        self.food_item.hide()
+
+    def create_item(self):
+        item = QGraphicsRectItem(0, 0, self.cell_size, self.cell_size)
+        self.scene.addItem(item)
+        return item
+
+    def acquire(self, cell):
+        """
+            Take a segment item from the pool (or create a new one) and place
+            it on the given cell.
+
+            Parameters:
+            -----------
+                cell: tuple
+                        A tuple representing the cell of the segment.
+
+            Returns:
+            --------
+                QGraphicsRectItem
+                    The segment item.
+        """
+        if self.pool:
+            item = self.pool.pop()
+        else:
+            item = self.create_item()
+            item.setBrush(self.snake_brush)
+        item.setPos(cell[0] * self.cell_size, cell[1] * self.cell_size)
+        item.show()
+        return item
+
+    def sync(self, snake):
+        """
+            Rebuild the segment items from scratch for the given snake.
+            This is only needed when the game starts or restarts, every
+            other tick is handled by ``advance``.
+
+            Parameters:
+            -----------
+                snake: Snake
+                        The snake to render.
+
+            Returns:
+            --------
+                None
+        """
+        while self.segments:
+            item = self.segments.pop()
+            item.hide()
+            self.pool.append(item)
+
+        for cell in snake:
+            self.segments.append(self.acquire(cell))
+        self.head, self.tail = snake.head, snake.tail
+        self.head_from = self.tail_from = None
+
+    def advance(self, result, snake):
+        """
+            Apply the result of a single engine tick to the scene.
+
+            If the tail retracted, its item is moved to the new head. If the
+            snake grew, a new head item is added, plus one item for every
+            repeated tail cell, so the items keep mirroring the body.
+
+            Parameters:
+            -----------
+                result: StepResult
+                        The result of GameEngine.step.
+
+                snake: Snake
+                        The snake after the tick.
+
+            Returns:
+            --------
+                None
+        """
+        # Finish the movement of the previous tick first
+        self.interpolate(1.0)
+        self.head_from, self.head = self.head, result.head
+        self.tail_from, self.tail = result.tail, snake.tail
+
+        head_x, head_y = result.head
+        if result.tail is not None:
+            item = self.segments.pop()
+            item.setPos(head_x * self.cell_size, head_y * self.cell_size)
+            self.segments.appendleft(item)
+            return
+
+        self.segments.appendleft(self.acquire(result.head))
+        while len(self.segments) < len(snake):
+            self.segments.append(self.acquire(snake.tail))
+
+    def interpolate(self, alpha):
+        """
+            Place the head and the tail item between their cells of the
+            previous and the last tick.
+
+            Parameters:
+            -----------
+                alpha: float
+                        The elapsed fraction of the tick, 0 places the
+                        items on the previous cells, 1 on the current ones.
+
+            Returns:
+            --------
+                None
+        """
+        size = self.cell_size
+        if self.head_from is not None:
+            (from_x, from_y), (to_x, to_y) = self.head_from, self.head
+            self.segments[0].setPos(
+                (from_x + (to_x - from_x) * alpha) * size,
+                (from_y + (to_y - from_y) * alpha) * size)
+        if self.tail_from is not None:
+            (from_x, from_y), (to_x, to_y) = self.tail_from, self.tail
+            self.segments[-1].setPos(
+                (from_x + (to_x - from_x) * alpha) * size,
+                (from_y + (to_y - from_y) * alpha) * size)
+
+    def update_food(self, food):
+        """
+            Move and recolour the food item in place.
+
+            Parameters:
+            -----------
+                food: Food
+                        The food to render, None to hide the food item.
+
+            Returns:
+            --------
+                None
+        """
+        if food is None:
+            self.food_item.hide()
+            return
+
+        self.food_item.setPos(food.position[0] * self.cell_size,
+                              food.position[1] * self.cell_size)
+        self.food_item.setBrush(self.food_brushes[food.food_type])
+        self.food_item.show()
+
+
+class ScoreboardModel(QAbstractListModel):
+    """
+        List model of the scoreboard.
+        The model only holds the rows the view has asked for. When the view
+        is scrolled to the end of the loaded rows, it calls ``fetchMore``,
+        which appends the next FETCH_BATCH scores in ranking order. The
+        first rows are the best scores the ScoreStore keeps in memory, the
+        rows after them are read page by page from the index of the
+        database. So opening the scoreboard costs the same no matter how
+        many scores have been recorded.
+
+        Parameters:
+        -----------
+            store: ScoreStore
+                        The store to read the scores from.
+
+            batch: int
+                        The number of rows fetched at once.
+
+            parent: QObject
+                        The parent of the model.
+
+        Returns:
+        --------
+            None
+    """
+
+    def __init__(self, store, batch=FETCH_BATCH, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.batch = batch
+        self.rows = []
+        self.best = []
+        self.complete = False
+        self.exhausted = False
+        self.refresh()
+
+    def refresh(self):
+        """
+            Drop the loaded rows, e.g. after a new score was recorded. The
+            view fetches the first rows again.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        self.beginResetModel()
+        self.best = self.store.top_scores()
+        # If the store keeps fewer scores than it could, these are all
+        self.complete = len(self.best) < self.store.top
+        self.rows = []
+        self.exhausted = False
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        _, name, score = self.rows[index.row()]
+        return f"{name}: {score}"
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent):
+        """
+            Append the next batch of scores.
+
+            Parameters:
+            -----------
+                parent: QModelIndex
+                        The parent index, only the (invalid) root index has
+                        rows.
+
+            Returns:
+            --------
+                None
+        """
+        if parent.isValid():
+            return
+
+        start = len(self.rows)
+        if start < len(self.best):
+            rows = self.best[start:start + self.batch]
+            self.exhausted = self.complete and \
+                start + len(rows) == len(self.best)
+        elif self.complete:
+            rows = []
+            self.exhausted = True
+        else:
+            after = self.rows[-1] if self.rows else None
+            # An exception must not escape from a virtual method of Qt
+            try:
+                rows = self.store.page(self.batch, after)
+            except sqlite3.Error as e:
+                print(f"Could not load the scoreboard: {e}")
+                rows = []
+                self.exhausted = True
+            else:
+                self.exhausted = len(rows) < self.batch
+
+        if rows:
+            self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+            self.rows.extend(rows)
+            self.endInsertRows()
+
+
+class SnakeGame(QMainWindow):
+    """
+        SnakeGame class is responsible for setting up the game and managing
+        the game state. The SnakeGame class inherits from the QMainWindow
+        class and implements the logic for the snake game using the PyQt
+        library. The game is built using the QGraphicsView and QGraphicsScene
+        classes.
+
+        The game follows the standard Snake game rules, the snake grows in
+        size when it eats food, and the game ends if the snake collides with
+        itself or the wall. The snake direction is controlled by the arrow
+        keys on the keyboard or the WASD keys.
+
+        The game state and the game rules live in the headless GameEngine.
+        The SnakeGame class feeds the player input into the engine on every
+        logic tick and renders the resulting state on every frame.
+
+        The SnakeGame class initializes the game world and sets up the
+        graphical user interface for the game using the QGraphicsView and
+        QGraphicsScene classes. The game world is divided into a grid of
+        board.cols x board.rows cells of board.cell_size pixels, and the
+        snake and food objects are placed within the grid.
+
+        Parameters:
+        -----------
+            board: BoardConfig
+                    The size of the game world.
+
+            profile_ticks: int
+                    Profile the first ``profile_ticks`` ticks of the game
+                    (see toggleProfiling), 0 to not profile.
+
+        Returns:
+        --------
+            None
+    """
+
+    # Emitted by the writer thread after it recorded a score
+    scoresWritten = pyqtSignal()
+
+    def __init__(self, board=BOARD, profile_ticks=0):
+        super().__init__()
+
+        self.board = board
+
+        self.keyPressEater = KeyPressEater(self)
+        self.installEventFilter(self.keyPressEater)
+
+        self.gameOver_flag = False
+        self.autopilot_enabled = False
+        self.scores = None
+        self.scoreWriter = None
+        self.scoresWritten.connect(self.collectScores)
+        self.engine = GameEngine(board, BACKEND, autopilot=AUTOPILOT)
+        self.timings = self.engine.timings = TickTimer()
+        self.profiler = Profiler(PROFILE_DIR)
+        self.planner = AutopilotPlanner()
+        self.nextDirection = self.engine.direction
+        self.initUI()
+        self.initGame()
+        if profile_ticks:
+            self.profiler.start(profile_ticks)
+
+    def initUI(self, set_focus: bool = True):
+        """
+            Set up the graphical user interface for the game.
+            The initUI method is responsible for setting up the graphical
+            user interface for the game using the PyQt library. It creates the
+            main window for the game and adds the necessary widgets and layout
+            to the window.
+
+            The main window contains a QLabel for the score, a QLabel for the
+            game over text, a QGraphicsView for the game world, and a
+            QVBoxLayout to manage the layout of the widgets.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        self.setWindowTitle("Snake Game")
+        self.centralWidget = QWidget()
+        self.setCentralWidget(self.centralWidget)
+
+        self.mainLayout = QHBoxLayout()
+        self.gameLayout = QVBoxLayout()
+
+        # Score and Game Over Labels
+        self.scoreLabel = QLabel("Score: 0")
+        self.scoreLabel.setFont(QFont("Arial", 16))
+        self.gameOverLabel = QLabel("Game Over")
+        self.gameOverLabel.setFont(QFont("Arial", 20, QFont.Bold))
+        self.gameOverLabel.hide()
+
+        # Layout for labels
+        self.labelLayout = QVBoxLayout()
+        self.labelLayout.addWidget(self.scoreLabel)
+        self.labelLayout.addWidget(self.gameOverLabel)
+
+        # Add label layout to game layout
+        self.gameLayout.addLayout(self.labelLayout)
+
+        # GraphicsView for the game world
+        self.scene = QGraphicsScene(
+            0, 0, self.board.width, self.board.height)
+        self.view = QGraphicsView(self.scene)
+        self.view.setFixedSize(int(self.scene.width()) + 2,
+                               int(self.scene.height()) + 2)
+        self.gameLayout.addWidget(self.view)
+        self.renderer = SnakeRenderer(self.scene, self.board.cell_size)
+
+        # Overlay with the tick timings, toggled with F3
+        self.timingsOverlay = QLabel(self.view)
+        self.timingsOverlay.setFont(QFont("Monospace", 9))
+        self.timingsOverlay.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 160); color: white;"
+            " padding: 4px;")
+        self.timingsOverlay.move(4, 4)
+        self.timingsOverlay.hide()
+        self.overlayTimer = QTimer()
+        self.overlayTimer.timeout.connect(self.updateTimingsOverlay)
+
+        # Game over overlay, shown instead of modal dialogs (see gameOver)
+        self.gameOverPanel = QFrame(self.view)
+        self.gameOverPanel.setStyleSheet(
+            "QFrame { background-color: rgba(0, 0, 0, 180); }"
+            " QLabel { color: white; }")
+        panelLayout = QVBoxLayout(self.gameOverPanel)
+        self.finalScoreLabel = QLabel()
+        self.finalScoreLabel.setFont(QFont("Arial", 16))
+        self.nameEdit = QLineEdit()
+        self.nameEdit.setPlaceholderText("Enter your name")
+        self.nameEdit.setMaxLength(32)
+        self.nameEdit.returnPressed.connect(self.submitScore)
+        self.saveButton = QPushButton("Save score")
+        self.saveButton.clicked.connect(self.submitScore)
+        self.restartButton = QPushButton("Restart")
+        self.restartButton.setAutoDefault(True)
+        self.restartButton.clicked.connect(self.restartGame)
+        # The name field takes R as a letter, so the hint waits for it
+        self.restartHint = QLabel("Press R to restart")
+        panelLayout.addWidget(self.finalScoreLabel)
+        panelLayout.addWidget(self.nameEdit)
+        panelLayout.addWidget(self.saveButton)
+        panelLayout.addWidget(self.restartButton)
+        panelLayout.addWidget(self.restartHint)
+        self.gameOverPanel.hide()
+
+        # Scoreboard for the highscores
+        # Scores are fetched on demand (see ScoreboardModel)
+        self.scoreboard = QListView()
+        self.scoreboard.setUniformItemSizes(True)
+        self.scoreboard.setMaximumWidth(200)
+        self.scoreboardModel = None
+
+        # Add game layout to main layout
+        self.mainLayout.addLayout(self.gameLayout)
+        self.mainLayout.addWidget(self.scoreboard)
+
+        self.centralWidget.setLayout(self.mainLayout)
+
+        # Setup the menu
+        menubar = self.menuBar()
+
+        # Menu "Game"
+        fileMenu = menubar.addMenu('Game')
+        restartAction = QAction('Restart', self)
+        restartAction.triggered.connect(self.restartGame)
+        fileMenu.addAction(restartAction)
+        closeAction = QAction('Close', self)
+        closeAction.triggered.connect(self.close)
+        fileMenu.addAction(closeAction)
+
+        # Menu "Preferences"
+        prefMenu = menubar.addMenu('Preferences')
+        settingsAction = QAction('Settings-Window', self)
+        settingsAction.triggered.connect(self.showSettings)
+        prefMenu.addAction(settingsAction)
+
+        if set_focus:
+            # Setze Fokus
+            self.setFocusPolicy(Qt.StrongFocus)
+            self.view.setFocusPolicy(Qt.StrongFocus)
+            self.view.setFocus()
+
+    def move_settings_window(self):
+        # Calculate the position of the settings window
+        mainWindowGeometry = self.frameGeometry()
+        settingsWidth = self.settingsWindow.frameGeometry().width()
+        settingsHeight = self.settingsWindow.frameGeometry().height()
+
+        # Center the settings window next to the main window
+        term_1 = int(mainWindowGeometry.left() - settingsWidth)
+        sub_term_2 = mainWindowGeometry.top()
+        sub_term_3 = (mainWindowGeometry.height() - settingsHeight)
+        settings_y = sub_term_2 + sub_term_3 // 2
+
+        self.settingsWindow.move(term_1, settings_y)
+
+    def toggle_autopilot(self):
+        """
+            Switch to the next autopilot mode. The modes are cycled in the
+            order off, the AUTOPILOT strategy from the settings, the other
+            strategies of AUTOPILOTS, off again. The Hamiltonian autopilot
+            is skipped on boards without a Hamiltonian cycle.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        modes = [None, AUTOPILOT] + [
+            mode for mode in AUTOPILOTS if mode != AUTOPILOT]
+        if not has_hamiltonian_cycle(self.board.cols, self.board.rows):
+            modes.remove('hamiltonian')
+        mode = self.engine.autopilot if self.autopilot_enabled else None
+        mode = modes[(modes.index(mode) + 1) % len(modes)]
+
+        self.autopilot_enabled = mode is not None
+        if mode is not None:
+            self.engine.autopilot = mode
+        self.planner.reset()
+
+    def toggleTimings(self):
+        """
+            Show or hide the overlay with the tick timings. The overlay
+            lists p50, p95 and p99 of every span over the last ticks (see
+            TickTimer) and is refreshed every OVERLAY_INTERVAL milliseconds
+            while it is visible.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        if not self.timingsOverlay.isHidden():
+            self.overlayTimer.stop()
+            self.timingsOverlay.hide()
+            return
+
+        self.updateTimingsOverlay()
+        self.timingsOverlay.show()
+        self.overlayTimer.start(OVERLAY_INTERVAL)
+
+    def updateTimingsOverlay(self):
+        self.timingsOverlay.setText(self.timings.format())
+        self.timingsOverlay.adjustSize()
+
+    def toggleProfiling(self):
+        """
+            Start or stop capturing a CPU profile and the memory
+            allocations of the running game. When the capture stops, the
+            profile, the allocation snapshot and a summary with the top
+            functions and allocation sites are written to PROFILE_DIR, and
+            the summary is printed.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        if self.profiler.active:
+            print(self.profiler.stop())
+        else:
+            print("Profiling started, press F9 again to stop")
+            self.profiler.start()
+
+    def closeEvent(self, event):
+        if self.profiler.active:
+            print(self.profiler.stop())
+        self.overlayTimer.stop()
+        self.timer.stop()
+        self.planner.shutdown()
+        if self.scores is not None:
+            # Write the scores that are still queued before exiting
+            self.scoreWriter.close()
+            self.scores.close()
+        super().closeEvent(event)
+
+    def showSettings(self):
+        if not hasattr(self, 'settingsWindow'):
+            self.settingsWindow = SettingsWindow(self)
+
+        self.move_settings_window()
+        self.settingsWindow.show()
+
+    def initGame(self):
+        """
+            Initialize the game state and start the game.
+            The initGame method is responsible for initializing the game state
+            and starting the game. It creates the snake and food objects in the
+            game world and starts the game timer to update the game state.
+
+            The game state is updated using a timer, which calls the
+            updateFrame method once per frame (every FRAME_INTERVAL
+            milliseconds). The frames are independent of the game speed: a
+            FixedTimestep decides how many logic ticks (updateGame) are due
+            since the last frame. The game speed is determined by the
+            GAME_SPEED constant, which specifies the interval between game
+            updates. The speed of the game increases as the snake grows in
+            size. (see adjustSpeed method)
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        self.loadScores()
+        self.updateScoreboard()
+        if hasattr(self, 'timer'):
+            self.timer.stop()
+        self.scheduler = FixedTimestep(GAME_SPEED)
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.updateFrame)
+        self.timer.start(FRAME_INTERVAL)
+        self.updateSnake()
+
+    def updateFrame(self):
+        """
+            Run the logic ticks that are due and render the frame.
+            The updateFrame method is called by the timer once per frame. It
+            passes the elapsed time to the scheduler, calls updateGame for
+            every tick that is due (none, one or several, e.g. in
+            fast-forward mode) and then interpolates the snake between the
+            last two ticks.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        # The timer is stopped when the game ends, this is just a guard
+        if self.engine.game_over:
+            return
+
+        timings = self.timings
+        started = timings.clock()
+        scheduler = self.scheduler
+        scheduler.advance()
+        while scheduler.tick():
+            self.updateGame()
+            # A game over resets or replaces the scheduler
+            if scheduler is not self.scheduler or self.engine.game_over:
+                return
+
+        self.renderer.interpolate(scheduler.alpha)
+        timings.record('frame', timings.clock() - started)
+
+    def updateGame(self):
+        """
+            Update the game state and handle the game logic for a single
+            logic tick. The updateGame method is called by updateFrame for
+            every tick that is due. It updates the game
+            state and handles the game logic by updating the snake position,
+            checking for collisions, and handling the game over state.
+
+            If the snake collides with itself or the wall, the game over state
+            is triggered, and the game stops updating. If the snake eats the
+            food object, the score is updated, and the snake grows in size.
+
+            The method also handles the input from the keyboard, allowing the
+            player to change the direction of the snake using the arrow keys
+            or the WASD keys.
+
+            The rules themselves are applied by GameEngine.step, this method
+            only passes the requested direction to the engine and renders the
+            result.
+
+            The autopilot logic is also handled here. The game will use the
+            A* algorithm to find the shortest path to the food, and the snake
+            will automatically follow the path. The search runs on a worker
+            thread (see AutopilotPlanner), so this method never waits for it;
+            while no path is available the planner picks a safe move.
+            The Hamiltonian and the distance field autopilots only need a
+            few lookups per tick and are asked directly (see
+            GameEngine.autopilot_action).
+
+            The duration of the planning, the rendering and the whole tick
+            is recorded in the TickTimer of the window (see toggleTimings).
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        # The timer is stopped when the game ends, this is just a guard
+        if self.engine.game_over:
+            return
+
+        timings = self.timings
+        started = timings.clock()
+        if self.autopilot_enabled:
+            if self.engine.autopilot == 'astar':
+                action = self.planner.next_action(self.engine)
+            else:
+                action = self.engine.autopilot_action()
+            if action is not None:
+                self.nextDirection = action
+            timings.record('planning', timings.clock() - started)
+
+        # The engine records the collision and food spans itself
+        result = self.engine.step(self.nextDirection)
+
+        if self.profiler.active:
+            summary = self.profiler.tick()
+            if summary is not None:
+                print(summary)
+
+        if result.game_over and not self.engine.won:
+            self.gameOver()
+            return
+
+        rendering = timings.clock()
+        self.renderer.advance(result, self.engine.snake)
+
+        if result.ate:
+            self.scoreLabel.setText(f"Score: {self.engine.score}")
+            self.updateFoodOnScene()
+            self.adjustSpeed()
+        ended = timings.clock()
+        timings.record('render', ended - rendering)
+        timings.record('tick', ended - started)
+
+        # The snake filled the whole board
+        if self.engine.won:
+            self.gameOver()
+
+    def gameOver(self):
+        """
+            Switch to the game over state. The game over state is an
+            overlay on the game world instead of modal dialogs, so the event
+            loop keeps running: the timer is stopped, so no ticks pile up,
+            and the overlay asks for the name of the player and offers a
+            restart (see submitScore and restartGame). While the name field
+            has the focus, R is typed into it; once the score is saved, the
+            overlay shows that pressing R restarts the game as well.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        self.timer.stop()
+        self.gameOver_flag = True
+
+        self.gameOverLabel.setText(
+            "You won!" if self.engine.won else "Game Over")
+        self.gameOverLabel.show()
+        self.finalScoreLabel.setText(f"Score: {self.engine.score}")
+        self.nameEdit.clear()
+        self.nameEdit.setEnabled(True)
+        self.saveButton.setEnabled(True)
+        self.restartHint.hide()
+
+        self.placeGameOverPanel()
+        self.gameOverPanel.show()
+        self.gameOverPanel.raise_()
+        self.nameEdit.setFocus()
+
+    def placeGameOverPanel(self):
+        panel = self.gameOverPanel
+        panel.adjustSize()
+        panel.move((self.view.width() - panel.width()) // 2,
+                   (self.view.height() - panel.height()) // 2)
+
+    def submitScore(self):
+        """
+            Record the score of the finished game under the entered name.
+            The score is only queued here, it is written to the database on
+            the writer thread (see saveScores). The score can be saved once
+            per game.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        name = self.nameEdit.text().strip()
+        if not name or not self.gameOver_flag or \
+                not self.saveButton.isEnabled():
+            return
+
+        self.saveScores(name, self.engine.score)
+        self.nameEdit.setEnabled(False)
+        self.saveButton.setEnabled(False)
+        self.restartHint.show()
+        self.placeGameOverPanel()
+        self.restartButton.setFocus()
+
+    def restartGame(self):
+        self.engine.reset()
+        self.planner.reset()
+        self.nextDirection = self.engine.direction
+        self.gameOver_flag = False
+        self.gameOverPanel.hide()
+        self.gameOverLabel.hide()
+        self.scoreLabel.setText("Score: 0")
+        self.initGame()
+        self.updateSnake()
+        self.view.setFocus()
+
+    def loadScores(self):
+        """
+            Open the highscore store. The store keeps the best scores in
+            memory, so it is only opened once and not on every restart.
+            Scores of the JSON list of older versions are imported when the
+            database is created (see ScoreStore). New scores are written by
+            a ScoreWriter on a background thread.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        if self.scores is None:
+            self.scores = ScoreStore(SCOREBOARD_PATH,
+                                     legacy_path=LEGACY_SCOREBOARD_PATH)
+            self.scoreWriter = ScoreWriter(SCOREBOARD_PATH,
+                                           self.scoresWritten.emit)
+
+    def saveScores(self, name, score):
+        # A slow disk must not freeze the window, see collectScores
+        self.scoreWriter.submit(name, score)
+
+    def collectScores(self):
+        rows = self.scoreWriter.collect()
+        for row in rows:
+            self.scores.remember(*row)
+        if rows:
+            self.updateScoreboard()
+
+    def updateScoreboard(self):
+        if self.scoreboardModel is None:
+            self.scoreboardModel = ScoreboardModel(self.scores, parent=self)
+            self.scoreboard.setModel(self.scoreboardModel)
+        else:
+            self.scoreboardModel.refresh()
+
+    def updateFoodOnScene(self):
+        """
+            Update the food item on the scene. The updateFoodOnScene method is
+            used to update the food item on the scene. It updates the position
+            of the food item on the scene based on the position of the food in
+            the game world.
+
+            The food item is reused, it is only moved and recoloured by the
+            renderer (see SnakeRenderer.update_food).
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        self.renderer.update_food(self.engine.food)
+
+    def updateSnake(self):
+        """
+            Update the snake items on the scene.
+            The updateSnake method is used to update the snake items on the
+            scene. It updates the position of the snake items on the scene
+            based on the position of the snake in the game world.
+
+            All segment items are placed from scratch, so this is only used
+            when the game starts or restarts. During the game the renderer
+            updates the scene incrementally (see SnakeRenderer.advance).
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        self.renderer.sync(self.engine.snake)
+        self.updateFoodOnScene()
+
+    def adjustSpeed(self):
+        """
+            Adjust the game speed based on the length of the snake. The
+            adjustSpeed method is used to adjust the game speed based on the
+            length of the snake. It increases the speed of the game as the
+            snake grows in size.
+
+            The speed of the game is determined by the length of the snake,
+            which is used to adjust the interval between game updates. It uses
+            the length of the snake to calculate the new interval between game
+            updates.
+
+            The interval itself is calculated by GameEngine.tick_interval,
+            so headless runs use the same speed curve as the window. Only
+            the ticks of the scheduler get shorter, the frame rate stays
+            the same.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        self.scheduler.interval = self.engine.tick_interval()
+
+    def handleDirectionChange(self, key):
+        """
+            Handle the direction change based on the key press event.
+            The handleDirectionChange method is used to handle the direction
+            change based on the key press event. It listens for the arrow keys
+            on the keyboard and the WASD keys to change the direction of the
+            snake.
+
+            It handles the following:
+                - Left arrow key or 'A' key: changes the direction of the snake
+                                            to the left.
+                - Right arrow key or 'D' key: changes the direction of the
+                                            snake to the right.
+                - Up arrow key or 'W' key: changes the direction of the snake
+                                            to up.
+                - Down arrow key or 'S' key: changes the direction of the snake
+                                            to down.
+
+            Parameters:
+            -----------
+                key: int
+                        An integer representing the key press event.
+
+            Returns:
+            --------
+                None
+        """
+
+        if key == Qt.Key_Left or key == Qt.Key_A or key == Qt.Key_4:
+            if self.engine.direction != Direction.Right:
+                self.nextDirection = Direction.Left
+        elif key == Qt.Key_Right or key == Qt.Key_D or key == Qt.Key_6:
+            if self.engine.direction != Direction.Left:
+                self.nextDirection = Direction.Right
+        elif key == Qt.Key_Up or key == Qt.Key_W or key == Qt.Key_8:
+            if self.engine.direction != Direction.Down:
+                self.nextDirection = Direction.Up
+        elif key == Qt.Key_Down or key == Qt.Key_S or key == Qt.Key_5:
+            if self.engine.direction != Direction.Up:
+                self.nextDirection = Direction.Down
+
+    def handleSpacePress(self):
+        print("Space Pressed: Pause game")
+        if self.gameOver_flag:
+            print("Game Over! Cannot pause.")
+        elif self.timer.isActive():
+            self.timer.stop()
+        else:
+            # Do not catch up on the time spent in the pause
+            self.scheduler.start()
+            self.timer.start()
+
+    def toggleFastForward(self):
+        """
+            Switch the game logic between normal speed and FAST_FORWARD
+            times the normal speed. The frame rate stays the same, in
+            fast-forward mode several ticks run per frame.
+
+            Parameters:
+            -----------
+                None
+
+            Returns:
+            --------
+                None
+        """
+        if self.scheduler.speed == 1:
+            self.scheduler.speed = FAST_FORWARD
+        else:
+            self.scheduler.speed = 1
+
+
+class KeyPressEater(QObject):
+    application_close_keys = {Qt.Key_Escape}
+    game_restart_keys = {Qt.Key_R}
+    pause_game_keys = {Qt.Key_Space}
+    autopilot_toggle_key = {Qt.Key_Q}
+    fast_forward_keys = {Qt.Key_F}
+    timings_toggle_keys = {Qt.Key_F3}
+    profile_toggle_keys = {Qt.Key_F9}
+    direction_keys = {
+        Qt.Key_Left, Qt.Key_Right,
+        Qt.Key_Up, Qt.Key_Down,
+        Qt.Key_A, Qt.Key_D,
+        Qt.Key_W, Qt.Key_S,
+        Qt.Key_4, Qt.Key_8,
+        Qt.Key_5, Qt.Key_6
+    }
+
+    def __init__(self, game):
+        super().__init__()
+        self.game = game  # Referenz auf die SnakeGame-Instanz
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.KeyPress:
+            key = event.key()
+
+            if key in self.application_close_keys:
+                self.game.close()
+                return True
+            elif key in self.game_restart_keys:
+                self.game.restartGame()
+                return True
+            elif key in self.pause_game_keys:
+                self.game.handleSpacePress()
+                return True
+            elif key in self.autopilot_toggle_key:
+                self.game.toggle_autopilot()
+                return True
+            elif key in self.fast_forward_keys:
+                self.game.toggleFastForward()
+                return True
+            elif key in self.timings_toggle_keys:
+                self.game.toggleTimings()
+                return True
+            elif key in self.profile_toggle_keys:
+                self.game.toggleProfiling()
+                return True
+            elif key in self.direction_keys:
+                timings = self.game.timings
+                started = timings.clock()
+                self.game.handleDirectionChange(key)
+                timings.record('input', timings.clock() - started)
+                return True
+
+        return super(KeyPressEater, self).eventFilter(obj, event)
@@ -0,0 +1,22 @@
+"""
+    Settings shared by the window and the command line entry point.
+"""
+
+
+try:
+    from src.game.board import BoardConfig
+except ImportError:  # started as a script, e.g. python src/main.py
+    from game.board import BoardConfig
+
+
+SCOREBOARD_PATH = 'highscores.db'  # SQLite database of all highscores
+LEGACY_SCOREBOARD_PATH = 'highscores.json'  # imported into SCOREBOARD_PATH
+PROFILE_DIR = 'profiles'  # output directory of the profiler (F9, --profile)
+GAME_SPEED = 100  # initial speed for the game in milliseconds
+FRAME_INTERVAL = 16  # time between two rendered frames in milliseconds
+FAST_FORWARD = 8  # speed factor of the game logic in fast-forward mode
+# size of the game world, e.g. BoardConfig(200, 200, cell_size=4) for
+# load tests (the headless mode takes --board COLSxROWS instead)
+BOARD = BoardConfig(cols=40, rows=40, cell_size=20, start=(5, 5))
+BACKEND = 'grid'  # spatial index of the snake body, see BACKENDS in engine
+AUTOPILOT = 'astar'  # default autopilot strategy, see AUTOPILOTS in engine
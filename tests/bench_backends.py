@@ -0,0 +1,130 @@
+"""
+    Micro-benchmarks of the spatial indexes
+    ---------------------------------------
+    Compares the engine backends (OccupancyGrid, Quadtree, SpatialHash) for
+    different board sizes and numbers of entities. For every combination
+    the operations the engine performs are timed on the same random cells:
+
+        insert, is_open_space, retrieve, move, query_rect (8x8 cells) and
+        remove
+
+    and reported in operations per second. Run from the repository root:
+
+        python -m tests.bench_backends
+        python -m tests.bench_backends --sizes 40 200 --counts 100 10000 --json
+"""
+
+
+from argparse import ArgumentParser
+from json import dumps
+from random import Random
+from time import perf_counter
+
+from src.game.engine import BACKENDS
+from src.game.spatial_hash import SpatialHash
+
+
+# The engine backends plus a spatial hash with coarser buckets
+STRUCTURES = dict(BACKENDS)
+STRUCTURES['hash4'] = lambda cols, rows: SpatialHash((0, 0, cols, rows), 4)
+
+QUERY_RECT = 8  # width and height of the query_rect rectangles in cells
+
+
+def timed(operation, items):
+    started = perf_counter()
+    for item in items:
+        operation(item)
+    elapsed = perf_counter() - started
+    return round(len(items) / elapsed) if elapsed else None
+
+
+def bench(factory, size, count, queries, seed=0):
+    """
+        Time the operations of one structure.
+
+        Parameters:
+        -----------
+            factory: callable
+                    Creates the structure, called as ``factory(cols, rows)``.
+
+            size: int
+                    The number of columns and rows of the board.
+
+            count: int
+                    The number of entities to insert.
+
+            queries: int
+                    The number of lookups, moves and range queries.
+
+            seed: int
+                    The seed of the random cells.
+
+        Returns:
+        --------
+            dict
+                The operations per second of every operation.
+    """
+    rng = Random(seed)
+    cells = [(rng.randrange(size), rng.randrange(size)) for _ in range(count)]
+    probes = [(rng.randrange(size), rng.randrange(size))
+              for _ in range(queries)]
+    targets = [(rng.randrange(size), rng.randrange(size))
+               for _ in range(queries)]
+    rects = [(x, y, x + QUERY_RECT, y + QUERY_RECT) for x, y in probes]
+
+    structure = factory(size, size)
+    result = {"insert": timed(structure.insert, cells)}
+    result["is_open_space"] = timed(
+        lambda cell: structure.is_open_space(cell[0], cell[1]), probes)
+    result["retrieve"] = timed(
+        lambda cell: structure.retrieve([], cell), probes)
+
+    # Every move takes an entity from its current cell to a random one
+    current = list(cells)
+    moves = []
+    for i, target in enumerate(targets):
+        moves.append((current[i % count], target))
+        current[i % count] = target
+    result["move"] = timed(lambda move: structure.move(*move), moves)
+
+    result["query_rect"] = timed(structure.query_rect, rects)
+    result["remove"] = timed(structure.remove, current)
+    return result
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark the spatial indexes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[40, 100, 200],
+                        help="board sizes (columns = rows)")
+    parser.add_argument("--counts", type=int, nargs="+",
+                        default=[16, 256, 4096],
+                        help="numbers of entities")
+    parser.add_argument("--queries", type=int, default=20000,
+                        help="lookups, moves and range queries per run")
+    parser.add_argument("--json", action="store_true",
+                        help="print one JSON line per run instead of a table")
+    args = parser.parse_args()
+
+    operations = ("insert", "is_open_space", "retrieve", "move",
+                  "query_rect", "remove")
+    if not args.json:
+        print(f"{'structure':>10} {'size':>5} {'count':>6} " +
+              " ".join(f"{name:>13}" for name in operations))
+
+    for size in args.sizes:
+        for count in args.counts:
+            if count > size * size:
+                continue
+            for name, factory in STRUCTURES.items():
+                result = bench(factory, size, count, args.queries)
+                if args.json:
+                    print(dumps({"structure": name, "size": size,
+                                 "count": count, "ops_per_second": result}))
+                else:
+                    print(f"{name:>10} {size:>5} {count:>6} " +
+                          " ".join(f"{result[op]:>13}" for op in operations))
+
+
+if __name__ == '__main__':
+    main()
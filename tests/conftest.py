@@ -0,0 +1,33 @@
+"""
+    Shared fixtures
+    ---------------
+    The window of the game on the offscreen Qt platform, for the tests and
+    benchmarks of the rendering. It is skipped if PyQt5 is not installed.
+"""
+
+
+import os
+
+import pytest
+
+
+@pytest.fixture(scope='module')
+def window(tmp_path_factory):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    widgets = pytest.importorskip('PyQt5.QtWidgets')
+    import src.gui
+    import src.settings
+
+    # Keep the highscores of the player out of the tests
+    database = str(tmp_path_factory.mktemp('scores') / 'highscores.db')
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        for module in (src.settings, src.gui):
+            monkeypatch.setattr(module, 'SCOREBOARD_PATH', database)
+            monkeypatch.setattr(module, 'LEGACY_SCOREBOARD_PATH', None)
+
+        app = widgets.QApplication.instance() or widgets.QApplication([])
+        game = src.gui.SnakeGame()
+        game.timer.stop()
+        yield game
+        game.close()
+        app.processEvents()
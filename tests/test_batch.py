@@ -0,0 +1,190 @@
+"""
+    Tests of the batched engine
+    ---------------------------
+    Steps a BatchEngine in lockstep with one GameEngine per game. Every
+    game gets the same actions and the same food as its GameEngine, so
+    both engines must agree on every tick. The environments on top of
+    both engines are checked for their observations, rewards and resets.
+"""
+
+
+from random import Random
+
+import pytest
+
+from src.game import AUTOPILOTS, BoardConfig, Direction, GameEngine
+
+np = pytest.importorskip('numpy')
+from src.game.batch import CAUSE_NAMES, NO_ACTION, BatchEngine  # noqa: E402
+from src.game.env import SnakeEnv, VectorSnakeEnv  # noqa: E402
+
+
+BOARD = BoardConfig(6, 6, start=(2, 2))
+MAX_TICKS = 20000
+
+
+def copy_food(batch, env, engine):
+    # The engines draw their food from different random generators
+    if engine.food is not None:
+        x, y = engine.food.position
+        batch.food[env] = y * batch.cols + x
+        batch.food_value[env] = engine.food.value
+
+
+@pytest.mark.parametrize('num_envs', (1, 6))
+def test_batch_matches_engine(num_envs):
+    rng = Random(num_envs)
+    batch = BatchEngine(num_envs, BOARD, seed=0, auto_reset=False)
+    # The first game follows the Hamiltonian cycle and fills the board
+    autopilots = sorted(AUTOPILOTS, key=lambda name: name != 'hamiltonian')
+    engines = [GameEngine(BOARD, seed=env,
+                          autopilot=autopilots[env % len(autopilots)])
+               for env in range(num_envs)]
+    for env, engine in enumerate(engines):
+        copy_food(batch, env, engine)
+
+    causes = set()
+    for _ in range(MAX_TICKS):
+        if batch.done.all():
+            break
+
+        actions = np.full(num_envs, NO_ACTION, dtype=np.int8)
+        results = {}
+        for env, engine in enumerate(engines):
+            if engine.game_over:
+                continue
+            action = engine.autopilot_action()
+            if engine.autopilot != 'hamiltonian' and rng.random() < .01:
+                action = rng.randrange(4)
+            if action is not None:
+                actions[env] = action
+            results[env] = engine.step(action)
+
+        rewards, dones = batch.step(actions)
+        lengths = batch.snake_lengths()
+        for env, result in results.items():
+            engine = engines[env]
+            if not result.game_over:
+                assert (batch.head_x[env], batch.head_y[env]) == engine.head
+            assert lengths[env] == len(engine.snake)
+            assert (rewards[env] > 0) == result.ate
+            assert batch.score[env] == engine.score
+            assert dones[env] == result.game_over
+            assert CAUSE_NAMES[batch.death_cause[env]] == engine.death_cause
+            occupied = np.flatnonzero(batch.occupancy[env])
+            assert {(cell % batch.cols, cell // batch.cols)
+                    for cell in occupied} == set(engine.snake)
+            if result.ate:
+                copy_food(batch, env, engine)
+            if result.game_over:
+                causes.add(engine.death_cause)
+
+    assert batch.done.all()
+    assert all(engine.game_over for engine in engines)
+    assert 'win' in causes
+
+
+def assert_observation(observation, engine):
+    # The planes are updated in place, they must match a fresh fill
+    body, head, food = observation
+    occupied = set(zip(*np.nonzero(body.T)))
+    assert occupied == set(engine.snake)
+    assert list(zip(*np.nonzero(head.T))) == [engine.head]
+    expected = [] if engine.food is None else [engine.food.position]
+    assert list(zip(*np.nonzero(food.T))) == expected
+
+
+def test_env_observation():
+    env = SnakeEnv(BOARD, seed=0)
+    observation = env.reset(0)
+    assert observation.shape == (3, BOARD.rows, BOARD.cols)
+    assert observation.dtype == np.uint8
+    assert_observation(observation, env.engine)
+
+    rng = Random(0)
+    for _ in range(2000):
+        action = env.engine.autopilot_action()
+        if rng.random() < .05:
+            action = rng.randrange(4)
+        result, _, done, info = env.step(action)
+        assert result is observation
+        if done:
+            assert info["cause"] == env.engine.death_cause
+            observation = env.reset(rng.randrange(2 ** 32))
+        assert_observation(observation, env.engine)
+
+
+def test_env_rewards():
+    env = SnakeEnv(BOARD, seed=0)
+    env.engine.food.position = (3, 2)
+    env.engine.food.value = 2
+    env.fill_observation()
+
+    _, reward, done, info = env.step(Direction.Right)
+    assert (reward, done) == (2, False)
+    assert (info["score"], info["ticks"]) == (2, 1)
+
+    # The snake runs into the right wall
+    while not done:
+        _, reward, done, info = env.step(None)
+    assert reward == 0
+    assert info["cause"] == 'wall' and info["score"] >= 2
+
+
+def test_vector_env_resets_finished_games():
+    env = VectorSnakeEnv(4, BOARD, seed=0)
+    observation = env.reset()
+    assert observation.shape == (4, 3, BOARD.rows, BOARD.cols)
+    assert observation.dtype == np.uint8
+
+    # Every game eats the food in front of it, then hits the wall
+    env.engine.food[:] = 2 * BOARD.cols + 3
+    env.engine.food_value[:] = 1
+    env.update_markers()
+    _, rewards, dones, info = env.step(np.full(4, NO_ACTION))
+    assert rewards.tolist() == [1] * 4 and not dones.any()
+    assert info["score"].tolist() == [1] * 4
+
+    for _ in range(2):
+        _, rewards, dones, info = env.step(np.full(4, NO_ACTION))
+        assert not dones.any()
+    _, rewards, dones, info = env.step(np.full(4, NO_ACTION))
+    assert dones.all() and not rewards.any()
+    assert [info["cause_names"][cause] for cause in info["final_cause"]] \
+        == ['wall'] * 4
+    assert info["final_score"].tolist() == [1] * 4
+    assert info["final_ticks"].tolist() == [3] * 4
+
+    # The games start over at once
+    start = BOARD.start[1] * BOARD.cols + BOARD.start[0]
+    planes = observation.reshape(4, 3, BOARD.cells)
+    assert (planes[:, 0].sum(axis=1) == 1).all()
+    assert (planes[:, 1].argmax(axis=1) == start).all()
+    assert (planes[:, 2].sum(axis=1) == 1).all()
+    assert not env.engine.ticks.any() and not info["score"].any()
+
+
+def play_envs(seed):
+    rng = Random(1)
+    vector = VectorSnakeEnv(3, BOARD, seed=seed)
+    single = SnakeEnv(BOARD, seed=seed)
+    frames = []
+    for _ in range(300):
+        actions = [rng.randrange(4) for _ in range(3)]
+        observation, rewards, dones, _ = vector.step(actions)
+        frames.append((observation.copy(), rewards.copy(), dones.copy()))
+        observation, reward, done, _ = single.step(actions[0])
+        frames.append((observation.copy(), reward, done))
+        if done:
+            single.reset(seed + len(frames))
+    return frames
+
+
+def test_env_seeding():
+    first, second = play_envs(7), play_envs(7)
+    assert len(first) == len(second)
+    for (obs_a, reward_a, done_a), (obs_b, reward_b, done_b) in zip(
+            first, second):
+        assert np.array_equal(obs_a, obs_b)
+        assert np.array_equal(reward_a, reward_b)
+        assert np.array_equal(done_a, done_b)
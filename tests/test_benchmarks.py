@@ -0,0 +1,238 @@
+"""
+    Benchmarks of the hot paths
+    ---------------------------
+    Times the operations that run on every tick with pytest-benchmark:
+
+        astar                on an empty board and around a long snake
+        spatial indexes      insert, is_open_space and retrieve of every
+                             engine backend (OccupancyGrid, Quadtree,
+                             SpatialHash)
+        Food.spawn           on boards filled to 0 %, 50 %, 90 % and 99 %
+        check_collision      for snakes of different lengths
+        rendering            SnakeRenderer.advance and a single game
+                             tick of the window for snakes of different
+                             lengths, on the offscreen Qt platform; both
+                             must not get slower with the length
+
+    The benchmarks are marked with ``benchmark``, which pytest.ini deselects,
+    so the normal test run stays fast. They are run on their own, e.g. to
+    keep a baseline and compare later runs against it (the baselines are
+    JSON files in .benchmarks/):
+
+        python -m pytest tests/test_benchmarks.py -m benchmark \\
+            --benchmark-autosave
+        python -m pytest tests/test_benchmarks.py -m benchmark \\
+            --benchmark-compare --benchmark-compare-fail=mean:10%
+
+    The second command fails if the mean of a benchmark got more than 10 %
+    slower than in the latest saved run.
+"""
+
+
+from random import Random
+
+import pytest
+
+from src.game import (DEFAULT_BOARD, Food, FreeCells, GameEngine,
+                      OccupancyGrid, Snake, StepResult, astar,
+                      hamiltonian_cycle)
+from src.game.engine import BACKENDS
+
+pytest.importorskip('pytest_benchmark')
+
+pytestmark = pytest.mark.benchmark
+
+
+LENGTHS = (1, 100, 1000, DEFAULT_BOARD.cells - 1)
+CELLS = 256  # number of cells inserted into and looked up in the indexes
+
+
+def long_snake(length, board=DEFAULT_BOARD):
+    """
+        Build a snake of the given length that winds through the board along
+        its Hamiltonian cycle.
+
+        Parameters:
+        -----------
+            length: int
+                    The number of cells of the snake.
+
+            board: BoardConfig
+                    The board the snake lies on.
+
+        Returns:
+        --------
+            Snake
+                The snake, its tail is the first cell of the cycle.
+    """
+    order = hamiltonian_cycle(board.cols, board.rows)[0]
+    snake = Snake(order[0])
+    for cell in order[1:length]:
+        snake.advance(cell, grow=True)
+    return snake
+
+
+def random_cells(count, board=DEFAULT_BOARD, seed=0):
+    rng = Random(seed)
+    return [(rng.randrange(board.cols), rng.randrange(board.rows))
+            for _ in range(count)]
+
+
+# Pathfinding
+
+def test_astar_empty_board(benchmark):
+    grid = OccupancyGrid(DEFAULT_BOARD.cols, DEFAULT_BOARD.rows)
+    goal = (DEFAULT_BOARD.cols - 1, DEFAULT_BOARD.rows - 1)
+    path = benchmark(astar, grid, (0, 0), goal)
+    assert path[-1] == goal
+
+
+def test_astar_around_snake(benchmark):
+    # The snake fills every second row, so the path has to wind around it
+    order = hamiltonian_cycle(DEFAULT_BOARD.cols, DEFAULT_BOARD.rows)[0]
+    grid = OccupancyGrid(DEFAULT_BOARD.cols, DEFAULT_BOARD.rows)
+    snake = long_snake(DEFAULT_BOARD.cells // 2)
+    for cell in snake:
+        grid.insert(cell)
+    start, goal = order[len(snake)], order[-1]
+    path = benchmark(astar, grid, start, goal)
+    assert path[-1] == goal
+
+
+# Spatial indexes
+
+@pytest.mark.parametrize('backend', sorted(BACKENDS))
+def test_index_insert(benchmark, backend):
+    cells = random_cells(CELLS)
+
+    def setup():
+        index = BACKENDS[backend](DEFAULT_BOARD.cols, DEFAULT_BOARD.rows)
+        return (index,), {}
+
+    def insert(index):
+        for cell in cells:
+            index.insert(cell)
+
+    benchmark.pedantic(insert, setup=setup, rounds=200)
+
+
+@pytest.mark.parametrize('backend', sorted(BACKENDS))
+def test_index_is_open_space(benchmark, backend):
+    index = BACKENDS[backend](DEFAULT_BOARD.cols, DEFAULT_BOARD.rows)
+    for cell in random_cells(CELLS):
+        index.insert(cell)
+    probes = random_cells(CELLS, seed=1)
+
+    def is_open_space():
+        return sum(index.is_open_space(x, y) for x, y in probes)
+
+    assert 0 < benchmark(is_open_space) < CELLS
+
+
+@pytest.mark.parametrize('backend', sorted(BACKENDS))
+def test_index_retrieve(benchmark, backend):
+    index = BACKENDS[backend](DEFAULT_BOARD.cols, DEFAULT_BOARD.rows)
+    for cell in random_cells(CELLS):
+        index.insert(cell)
+    probes = random_cells(CELLS, seed=1)
+
+    def retrieve():
+        found = []
+        for cell in probes:
+            index.retrieve(found, cell)
+        return found
+
+    benchmark(retrieve)
+
+
+# Food
+
+@pytest.mark.parametrize('fill', (0, .5, .9, .99))
+def test_food_spawn(benchmark, fill):
+    free_cells = FreeCells(DEFAULT_BOARD.cols, DEFAULT_BOARD.rows)
+    cells = [(x, y) for y in range(DEFAULT_BOARD.rows)
+             for x in range(DEFAULT_BOARD.cols)]
+    Random(0).shuffle(cells)
+    for cell in cells[:int(DEFAULT_BOARD.cells * fill)]:
+        free_cells.discard(cell)
+    assert len(free_cells) == DEFAULT_BOARD.cells - int(
+        DEFAULT_BOARD.cells * fill)
+    food = Food(free_cells, Random(0))
+
+    result = benchmark(food.spawn)
+    assert result["position"] in free_cells
+
+
+# Collisions
+
+@pytest.mark.parametrize('length', LENGTHS)
+def test_check_collision(benchmark, length):
+    engine = GameEngine(DEFAULT_BOARD, seed=0)
+    engine.snake = long_snake(length)
+    probes = random_cells(CELLS)
+
+    def check_collisions():
+        check_collision = engine.check_collision
+        return [check_collision(cell) for cell in probes]
+
+    benchmark(check_collisions)
+
+
+# Rendering
+
+def place_snake(engine, snake):
+    """
+        Put the given snake into the engine and place new food.
+
+        Parameters:
+        -----------
+            engine: GameEngine
+                    The engine, its indexes are rebuilt for the snake.
+
+            snake: Snake
+                    The snake.
+
+        Returns:
+        --------
+            None
+    """
+    engine.reset(0)
+    engine.snake = snake
+    engine.occupancy.clear()
+    engine.free_cells.clear()
+    for cell in snake:
+        engine.occupancy.insert(cell)
+        engine.free_cells.discard(cell)
+    engine.add_food()
+
+
+@pytest.mark.parametrize('length', LENGTHS)
+def test_renderer_advance(benchmark, window, length):
+    # The snake keeps moving along the Hamiltonian cycle
+    order = hamiltonian_cycle(DEFAULT_BOARD.cols, DEFAULT_BOARD.rows)[0]
+    snake = long_snake(length)
+    renderer = window.renderer
+    renderer.sync(snake)
+    ticks = iter(range(length, 10 ** 9))
+
+    def advance():
+        head = order[next(ticks) % len(order)]
+        tail = snake.advance(head)
+        renderer.advance(StepResult(head, tail, False, False), snake)
+
+    benchmark(advance)
+    assert len(renderer.segments) == length
+    assert renderer.segments[0].pos().x() == \
+        snake.head[0] * renderer.cell_size
+
+
+@pytest.mark.parametrize('length', LENGTHS[:-1])
+def test_update_game(benchmark, window, length):
+    # One tick of the Hamiltonian autopilot, which never dies
+    place_snake(window.engine, long_snake(length))
+    window.engine.autopilot = 'hamiltonian'
+    window.autopilot_enabled = True
+    window.updateSnake()
+    benchmark.pedantic(window.updateGame, rounds=2000)
+    window.autopilot_enabled = False
+    assert not window.engine.game_over
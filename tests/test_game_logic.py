@@ -1 +1,197 @@
-# Testspiellogik 
+"""
+    Tests of the game rules
+    -----------------------
+    Drives the headless GameEngine tick by tick and checks the rules of
+    the game (growth, collisions, winning) as well as the consistency of
+    the indexes the engine keeps next to the Snake model: the spatial
+    index of every backend and the FreeCells index.
+"""
+
+
+from collections import Counter
+from random import Random
+
+import pytest
+
+from src.game import BoardConfig, Direction, GameEngine
+from src.game.engine import BACKENDS
+
+
+BOARD = BoardConfig(10, 10, start=(5, 5))
+
+
+def place_food(engine, cell, value=1):
+    # Replaces the randomly placed food, the cell must be free
+    engine.food.position = cell
+    engine.food.value = value
+
+
+def assert_consistent(engine):
+    """
+        Check that the spatial index and the free cells match the snake.
+
+        Parameters:
+        -----------
+            engine: GameEngine
+                    The engine to check.
+
+        Returns:
+        --------
+            None
+    """
+    counts = Counter(engine.snake)
+    assert engine.snake.counts == counts
+
+    occupied = engine.occupancy.query_rect((0, 0, engine.cols, engine.rows))
+    assert Counter(occupied) == counts
+
+    free_cells = engine.free_cells
+    assert len(free_cells) == engine.cols * engine.rows - len(counts)
+    for y in range(engine.rows):
+        for x in range(engine.cols):
+            assert ((x, y) in free_cells) == ((x, y) not in counts)
+            assert engine.is_open_space(x, y) == ((x, y) not in counts)
+
+
+def test_growth_stacks_the_tail():
+    engine = GameEngine(BOARD, seed=0)
+    place_food(engine, (6, 5), value=2)
+
+    result = engine.step(Direction.Right)
+    assert result.ate and result.tail is None and not result.game_over
+    assert engine.score == 2
+    # The head moved without retracting the tail, which is repeated twice
+    assert list(engine.snake) == [(6, 5), (5, 5), (5, 5), (5, 5)]
+    assert_consistent(engine)
+
+    place_food(engine, (0, 0))
+    for head in ((7, 5), (8, 5)):
+        result = engine.step(Direction.Right)
+        # The stacked tail cell is released, but it is still occupied
+        assert result == (head, (5, 5), False, False)
+        assert (5, 5) not in engine.free_cells
+        assert_consistent(engine)
+
+    result = engine.step(Direction.Right)
+    assert result.tail == (5, 5)
+    assert len(engine.snake) == 4
+    assert (5, 5) in engine.free_cells
+    assert_consistent(engine)
+
+
+def test_move_into_vacated_tail_cell():
+    engine = GameEngine(BOARD, seed=0)
+    place_food(engine, (6, 5))
+    engine.step(Direction.Right)
+    place_food(engine, (0, 0))
+
+    engine.step(Direction.Down)
+    result = engine.step(Direction.Left)
+    assert result.tail == (5, 5)
+    assert list(engine.snake) == [(5, 6), (6, 6), (6, 5)]
+
+    # The cell the tail left in the previous tick is free again
+    result = engine.step(Direction.Up)
+    assert result == ((5, 5), (6, 5), False, False)
+    assert not engine.game_over
+    assert_consistent(engine)
+
+
+def test_move_into_current_tail_cell_collides():
+    # The collision is checked before the tail retracts
+    engine = GameEngine(BOARD, seed=0)
+    place_food(engine, (6, 5), value=2)
+    engine.step(Direction.Right)
+    place_food(engine, (0, 0))
+    engine.step(Direction.Down)
+    engine.step(Direction.Left)
+    assert engine.snake.tail == (5, 5)
+
+    result = engine.step(Direction.Up)
+    assert result == ((5, 5), None, False, True)
+    assert engine.game_over and engine.death_cause == 'self'
+    assert len(engine.snake) == 4
+    assert_consistent(engine)
+
+
+def test_wall_death():
+    engine = GameEngine(BOARD, seed=0)
+    place_food(engine, (9, 9))
+    engine.step(Direction.Up)
+
+    for _ in range(5):
+        assert not engine.step(Direction.Left).game_over
+    assert engine.head == (0, 4)
+
+    result = engine.step()
+    assert result == ((-1, 4), None, False, True)
+    assert engine.death_cause == 'wall' and not engine.won
+    assert engine.head == (0, 4)
+    with pytest.raises(RuntimeError):
+        engine.step()
+
+
+def test_reverse_direction_is_ignored():
+    engine = GameEngine(BOARD, seed=0)
+    place_food(engine, (9, 9))
+    result = engine.step(Direction.Left)
+    assert engine.direction == Direction.Right
+    assert result.head == (6, 5)
+
+
+@pytest.mark.parametrize('autopilot', ('astar', 'field'))
+def test_autopilot_turns_to_food_behind(autopilot):
+    # The shortest path starts with the reversing move, which step ignores
+    engine = GameEngine(BOARD, seed=0, autopilot=autopilot)
+    place_food(engine, (4, 5))
+    assert engine.direction == Direction.Right
+
+    for _ in range(6):
+        result = engine.step(engine.autopilot_action())
+        assert not result.game_over
+        if result.ate:
+            break
+    assert engine.score == 1
+
+
+@pytest.mark.parametrize('backend', sorted(BACKENDS))
+def test_filling_the_board_wins(backend):
+    engine = GameEngine(BoardConfig(2, 2, start=(0, 0)), backend, seed=0)
+    place_food(engine, (1, 0), value=1)
+    engine.step(Direction.Right)
+    assert not engine.game_over
+    assert engine.food.position in ((0, 1), (1, 1))
+
+    place_food(engine, (0, 1), value=1)
+    engine.step(Direction.Down)
+    assert list(engine.snake) == [(1, 1), (1, 0), (0, 0)]
+
+    result = engine.step(Direction.Left)
+    assert result.ate and result.game_over
+    assert engine.death_cause == 'win' and engine.won
+    assert engine.food is None
+    assert len(engine.free_cells) == 0
+    assert engine.autopilot_action() is None
+    assert_consistent(engine)
+
+
+@pytest.mark.parametrize('backend', sorted(BACKENDS))
+@pytest.mark.parametrize('autopilot', ('astar', 'field'))
+def test_indexes_follow_the_snake(backend, autopilot):
+    # The autopilot grows long snakes, the random moves make it crash
+    rng = Random(1)
+    engine = GameEngine(BoardConfig(8, 8, start=(2, 2)), backend, seed=1,
+                        autopilot=autopilot)
+    games = 0
+    for _ in range(3000):
+        if rng.random() < .05:
+            action = rng.randrange(4)
+        else:
+            action = engine.autopilot_action()
+        engine.step(action)
+        assert_consistent(engine)
+        if engine.game_over:
+            games += 1
+            engine.reset(rng.randrange(2 ** 32))
+            assert_consistent(engine)
+    assert games > 1
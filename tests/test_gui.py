@@ -0,0 +1,31 @@
+"""
+    Tests of the window
+    -------------------
+    Checks the game over overlay on the offscreen Qt platform: R is a
+    letter of the name while it is typed and only restarts the game once
+    the score is saved.
+"""
+
+
+import pytest
+
+
+def test_restart_key_after_saving(window):
+    test = pytest.importorskip('PyQt5.QtTest')
+    from PyQt5.QtCore import Qt
+
+    window.restartGame()
+    window.gameOver()
+    assert window.restartHint.isHidden()
+
+    test.QTest.keyClicks(window.nameEdit, 'Rory')
+    assert window.nameEdit.text() == 'Rory'
+    assert window.gameOver_flag
+
+    test.QTest.keyClick(window.nameEdit, Qt.Key_Return)
+    assert not window.nameEdit.isEnabled()
+    assert not window.restartHint.isHidden()
+
+    test.QTest.keyClick(window.restartButton, Qt.Key_R)
+    assert not window.gameOver_flag
+    assert window.gameOverPanel.isHidden()
@@ -0,0 +1,55 @@
+"""
+    Tests of the Hamiltonian autopilot
+    ----------------------------------
+    Checks the cycle construction and that boards without a Hamiltonian
+    cycle are rejected before a game starts.
+"""
+
+
+import pytest
+
+from src.game import (BoardConfig, GameEngine, hamiltonian_cycle,
+                      has_hamiltonian_cycle)
+from src.main import parse_args
+
+
+@pytest.mark.parametrize('cols, rows', ((2, 2), (4, 3), (3, 4), (6, 6),
+                                        (5, 8)))
+def test_cycle_visits_every_cell(cols, rows):
+    assert has_hamiltonian_cycle(cols, rows)
+    order, positions = hamiltonian_cycle(cols, rows)
+    assert sorted(order) == sorted((x, y) for x in range(cols)
+                                   for y in range(rows))
+    for i, (x, y) in enumerate(order):
+        next_x, next_y = order[(i + 1) % len(order)]
+        assert abs(next_x - x) + abs(next_y - y) == 1
+        assert positions[y * cols + x] == i
+
+
+@pytest.mark.parametrize('cols, rows', ((1, 1), (1, 4), (4, 1), (3, 3),
+                                        (41, 41)))
+def test_boards_without_cycle(cols, rows):
+    assert not has_hamiltonian_cycle(cols, rows)
+    with pytest.raises(ValueError):
+        hamiltonian_cycle(cols, rows)
+    with pytest.raises(ValueError, match='hamiltonian'):
+        GameEngine(BoardConfig(cols, rows, start=(0, 0)),
+                   autopilot='hamiltonian')
+
+
+def test_hamiltonian_autopilot_wins():
+    engine = GameEngine(BoardConfig(6, 6, start=(2, 2)), seed=0,
+                        autopilot='hamiltonian')
+    while not engine.game_over:
+        engine.step(engine.autopilot_action())
+    assert engine.won
+
+
+def test_parse_args_rejects_odd_board(capsys):
+    with pytest.raises(SystemExit):
+        parse_args(['--headless', '--board', '41x41',
+                    '--autopilot', 'hamiltonian'])
+    assert '41x41' in capsys.readouterr().err
+
+    args = parse_args(['--headless', '--board', '41x41'])
+    assert (args.board.cols, args.board.rows) == (41, 41)
@@ -0,0 +1,177 @@
+"""
+    Tests of the pathfinding
+    ------------------------
+    Checks the A* search and the repair of the cached path of the
+    PathCache against a fresh search, and the TailCheck that keeps the
+    autopilot out of pockets.
+"""
+
+
+from src.game import (BoardConfig, Direction, GameEngine, OccupancyGrid,
+                      PathCache, Snake, TailCheck, astar)
+from src.game.models import OPPOSITE_DIRECTIONS
+
+
+COLS, ROWS = 10, 10
+START, GOAL = (0, 0), (9, 0)
+
+
+def assert_valid_path(grid, path, start, goal):
+    assert path[0] == start and path[-1] == goal
+    for (x, y), (next_x, next_y) in zip(path, path[1:]):
+        assert abs(next_x - x) + abs(next_y - y) == 1
+        assert grid.is_open_space(next_x, next_y)
+
+
+def test_astar_finds_shortest_path():
+    grid = OccupancyGrid(COLS, ROWS)
+    # A wall from the top to the second last row
+    for y in range(ROWS - 1):
+        grid.insert((5, y))
+
+    path = astar(grid, START, GOAL)
+    assert_valid_path(grid, path, START, GOAL)
+    assert len(path) - 1 == 9 + 2 * (ROWS - 1)
+
+
+def test_astar_without_path():
+    grid = OccupancyGrid(COLS, ROWS)
+    for y in range(ROWS):
+        grid.insert((5, y))
+    assert astar(grid, START, GOAL) is None
+
+
+def test_cache_follows_path():
+    grid = OccupancyGrid(COLS, ROWS)
+    cache = PathCache()
+    assert cache.next_cell(grid, START, GOAL) == cache.path[1]
+    path = list(cache.path)
+
+    for i, cell in enumerate(path[1:-1], 1):
+        grid.insert(cell)
+        cache.block(cell)
+        assert cache.next_cell(grid, cell, GOAL) == path[i + 1]
+    assert cache.path == path
+    assert (cache.searches, cache.repairs) == (1, 0)
+
+
+def test_cache_repairs_blocked_path():
+    grid = OccupancyGrid(COLS, ROWS)
+    cache = PathCache()
+    cache.next_cell(grid, START, GOAL)
+    path = list(cache.path)
+
+    # The snake crossed the path ahead of the head
+    grid.insert(path[4])
+    cache.block(path[4])
+    head = path[1]
+    next_cell = cache.next_cell(grid, head, GOAL)
+
+    assert (cache.searches, cache.repairs) == (1, 1)
+    assert_valid_path(grid, cache.path, head, GOAL)
+    assert cache.path == astar(grid, head, GOAL)
+    assert next_cell == cache.path[1]
+
+
+def test_cache_replans_unreachable_rejoin():
+    grid = OccupancyGrid(COLS, ROWS)
+    cache = PathCache()
+    cache.next_cell(grid, START, GOAL)
+    path = list(cache.path)
+
+    # Everything behind the blocked cells is cut off from the head
+    for y in range(ROWS):
+        grid.insert((6, y))
+        cache.block((6, y))
+    assert cache.next_cell(grid, path[1], GOAL) is None
+    assert (cache.searches, cache.repairs) == (2, 1)
+    assert cache.path == []
+
+
+def test_cache_replans_new_goal():
+    grid = OccupancyGrid(COLS, ROWS)
+    cache = PathCache()
+    cache.next_cell(grid, START, GOAL)
+    goal = (0, 9)
+    cache.next_cell(grid, START, goal)
+    assert cache.searches == 2
+    assert_valid_path(grid, cache.path, START, goal)
+
+
+def test_cache_avoids_first_cell():
+    grid = OccupancyGrid(COLS, ROWS)
+    start, behind = (5, 5), (4, 5)
+    grid.insert(start)
+    cache = PathCache()
+    assert cache.next_cell(grid, start, behind) == behind
+
+    next_cell = cache.avoid(grid, start, behind, behind)
+    assert next_cell in ((5, 4), (5, 6))
+    assert cache.path[1] == next_cell
+    assert_valid_path(grid, cache.path, start, behind)
+    assert len(cache.path) - 1 == 3
+
+
+def make_snake(cells):
+    # The cells are given head first
+    snake = Snake(cells[-1])
+    for cell in reversed(cells[:-1]):
+        snake.advance(cell, grow=True)
+    return snake
+
+
+# A hook around the free top left corner, the head next to it
+HOOK = [(1, 0), (1, 1), (0, 1), (0, 2), (1, 2), (2, 2)]
+
+
+def test_tail_check_rejects_pocket():
+    engine = GameEngine(BoardConfig(6, 6, start=(5, 5)), seed=0)
+    engine.snake = make_snake(HOOK)
+    engine.food.position = (0, 0)
+    check = TailCheck(6, 6)
+
+    assert check.tail_distance(engine.snake, [(1, 0), (0, 0)], 1) == -1
+    assert not check.path_is_safe(engine, [(1, 0), (0, 0)])
+
+
+def test_tail_check_accepts_open_path():
+    engine = GameEngine(BoardConfig(6, 6, start=(5, 5)), seed=0)
+    engine.snake = make_snake(HOOK)
+    engine.food.position = (3, 0)
+    check = TailCheck(6, 6)
+
+    # Around the hook to the tail at (1, 2): (2, 1), (2, 2), (1, 2)
+    assert check.tail_distance(engine.snake, [(1, 0), (2, 0)], 1) == 3
+    assert check.path_is_safe(engine, [(1, 0), (2, 0), (3, 0)])
+    # A path without a move is never safe
+    assert not check.path_is_safe(engine, [(1, 0)])
+
+
+def test_tail_check_growth():
+    check = TailCheck(6, 6)
+    snake = make_snake([(2, 0), (1, 0), (0, 0)])
+    path = [(2, 0), (3, 0)]
+
+    # The tail moves on to (1, 0), or stays at (0, 0) when the snake eats
+    assert check.tail_distance(snake, path, 1) == 4
+    assert check.tail_distance(snake, path, 1, grow=1) == 5
+
+    # The snake is longer than the path, the tail is on the path itself
+    long_path = path + [(4, 0), (5, 0), (5, 1)]
+    assert check.tail_distance(snake, long_path, 1) == 2
+
+    # A pending growth keeps the tail in the repeated cell
+    snake.grow(2)
+    assert check.tail_distance(snake, path, 1) == 5
+
+
+def test_escape_never_reverses():
+    engine = GameEngine(BoardConfig(10, 10, start=(5, 5)), seed=0)
+    engine.food.position = (0, 0)
+    for direction in (Direction.Left, Direction.Right, Direction.Up,
+                      Direction.Down):
+        engine.direction = direction
+        behind = engine.next_head(OPPOSITE_DIRECTIONS[direction])
+        cell = engine.tail_check.escape(engine)
+        assert cell is not None and cell != behind
+        assert engine.is_open_space(cell[0], cell[1])
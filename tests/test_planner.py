@@ -0,0 +1,43 @@
+"""
+    Tests of the background autopilot planner
+    -----------------------------------------
+    Checks that the AutopilotPlanner keeps the snake moving when its search
+    fails on the worker thread.
+"""
+
+
+from concurrent.futures import wait
+
+from src.game import BoardConfig, GameEngine
+from src.game.planner import AutopilotPlanner, safe_action
+
+
+BOARD = BoardConfig(10, 10, start=(5, 5))
+
+
+def failing_search(board, start, goal):
+    raise ValueError('search failed')
+
+
+def test_failed_search_falls_back():
+    engine = GameEngine(BOARD, seed=0)
+    planner = AutopilotPlanner(failing_search)
+    try:
+        for _ in range(5):
+            action = planner.next_action(engine)
+            assert action is not None
+            assert engine.check_collision(engine.next_head(action)) is None
+            if planner.future is not None:
+                wait([planner.future])
+            engine.step(action)
+        assert not engine.game_over
+        assert planner.errors > 0
+        assert planner.path == []
+    finally:
+        planner.shutdown()
+
+
+def test_safe_action_avoids_the_wall():
+    engine = GameEngine(BoardConfig(3, 3, start=(2, 1)), seed=0)
+    action = safe_action(engine)
+    assert engine.check_collision(engine.next_head(action)) is None
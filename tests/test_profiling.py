@@ -0,0 +1,33 @@
+"""
+    Tests of the profiling hooks
+    ----------------------------
+    Captures that start in the same second must be written to different
+    files instead of overwriting each other.
+"""
+
+
+from src.game.profiling import Profiler
+
+
+def capture(directory, ticks):
+    profiler = Profiler(directory, top=3)
+    profiler.start(ticks)
+    summary = None
+    while summary is None:
+        summary = profiler.tick()
+    return profiler.name, summary
+
+
+def test_unique_names(tmp_path, monkeypatch):
+    # Freeze the clock, so all captures get the same start time
+    monkeypatch.setattr('src.game.profiling.strftime',
+                        lambda _: 'snake-20260101-000000')
+    names = [capture(str(tmp_path), ticks)[0] for ticks in (1, 2, 3)]
+
+    assert names == ['snake-20260101-000000', 'snake-20260101-000000-2',
+                     'snake-20260101-000000-3']
+    for ticks, name in enumerate(names, 1):
+        for suffix in ('.prof', '.snapshot', '.txt'):
+            assert (tmp_path / (name + suffix)).exists()
+        summary = (tmp_path / (name + '.txt')).read_text()
+        assert summary.startswith(f'Profile {name} of {ticks} ticks')
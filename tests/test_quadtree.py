@@ -0,0 +1,123 @@
+"""
+    Tests of the quadtree
+    ---------------------
+    Runs random insert, remove and move sequences on a Quadtree and compares
+    it after every operation with a Counter of the inserted cells, including
+    the merges of split nodes when their subtree shrinks again.
+"""
+
+
+from collections import Counter
+from random import Random
+
+import pytest
+
+from src.game import Quadtree
+from src.game.quadtree import MAX_OBJECTS
+
+
+COLS, ROWS = 16, 12
+
+
+def assert_nodes(node):
+    """
+        Check the subtree sizes and that no split node could be merged.
+
+        Parameters:
+        -----------
+            node: Quadtree
+                    The root of the subtree to check.
+
+        Returns:
+        --------
+            int
+                The number of objects in the subtree.
+    """
+    size = len(node.objects)
+    if node.nodes[0] is not None:
+        size += sum(assert_nodes(child) for child in node.nodes)
+        assert node.size > MAX_OBJECTS
+    assert node.size == size
+    return size
+
+
+def assert_matches(tree, counts, rng):
+    assert_nodes(tree)
+    assert Counter(tree.query_rect((0, 0, COLS, ROWS))) == counts
+
+    left, right = sorted(rng.sample(range(COLS + 1), 2))
+    top, bottom = sorted(rng.sample(range(ROWS + 1), 2))
+    expected = Counter({(x, y): count for (x, y), count in counts.items()
+                        if left <= x < right and top <= y < bottom})
+    assert Counter(tree.query_rect((left, top, right, bottom))) == expected
+
+    for _ in range(8):
+        cell = (rng.randrange(COLS), rng.randrange(ROWS))
+        assert tree.is_open_space(*cell) == (cell not in counts)
+        # retrieve returns candidates, every occurrence of the cell is one
+        found = Counter(tree.retrieve([], cell))
+        assert found[cell] == counts[cell]
+
+
+def random_cell(rng):
+    return (rng.randrange(COLS), rng.randrange(ROWS))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_operations(seed):
+    rng = Random(seed)
+    tree = Quadtree((0, 0, COLS, ROWS))
+    counts = Counter()
+    merged = was_split = False
+
+    for step in range(2000):
+        roll = rng.random()
+        # Alternately grow and shrink the tree to force splits and merges
+        grow = .6 if step % 400 < 100 else .2
+        if roll < grow or not counts:
+            cell = random_cell(rng)
+            tree.insert(cell)
+            counts[cell] += 1
+        elif roll < .7:
+            cell = rng.choice(sorted(counts))
+            assert tree.remove(cell)
+            counts[cell] -= 1
+            counts += Counter()
+        else:
+            old, new = rng.choice(sorted(counts)), random_cell(rng)
+            assert tree.move(old, new)
+            counts[old] -= 1
+            counts[new] += 1
+            counts += Counter()
+
+        assert_matches(tree, counts, rng)
+        if was_split and tree.nodes[0] is None:
+            merged = True
+        was_split = tree.nodes[0] is not None
+
+    assert merged
+
+
+def test_missing_object():
+    tree = Quadtree((0, 0, COLS, ROWS))
+    for x in range(COLS):
+        tree.insert((x, 0))
+    assert not tree.remove((0, 1))
+    assert not tree.move((0, 1), (1, 1))
+    assert tree.size == COLS
+    assert tree.is_open_space(1, 1)
+
+
+def test_merge_below_max_objects():
+    tree = Quadtree((0, 0, COLS, ROWS))
+    cells = [(x, y) for x in range(0, COLS, 3) for y in range(0, ROWS, 3)]
+    for cell in cells:
+        tree.insert(cell)
+    assert tree.nodes[0] is not None
+
+    for cell in cells[:-MAX_OBJECTS]:
+        assert tree.remove(cell)
+    # The remaining objects are pulled back up into the root
+    assert tree.nodes[0] is None
+    assert sorted(tree.objects) == sorted(cells[-MAX_OBJECTS:])
+    assert tree.size == MAX_OBJECTS
@@ -0,0 +1,102 @@
+"""
+    Tests of the replay format
+    --------------------------
+    Records seeded games, writes them in the binary replay format and
+    checks that playing them back on every engine backend reproduces the
+    outcome of the recorded game.
+"""
+
+
+from random import Random
+
+import pytest
+
+from src.game import BoardConfig, GameEngine, Replay
+from src.game.engine import BACKENDS
+from src.game.replay import HEADER
+
+
+BOARD = BoardConfig(8, 8, start=(2, 2))
+MAX_TICKS = 5000
+
+
+def record_game(seed):
+    """
+        Play a game with the autopilot and some random moves and record it.
+
+        Parameters:
+        -----------
+            seed: int
+                    The seed of the game and of the random moves.
+
+        Returns:
+        --------
+            tuple
+                The final engine and the replay of the game.
+    """
+    rng = Random(seed)
+    engine = GameEngine(BOARD, seed=seed)
+    replay = Replay.from_engine(engine)
+    while not engine.game_over and engine.ticks < MAX_TICKS:
+        roll = rng.random()
+        if roll < .02:
+            action = rng.randrange(4)
+        elif roll < .1:
+            action = None
+        else:
+            action = engine.autopilot_action()
+        replay.record(action)
+        engine.step(action)
+    return engine, replay
+
+
+@pytest.mark.parametrize('seed', (0, 1, 2, -5, 2 ** 32 - 1))
+@pytest.mark.parametrize('backend', sorted(BACKENDS))
+def test_round_trip(tmp_path, seed, backend):
+    recorded, replay = record_game(seed)
+    assert recorded.game_over
+
+    file_path = tmp_path / 'game.snkr'
+    replay.save(file_path)
+    parsed = Replay.load(file_path)
+    assert parsed.actions == replay.actions
+    assert (parsed.seed, parsed.cols, parsed.rows, parsed.start) == \
+        (seed, BOARD.cols, BOARD.rows, BOARD.start)
+
+    played = parsed.play(backend)
+    assert played.game_over
+    assert played.score == recorded.score
+    assert played.ticks == recorded.ticks
+    assert played.death_cause == recorded.death_cause
+    assert list(played.snake) == list(recorded.snake)
+
+
+def test_long_runs_are_split():
+    replay = Replay(0, BOARD.cols, BOARD.rows, BOARD.start)
+    for _ in range(600):
+        replay.record(None)
+    data = replay.to_bytes()
+    # 600 ticks are three (action, run length) pairs
+    assert len(data) == HEADER.size + 6
+    assert Replay.from_bytes(data).actions == replay.actions
+
+
+def test_bad_magic_raises():
+    data = record_game(0)[1].to_bytes()
+    with pytest.raises(ValueError, match='not a replay'):
+        Replay.from_bytes(b'SNKX' + data[4:])
+
+
+@pytest.mark.parametrize('cut', (1, 2, HEADER.size))
+def test_truncated_replay_raises(cut):
+    data = record_game(0)[1].to_bytes()
+    with pytest.raises(ValueError):
+        Replay.from_bytes(data[:-cut])
+
+
+def test_other_rules_version_raises():
+    replay = record_game(0)[1]
+    replay.rules_version += 1
+    parsed = Replay.from_bytes(replay.to_bytes())
+    with pytest.raises(ValueError, match='rules version'):
+        parsed.play()
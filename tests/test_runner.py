@@ -0,0 +1,40 @@
+"""
+    Tests of the headless runner
+    ----------------------------
+    Games that make no progress must be stopped long before the tick limit
+    of the board, which is sized for the Hamiltonian autopilot.
+"""
+
+
+from itertools import cycle
+
+from src.game import BoardConfig, Direction, Food, GameEngine
+from src.game.runner import default_max_ticks, play_game
+
+
+BOARD = BoardConfig(8, 8, start=(0, 0))
+
+
+def place_far_food(engine):
+    engine.food = Food(engine.free_cells, engine.rng)
+    engine.food.position = (7, 7)
+
+
+def test_stalled_game_is_stopped(monkeypatch):
+    # Circle in the top left corner, far away from the food
+    circle = cycle((Direction.Right, Direction.Down, Direction.Left,
+                    Direction.Up))
+    monkeypatch.setattr(GameEngine, 'autopilot_action',
+                        lambda engine: next(circle))
+    monkeypatch.setattr(GameEngine, 'add_food', place_far_food)
+
+    result = play_game(0, board=BOARD)
+    assert result['cause'] == 'stalled'
+    assert result['ticks'] == BOARD.cells < default_max_ticks(BOARD)
+    assert result['score'] == 0
+
+
+def test_winning_game_is_not_stalled():
+    result = play_game(0, autopilot='hamiltonian', board=BOARD)
+    assert result['cause'] == 'win'
+    assert result['ticks'] > BOARD.cells
@@ -0,0 +1,197 @@
+"""
+    Tests of the highscore store
+    ----------------------------
+    Checks the ranking of the ScoreStore (the top-K heap and the pages read
+    from the index), the one-time import of the old JSON list, and that
+    the ScoreWriter neither blocks the caller when its queue is full nor
+    the readers while it writes. The ScoreboardModel of the window must
+    page through all scores in the same order.
+"""
+
+
+from json import dump
+import os
+from random import Random
+import sqlite3
+from threading import Event
+
+import pytest
+
+from src.game.scores import ScoreStore, ScoreWriter
+
+
+def ranking(rows):
+    # Scores descending, equal scores in the order they were recorded
+    return sorted(rows, key=lambda row: (-row[2], row[0]))
+
+
+def test_top_scores_keep_the_best(tmp_path):
+    store = ScoreStore(':memory:', top=10)
+    rng = Random(0)
+    rows = []
+    for i in range(200):
+        name, score = f'player{i}', rng.randrange(20)
+        store.add(name, score)
+        rows.append((i + 1, name, score))
+        assert store.top_scores() == ranking(rows)[:10]
+    assert len(store) == 200
+
+    # A new store fills its heap from the index
+    database = str(tmp_path / 'highscores.db')
+    store = ScoreStore(database, top=10)
+    for _, name, score in rows:
+        store.add(name, score)
+    store.close()
+    assert ScoreStore(database, top=10).top_scores() == ranking(rows)[:10]
+
+
+def test_pages_continue_across_equal_scores():
+    store = ScoreStore(':memory:')
+    rows = []
+    for i in range(50):
+        # Only three distinct scores, so every page ends within a tie
+        score = (i * 7) % 3
+        store.add(f'player{i}', score)
+        rows.append((i + 1, f'player{i}', score))
+
+    pages = []
+    page = store.page(7)
+    while page:
+        pages.extend(page)
+        page = store.page(7, page[-1])
+    assert pages == ranking(rows)
+
+
+def test_legacy_scores_are_imported_once(tmp_path):
+    legacy = tmp_path / 'highscores.json'
+    with open(legacy, 'w') as file:
+        dump([{"name": "old", "score": 5}, {"name": "older", "score": 9}],
+             file)
+    database = str(tmp_path / 'highscores.db')
+
+    store = ScoreStore(database, legacy_path=str(legacy))
+    assert [row[1:] for row in store.top_scores()] == [('older', 9),
+                                                       ('old', 5)]
+    store.add('new', 7)
+    store.close()
+
+    store = ScoreStore(database, legacy_path=str(legacy))
+    assert len(store) == 3
+    assert [row[1:] for row in store.top_scores()] == [
+        ('older', 9), ('new', 7), ('old', 5)]
+    store.close()
+
+    # A missing or broken file is skipped
+    legacy.write_text('{')
+    assert len(ScoreStore(':memory:', legacy_path=str(legacy))) == 0
+    missing = str(tmp_path / 'missing.json')
+    assert len(ScoreStore(':memory:', legacy_path=missing)) == 0
+
+
+def test_full_queue_drops(tmp_path, capsys):
+    database = str(tmp_path / 'highscores.db')
+    ScoreStore(database)
+    writing, release = Event(), Event()
+
+    def notify():
+        # Stall the writer thread after the first score
+        writing.set()
+        release.wait()
+
+    writer = ScoreWriter(database, notify=notify, maxsize=1)
+    assert writer.submit('first', 30)
+    assert writing.wait(5)
+    assert writer.submit('second', 20)
+    assert not writer.submit('third', 10)
+    assert writer.dropped == 1
+    assert 'third' in capsys.readouterr().out
+
+    release.set()
+    writer.close()
+    assert [row[1:] for row in writer.collect()] == [('first', 30),
+                                                     ('second', 20)]
+
+
+def test_pages_are_read_during_a_write(tmp_path):
+    database = str(tmp_path / 'highscores.db')
+    store = ScoreStore(database)
+    store.add('first', 30)
+
+    # A commit of the writer thread in progress
+    writer = sqlite3.connect(database, isolation_level=None)
+    writer.execute("BEGIN EXCLUSIVE")
+    writer.execute("INSERT INTO scores (name, score) VALUES ('second', 20)")
+    assert [row[1:] for row in store.page(10)] == [('first', 30)]
+    writer.execute("COMMIT")
+    writer.close()
+    assert len(store) == 2
+    store.close()
+
+
+@pytest.fixture
+def scoreboard_model():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    core = pytest.importorskip('PyQt5.QtCore')
+    from src.gui import ScoreboardModel
+    return ScoreboardModel, core.QModelIndex()
+
+
+def fetch_all(model, root):
+    fetches = 0
+    while model.canFetchMore(root):
+        model.fetchMore(root)
+        fetches += 1
+    return fetches
+
+
+def test_model_pages_through_all_scores(scoreboard_model):
+    ScoreboardModel, root = scoreboard_model
+    store = ScoreStore(':memory:', top=5)
+    rows = []
+    for i in range(23):
+        store.add(f'player{i}', i % 4)
+        rows.append((i + 1, f'player{i}', i % 4))
+
+    model = ScoreboardModel(store, batch=4)
+    assert model.rowCount() == 0
+    # 5 best scores from the heap in 2 batches, 18 rows in 5 pages
+    assert fetch_all(model, root) == 7
+    assert model.rows == ranking(rows)
+    assert model.rowCount() == 23
+    assert model.data(model.index(0)) == 'player3: 3'
+
+    store.add('new', 9)
+    model.refresh()
+    assert model.rowCount() == 0
+    fetch_all(model, root)
+    assert model.rows[0][1:] == ('new', 9) and model.rowCount() == 24
+
+
+def test_model_does_not_read_a_complete_heap(scoreboard_model, monkeypatch):
+    ScoreboardModel, root = scoreboard_model
+    store = ScoreStore(':memory:', top=10)
+    for i in range(6):
+        store.add(f'player{i}', i)
+
+    def page(limit, after=None):
+        raise AssertionError('all scores are in the heap')
+    monkeypatch.setattr(store, 'page', page)
+    model = ScoreboardModel(store, batch=4)
+    assert fetch_all(model, root) == 2
+    assert [row[2] for row in model.rows] == [5, 4, 3, 2, 1, 0]
+
+
+def test_model_survives_a_locked_database(scoreboard_model, monkeypatch,
+                                          capsys):
+    ScoreboardModel, root = scoreboard_model
+    store = ScoreStore(':memory:', top=2)
+    for i in range(6):
+        store.add(f'player{i}', i)
+
+    def page(limit, after=None):
+        raise sqlite3.OperationalError('database is locked')
+    monkeypatch.setattr(store, 'page', page)
+    model = ScoreboardModel(store, batch=4)
+    fetch_all(model, root)
+    assert model.rowCount() == 2
+    assert 'database is locked' in capsys.readouterr().out
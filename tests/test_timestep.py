@@ -0,0 +1,78 @@
+"""
+    Tests of the fixed timestep
+    ---------------------------
+    Drives a FixedTimestep with a fake clock and checks how many ticks it
+    runs, that it drops the time of a long stall and that the
+    interpolation fraction stays below one tick.
+"""
+
+
+import pytest
+
+from src.game import FixedTimestep
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def run_frame(scheduler):
+    scheduler.advance()
+    ticks = 0
+    while scheduler.tick():
+        ticks += 1
+    return ticks
+
+
+def test_ticks_follow_elapsed_time():
+    clock = FakeClock()
+    scheduler = FixedTimestep(50, clock=clock)
+
+    ticks = 0
+    # 16 ms frames for one second
+    for _ in range(62):
+        clock.now += .016
+        ticks += run_frame(scheduler)
+    assert ticks == 19
+    assert scheduler.accumulator == pytest.approx(992 - 19 * 50)
+
+    scheduler.speed = 4
+    clock.now += .1
+    assert run_frame(scheduler) == 8
+
+
+def test_long_stall_is_clamped():
+    clock = FakeClock()
+    scheduler = FixedTimestep(10, max_ticks=5, clock=clock)
+
+    clock.now += 60
+    assert run_frame(scheduler) == 5
+    assert scheduler.accumulator == 0
+    # The dropped time is not caught up on the next frame
+    clock.now += .005
+    assert run_frame(scheduler) == 0
+
+    # Nor is the time of a pause
+    clock.now += 60
+    scheduler.start()
+    assert run_frame(scheduler) == 0
+
+
+def test_alpha_stays_below_one():
+    clock = FakeClock()
+    scheduler = FixedTimestep(30, clock=clock)
+    assert scheduler.alpha == 0
+
+    for frame in range(500):
+        clock.now += (frame % 7) * .011
+        run_frame(scheduler)
+        assert 0 <= scheduler.alpha < 1
+
+    scheduler.reset()
+    clock.now += .045
+    assert run_frame(scheduler) == 1
+    assert scheduler.alpha == pytest.approx(.5)
@@ -0,0 +1,53 @@
+"""
+    Tests of the tick timings
+    -------------------------
+    Checks the nearest-rank percentiles of the TickTimer and that only the
+    durations of its bounded window are kept.
+"""
+
+
+from src.game.timing import WINDOW, TickTimer, percentile
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, .5) == 50
+    assert percentile(values, .95) == 95
+    assert percentile(values, .99) == 99
+    assert percentile(values, 1) == 100
+    assert percentile(values, 0) == 1
+    assert percentile([], .5) is None
+
+
+def test_stats_over_the_window():
+    timer = TickTimer(window=100)
+    # 100..1 ms, the percentiles sort the durations
+    for ms in range(100, 0, -1):
+        timer.record('tick', ms / 1000)
+    timer.record('custom', .002)
+    timer.record('planning', .001)
+
+    stats = timer.stats()
+    assert list(stats) == ['planning', 'tick', 'custom']
+    tick = stats['tick']
+    assert tick['count'] == 100
+    assert (tick['p50_ms'], tick['p95_ms'], tick['p99_ms'],
+            tick['max_ms']) == (50, 95, 99, 100)
+    assert tick['mean_ms'] == 50.5
+
+
+def test_old_samples_are_dropped():
+    timer = TickTimer(window=10)
+    for ms in range(1, 1001):
+        timer.record('tick', ms / 1000)
+
+    assert len(timer.samples['tick']) == 10
+    stats = timer.stats()['tick']
+    # Only 991..1000 ms are left, but every sample is counted
+    assert stats['count'] == 1000
+    assert (stats['p50_ms'], stats['max_ms']) == (995, 1000)
+    assert stats['mean_ms'] == 995.5
+
+    timer.clear()
+    assert timer.stats() == {}
+    assert TickTimer().window == WINDOW